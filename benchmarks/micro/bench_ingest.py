@@ -0,0 +1,42 @@
+# benchmarks/micro/bench_ingest.py
+import pytest
+
+from benchmarks.micro.inputs import (
+    CALCIUM_TRANSFORM_KWARGS,
+    calcium_frame,
+    metadata_dicts,
+    mpor_header,
+    row_counts,
+)
+from src.ingest.ops_plant_b_pipeline import flatten_header_columns
+from src.ingest.utils import metadata_to_json, transform_crew_data
+
+
+@pytest.mark.parametrize("n_rows", row_counts())
+def test_transform_crew_data(benchmark, n_rows):
+    """Dedupe, select, cast, rename and metadata packing with the calcium pipeline's arguments"""
+    df = calcium_frame(n_rows)
+
+    result = benchmark(transform_crew_data, df=df, **CALCIUM_TRANSFORM_KWARGS)
+
+    assert len(result) == n_rows
+
+
+@pytest.mark.parametrize("n_rows", row_counts())
+def test_metadata_to_json(benchmark, n_rows):
+    """reading_metadata dicts to JSON strings (NaN to null)"""
+    metadata = metadata_dicts(n_rows)
+
+    result = benchmark(metadata_to_json, metadata)
+
+    assert result.notna().all()
+
+
+@pytest.mark.parametrize("n_columns", [100, 1_000])
+def test_flatten_plant_b_header(benchmark, n_columns):
+    """Joining the 7-row MPOR header into flat column names"""
+    columns = mpor_header(n_columns)
+
+    result = benchmark(flatten_header_columns, columns)
+
+    assert result[0].startswith("Unnamed: 0_level_0_Unnamed: 0_level_1_DATE")
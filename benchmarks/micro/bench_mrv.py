@@ -0,0 +1,76 @@
+# benchmarks/micro/bench_mrv.py
+import numpy as np
+import pytest
+
+from benchmarks.micro.inputs import plant_day_inputs, row_counts
+from src.mrv.utils import DEFAULT_PARAMETERS, co2_stoichiometry
+from src.qaqc.events import ValidationEventCollector
+from src.qaqc.mrv_utils import classify_inputs, validate_all_inputs
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# Plant-day inputs are ORM objects; building 10^7 of them costs more than the benchmark
+VALIDATION_MAX_ROWS = 10**6
+
+
+@pytest.mark.parametrize("n_days", row_counts(VALIDATION_MAX_ROWS))
+def test_validate_all_inputs(benchmark, n_days):
+    """Per plant-day QA/QC checks as run by calculate_co2_removal_from_sources, events aggregated"""
+    inputs = plant_day_inputs(n_days)
+
+    def validate():
+        events = ValidationEventCollector()
+        for ops, ca_upstream, ca_downstream, plant_id, calc_date in inputs:
+            validate_all_inputs(ops, ca_upstream, ca_downstream, plant_id, calc_date, logger, events=events)
+        return events
+
+    events = benchmark(validate)
+
+    assert 0 < len(events.events) < n_days
+
+
+@pytest.mark.parametrize("n_days", row_counts())
+def test_classify_inputs(benchmark, n_days):
+    """Vectorized counterpart of validate_all_inputs used by the scenario and uncertainty runs"""
+    rng = np.random.default_rng(0)
+    has_ops = rng.random(n_days) > 0.03
+    flow = rng.uniform(-1.0, 50.0, n_days)
+    upstream = np.where(rng.random(n_days) < 0.05, np.nan, rng.normal(45.0, 3.0, n_days))
+    downstream = upstream + rng.normal(6.0, 4.0, n_days)
+
+    should_calculate, quality_flag = benchmark(classify_inputs, has_ops, flow, upstream, downstream)
+
+    assert len(quality_flag) == n_days
+
+
+@pytest.mark.parametrize("n_days", row_counts())
+def test_co2_stoichiometry_per_day(benchmark, n_days):
+    """co2_stoichiometry one plant-day at a time on floats, the call calculate_co2_removal_from_sources makes"""
+    rng = np.random.default_rng(0)
+    upstream = rng.normal(45.0, 3.0, n_days).tolist()
+    downstream = (rng.normal(45.0, 3.0, n_days) + 6.0).tolist()
+    flow = rng.uniform(5.0, 50.0, n_days).tolist()
+
+    def calculate():
+        return [
+            co2_stoichiometry(up, down, f, **DEFAULT_PARAMETERS.stoichiometry_parameters())
+            for up, down, f in zip(upstream, downstream, flow)
+        ]
+
+    result = benchmark(calculate)
+
+    assert len(result) == n_days
+
+
+@pytest.mark.parametrize("n_days", row_counts())
+def test_co2_stoichiometry_vectorized(benchmark, n_days):
+    """The same kernel over arrays, as evaluate_scenarios and sample_co2_removal call it"""
+    rng = np.random.default_rng(0)
+    upstream = rng.normal(45.0, 3.0, n_days)
+    downstream = upstream + rng.normal(6.0, 4.0, n_days)
+    flow = rng.uniform(5.0, 50.0, n_days)
+
+    result = benchmark(co2_stoichiometry, upstream, downstream, flow, **DEFAULT_PARAMETERS.stoichiometry_parameters())
+
+    assert result["co2_removed_metric_tons_per_day"].shape == (n_days,)
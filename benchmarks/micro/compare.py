@@ -0,0 +1,96 @@
+# benchmarks/micro/compare.py
+"""
+Compare a microbenchmark run against the stored baseline
+
+    pytest benchmarks/micro --benchmark-json=data/output/benchmark/micro.json
+    python -m benchmarks.micro.compare data/output/benchmark/micro.json
+
+Exits 1 when any benchmark's statistic (median by default) is more than
+--max-regression slower than in the baseline. Baselines are only comparable
+on the same machine; refresh one with `--update` after an intended change.
+"""
+import argparse
+import json
+import os
+import sys
+
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+BASELINE_PATH = "benchmarks/micro/baselines/baseline.json"
+MACHINE_KEYS = ("node", "processor", "machine", "python_version")
+
+
+def load_stats(path: str) -> tuple[dict, dict]:
+    """
+    Read a pytest-benchmark JSON report
+
+    Returns:
+        Tuple of (stats by benchmark name, machine_info)
+    """
+    with open(path) as f:
+        report = json.load(f)
+    return {b["name"]: b["stats"] for b in report["benchmarks"]}, report.get("machine_info", {})
+
+
+def write_baseline(current_path: str, baseline_path: str) -> None:
+    """Store a report as the baseline, without the per-round timings (only the summary stats are compared)"""
+    with open(current_path) as f:
+        report = json.load(f)
+    for benchmark in report["benchmarks"]:
+        benchmark["stats"].pop("data", None)
+    os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+    with open(baseline_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def find_regressions(current: dict, baseline: dict, max_regression: float, stat: str = "median") -> list[str]:
+    """Benchmarks whose `stat` is more than max_regression (fraction) above the baseline"""
+    regressions = []
+    for name, stats in sorted(current.items()):
+        previous = baseline.get(name)
+        if previous is None or previous[stat] <= 0:
+            continue
+        ratio = stats[stat] / previous[stat]
+        if ratio > 1 + max_regression:
+            regressions.append(f"{name}: {stat} {previous[stat] * 1000:.3f} ms -> {stats[stat] * 1000:.3f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def log_comparison(current: dict, baseline: dict, stat: str = "median") -> None:
+    for name, stats in sorted(current.items()):
+        previous = baseline.get(name)
+        change = f"{stats[stat] / previous[stat]:6.2f}x" if previous and previous[stat] > 0 else "   new"
+        logger.info(f"  {name:55s} {stats[stat] * 1000:12.3f} ms  {change}")
+    for name in sorted(set(baseline) - set(current)):
+        logger.info(f"  {name:55s} {'not run':>15s}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail on microbenchmark slowdowns against a JSON baseline")
+    parser.add_argument("current", help="pytest --benchmark-json output")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--stat", default="median", choices=["min", "median", "mean"])
+    parser.add_argument("--update", action="store_true", help="Replace the baseline with the current report")
+    args = parser.parse_args()
+
+    if args.update:
+        write_baseline(args.current, args.baseline)
+        logger.info(f"✓ Baseline {args.baseline} updated from {args.current}")
+        sys.exit(0)
+
+    current, current_machine = load_stats(args.current)
+    baseline, baseline_machine = load_stats(args.baseline)
+    differing = [key for key in MACHINE_KEYS if current_machine.get(key) != baseline_machine.get(key)]
+    if differing:
+        logger.warning(f"⚠ Baseline was recorded on a different machine ({', '.join(differing)}); timings may not be comparable")
+
+    log_comparison(current, baseline, args.stat)
+    regressions = find_regressions(current, baseline, args.max_regression, args.stat)
+    for regression in regressions:
+        logger.error(f"✗ Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    logger.info(f"✓ No {args.stat} regressions beyond {args.max_regression:.0%} against {args.baseline}")
@@ -0,0 +1,7 @@
+# benchmarks/micro/conftest.py
+import os
+
+# Measure the kernels, not console output: the INFO lines of transform_crew_data
+# and timed_stage would otherwise run through the log handler every round.
+# Set before src modules create their loggers.
+os.environ.setdefault("LOG_LEVEL", "WARNING")
@@ -0,0 +1,146 @@
+# benchmarks/micro/inputs.py
+"""
+Synthetic in-memory inputs for the microbenchmarks
+
+Shapes follow the real sources (IC calcium CSV columns, 7-row MPOR header,
+plant-day validation inputs) so the kernels do the same work per row as in
+the pipelines. Everything is seeded and built without files or a database.
+"""
+import os
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.models.schemas import CrewCarbonLabReading, WasteWaterPlantOperation
+
+# Row counts per benchmark; sizes above MICRO_BENCH_MAX_ROWS are not collected
+# (10^6 and 10^7 take minutes and several GiB, run them deliberately)
+ROW_COUNTS = [10**3, 10**4, 10**5, 10**6, 10**7]
+MAX_ROWS = int(os.getenv("MICRO_BENCH_MAX_ROWS", str(10**5)))
+
+
+def row_counts(limit: int = None) -> list[int]:
+    """ROW_COUNTS up to MICRO_BENCH_MAX_ROWS (and an optional tighter per-benchmark limit)"""
+    limit = min(MAX_ROWS, limit) if limit else MAX_ROWS
+    return [n for n in ROW_COUNTS if n <= limit]
+
+
+# transform_crew_data arguments used by run_ca_pipeline
+CALCIUM_TRANSFORM_KWARGS = {
+    "columns_to_keep": [
+        "unique_id",
+        "plant_id",
+        "unit_type_id",
+        "date",
+        "parameter_name",
+        "value",
+        "units",
+        "source_file",
+        "uncertainty",
+        "medium",
+    ],
+    "columns_rename_mapper": {
+        "date": CrewCarbonLabReading.datetime.name,
+        "unit_type_id": CrewCarbonLabReading.plant_unit_id.name,
+        "unique_id": CrewCarbonLabReading.reading_id.name,
+        "units": CrewCarbonLabReading.unit.name,
+    },
+    "column_dtype_mapper": {
+        "value": "float64",
+        "uncertainty": "float64",
+        "plant_id": "string",
+        "date": "datetime64[ns]",
+    },
+    "metadata_col_name": "reading_metadata",
+}
+
+
+def calcium_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw IC calcium CSV as read by run_ca_pipeline (same columns, ~half the uncertainties missing)"""
+    rng = np.random.default_rng(seed)
+    plants = np.array([f"SYN_{i:04d}" for i in range(1, 101)])
+    units = np.array(["primary_clarifier", "secondary_clarifier"])
+    plant = plants[rng.integers(0, len(plants), n_rows)]
+    unit = units[rng.integers(0, 2, n_rows)]
+    day = pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 5 * 365, n_rows), unit="D")
+    date_str = day.strftime("%Y-%m-%d")
+    replicate = rng.integers(1, 3, n_rows)
+    uncertainty = np.where(rng.random(n_rows) < 0.5, np.nan, rng.uniform(0.1, 0.4, n_rows))
+
+    return pd.DataFrame(
+        {
+            "unique_id": pd.Series(plant) + "_" + unit + "_" + day.strftime("%Y%m%d") + "_0" + replicate.astype(str),
+            "date": date_str,
+            "time_analyzed": date_str,
+            "medium": "aqueous",
+            "data_type": "deployment",
+            "data_provider": "CREW",
+            "instrument": "IC",
+            "replicate_num": replicate,
+            "analytical_session_id": "YASIC_IC_YYYYMMDD",
+            "plant_id": plant,
+            "unit_type_id": unit,
+            "unit_sub_id": np.nan,
+            "measurement_point": "outlet",
+            "parameter_name": "calcium",
+            "units": "mg/L",
+            "value": rng.normal(45.0, 5.0, n_rows),
+            "uncertainty": uncertainty,
+            "source_file": "raw_filename.csv",
+            "source_sheet": "sheet_name",
+            "source_col_idx": np.nan,
+            "date_generated": "1900-01-01",
+            "notes": np.nan,
+            "flag_match": True,
+        }
+    )
+
+
+def metadata_dicts(n_rows: int, seed: int = 0) -> pd.Series:
+    """reading_metadata as built by transform_crew_data for the calcium columns"""
+    df = calcium_frame(n_rows, seed)
+    other_cols = [col for col in df.columns if col not in CALCIUM_TRANSFORM_KWARGS["columns_to_keep"]]
+    return df[other_cols].apply(dict, axis=1)
+
+
+def mpor_header(n_columns: int) -> pd.MultiIndex:
+    """7-level MPOR header like the Plant B exports (98 columns per real file)"""
+    tuples = [
+        (
+            "Unnamed: 0_level_0",
+            "Unnamed: 0_level_1",
+            "DATE",
+            "Unnamed: 0_level_3",
+            "Unnamed: 0_level_4",
+            "Unnamed: 0_level_5",
+            "Unnamed: 0_level_6",
+        )
+    ]
+    for i in range(1, n_columns):
+        section = "INFLUENT DATA" if i < n_columns // 2 else "EFFLUENT DATA"
+        tuples.append((section, i, "RAW", "INF", "FLOW", f"Unnamed: {i}_level_5", "MGD" if i % 3 else f"Unnamed: {i}_level_6"))
+    return pd.MultiIndex.from_tuples(tuples)
+
+
+def plant_day_inputs(n_days: int, seed: int = 0) -> list[tuple]:
+    """
+    (ops, ca_upstream, ca_downstream, plant_id, calc_date) per plant-day as transient ORM objects
+
+    About 3% lack ops, 2% have non-positive flow, 5% miss a calcium reading
+    and about 7% have a negative calcium delta, so every validation branch runs
+    """
+    rng = np.random.default_rng(seed)
+    draw = rng.random(n_days)
+    flow = rng.uniform(5.0, 50.0, n_days)
+    upstream = rng.normal(45.0, 3.0, n_days)
+    downstream = upstream + rng.normal(6.0, 4.0, n_days)
+    start = date(2021, 1, 1)
+
+    inputs = []
+    for i in range(n_days):
+        ops = None if draw[i] < 0.03 else WasteWaterPlantOperation(actual_eff_flow_mgd=0.0 if draw[i] < 0.05 else flow[i])
+        ca_upstream = None if 0.05 <= draw[i] < 0.10 else CrewCarbonLabReading(value=upstream[i])
+        ca_downstream = CrewCarbonLabReading(value=downstream[i])
+        inputs.append((ops, ca_upstream, ca_downstream, f"SYN_{i % 100:04d}", start + timedelta(days=i // 100)))
+    return inputs
@@ -0,0 +1,327 @@
+# benchmarks/synthetic_data.py
+"""
+Synthetic input files in the formats the ingest pipelines read
+
+- Plant A-style monthly operator workbooks (multi-line headers, Sum/Avg/Max/Min rows)
+- Plant B-style MPOR rolling-window exports (title block, 7-row header, TOTAL/MAX/MIN/AVG rows)
+- IC_calcium.csv-style lab results with two replicates per unit and sample day
+- Minute pH sensor CSVs
+
+Values follow the sample data: flows random-walk around a per-plant base,
+calcium rises across the clarifiers by ~10 mg/L with occasional negative
+deltas, and days are randomly missing from ops and lab data so the QA/QC
+paths are exercised.
+
+    python -m benchmarks.synthetic_data --plants 10 --years 1 --out data/output/synthetic
+"""
+import argparse
+import calendar
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+CALCIUM_COLUMNS = [
+    "unique_id", "date", "time_analyzed", "medium", "data_type", "data_provider", "instrument",
+    "replicate_num", "analytical_session_id", "plant_id", "unit_type_id", "unit_sub_id",
+    "measurement_point", "parameter_name", "units", "value", "uncertainty", "source_file",
+    "source_sheet", "source_col_idx", "date_generated", "notes", "flag_match",
+]
+
+# Header of the first columns of a Plant A operator workbook (the pipeline maps these)
+PLANT_A_COLUMNS = [
+    "Plnt Ef\n50050\nFLOW MGD\nMGD\nDaily",
+    "Max Effluent Flow\n50047\nFLOW MAX MGD\nMGD\nDaily",
+    "Min Effluent Flow\n50048\nFLOW MIN MGD\nMGD\nDaily",
+    "Bypass\n50050\nFLOW MGD\nMGD\nDaily",
+    "Bypass\nDIVERSION/HRS\nHRS/DAY\nDaily",
+    "Blvd Flow\nFLOW MGD\nMGD\nDaily",
+]
+
+# MPOR header rows 5-11: (section, column number, 3 label rows, blank row, unit)
+PLANT_B_HEADER = [
+    ("INFLUENT DATA", 1, "RAW", "INF", "FLOW", "MGD"),
+    (None, 2, "RAW", "INF", "pH", None),
+    (None, 3, "RAW", "INF", "CBOD", "mg/L"),
+    (None, 4, "RAW", "INF", "TSS", "mg/L"),
+    ("EFFLUENT DATA", 7, "FIN", "EFF", "FLOW", "MGD"),
+    (None, 8, "FIN", "EFF", "pH", None),
+    (None, 9, "FIN", "EFF", "BOD", "mg/L"),
+]
+
+MPOR_WINDOW_DAYS = 28
+MPOR_STEP_DAYS = 21
+
+
+def plant_ids(n_plants: int) -> list[str]:
+    """SYN_0001, SYN_0002, ... (distinct from the sample plants)"""
+    return [f"SYN_{i:04d}" for i in range(1, n_plants + 1)]
+
+
+def daily_flows(rng: np.random.Generator, days: int, base_mgd: float) -> np.ndarray:
+    """Mean-reverting random walk around base_mgd, with the odd zero-flow day"""
+    noise = rng.normal(0, 0.04 * base_mgd, days)
+    flows = np.empty(days)
+    level = base_mgd
+    for i in range(days):
+        level += 0.2 * (base_mgd - level) + noise[i]
+        flows[i] = max(level, 0.1)
+    flows[rng.random(days) < 0.01] = 0.0
+    return np.round(flows, 3)
+
+
+def write_plant_a_workbooks(out_dir: str, plant_id: str, start: date, end: date, rng, base_mgd: float) -> dict:
+    """
+    One operator workbook per calendar month
+
+    Returns:
+        Workbook path -> source_file label, as run_ops_plant_a expects
+    """
+    files = {}
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        last_day = calendar.monthrange(month.year, month.month)[1]
+        days = pd.date_range(max(month, start), min(date(month.year, month.month, last_day), end))
+        flows = daily_flows(rng, len(days), base_mgd)
+        # ~3% of days have no operator entry
+        flows[rng.random(len(days)) < 0.03] = np.nan
+
+        date_header = f"OPERATOR DATA\nDaily\n{month.month}/1/{month.year} - {month.month}/{last_day}/{month.year}"
+        data = {
+            date_header: [f"{d.month}/{d.day}/{d.year}" for d in days],
+            PLANT_A_COLUMNS[0]: flows,
+            PLANT_A_COLUMNS[1]: np.round(flows * rng.uniform(1.2, 1.6, len(days)), 2),
+            PLANT_A_COLUMNS[2]: np.round(flows * rng.uniform(0.5, 0.8, len(days)), 2),
+            PLANT_A_COLUMNS[3]: np.zeros(len(days)),
+            PLANT_A_COLUMNS[4]: np.zeros(len(days)),
+            PLANT_A_COLUMNS[5]: np.round(flows * 0.27, 1),
+        }
+        df = pd.DataFrame(data)
+        values = df[PLANT_A_COLUMNS]
+        summary = pd.DataFrame(
+            {
+                date_header: ["Sum", "Avg", "Max", "Min", "Count", "Formula"],
+                **{
+                    column: [values[column].sum(), values[column].mean(), values[column].max(),
+                             values[column].min(), values[column].count(), np.nan]
+                    for column in PLANT_A_COLUMNS
+                },
+            }
+        )
+        label = f"{plant_id}-OPS DATA-{calendar.month_abbr[month.month].upper()}{month.year % 100:02d}"
+        path = os.path.join(out_dir, f"{label}.xlsx")
+        pd.concat([df, summary], ignore_index=True).to_excel(path, index=False)
+        files[path] = label
+        month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+    return files
+
+
+def write_plant_b_exports(out_dir: str, plant_id: str, start: date, end: date, rng, base_mgd: float) -> dict:
+    """
+    Overlapping MPOR exports (28-day windows every 21 days, like the sample files)
+
+    Returns:
+        source_file label -> export path, as run_ops_plant_b expects
+    """
+    all_days = pd.date_range(start, end)
+    influent = daily_flows(rng, len(all_days), base_mgd)
+    flows = pd.Series(influent, index=all_days)
+
+    files = {}
+    window_start = pd.Timestamp(start)
+    while window_start <= pd.Timestamp(end):
+        window_end = min(window_start + timedelta(days=MPOR_WINDOW_DAYS - 1), pd.Timestamp(end))
+        window = flows[window_start:window_end]
+
+        width = 10
+        rows = [
+            [None] * width,
+            [plant_id] + [None] * (width - 1),
+            [f"{window_start:%B, %Y}"] + [None] * (width - 1),
+            [f"{datetime.now():%m/%d/%Y %I:%M:%S %p}"] + [None] * (width - 1),
+            [None] * width,
+        ]
+        header = [[None] * width for _ in range(7)]
+        header[2][0] = "DATE"
+        for section, number, label_1, label_2, label_3, unit in PLANT_B_HEADER:
+            header[0][number] = section
+            header[1][number] = number
+            header[2][number], header[3][number], header[4][number] = label_1, label_2, label_3
+            header[6][number] = unit
+        rows += header
+
+        for day, flow in window.items():
+            row = [None] * width
+            row[0] = day.to_pydatetime()
+            row[1] = flow
+            row[2] = round(rng.normal(6.6, 0.1), 1)
+            row[7] = flow
+            row[8] = round(rng.normal(6.7, 0.1), 2)
+            rows.append(row)
+        rows += [[None] * width] * 2
+        for stat, func in (("TOTAL", np.sum), ("MAX", np.max), ("MIN", np.min), ("AVG", np.mean)):
+            row = [None] * width
+            row[0], row[1], row[7] = stat, func(window.to_numpy()), func(window.to_numpy())
+            rows.append(row)
+
+        label = f"{plant_id}-MPOR_{window_start:%m%d%Y}to{window_end:%m%d%Y}"
+        path = os.path.join(out_dir, f"{label}.xlsx")
+        pd.DataFrame(rows).to_excel(path, index=False, header=False)
+        files[label] = path
+        window_start += timedelta(days=MPOR_STEP_DAYS)
+    return files
+
+
+def write_calcium_csv(path: str, plants: list[str], start: date, end: date, rng) -> int:
+    """
+    IC calcium results for both clarifiers, two replicates per unit and sample day
+
+    Returns:
+        Number of rows written
+    """
+    days = pd.date_range(start, end)
+    frames = []
+    for plant_id in plants:
+        # Samples most days; some days miss one or both units
+        sampled = days[rng.random(len(days)) < 0.85]
+        upstream = rng.normal(40.0, 2.0, len(sampled))
+        delta = rng.normal(10.0, 4.0, len(sampled))
+        for unit, base, keep in (
+            ("primary_clarifier", upstream, rng.random(len(sampled)) > 0.03),
+            ("secondary_clarifier", upstream + delta, rng.random(len(sampled)) > 0.03),
+        ):
+            for replicate in (1, 2):
+                frames.append(
+                    pd.DataFrame(
+                        {
+                            "unique_id": [f"{plant_id}_{unit}_{d:%Y%m%d}_01" for d in sampled[keep]],
+                            "date": sampled[keep].strftime("%Y-%m-%d"),
+                            "replicate_num": replicate,
+                            "plant_id": plant_id,
+                            "unit_type_id": unit,
+                            "value": base[keep] + rng.normal(0, 0.3, keep.sum()),
+                            # The first replicate carries no uncertainty, as in the sample file
+                            "uncertainty": np.nan if replicate == 1 else np.abs(rng.normal(0.25, 0.02, keep.sum())),
+                        }
+                    )
+                )
+
+    df = pd.concat(frames, ignore_index=True)
+    df = df.assign(
+        time_analyzed=(pd.Timestamp(end) + timedelta(days=1)).strftime("%Y-%m-%d"),
+        medium="aqueous",
+        data_type="deployment",
+        data_provider="CREW",
+        instrument="IC",
+        analytical_session_id="YASIC_IC_YYYYMMDD",
+        unit_sub_id=None,
+        measurement_point="outlet",
+        parameter_name="calcium",
+        units="mg/L",
+        source_file="synthetic.csv",
+        source_sheet="sheet_name",
+        source_col_idx=None,
+        date_generated="1900-01-01",
+        notes=None,
+        flag_match=True,
+    )
+    df.sort_values(["date", "plant_id", "unit_type_id", "replicate_num"])[CALCIUM_COLUMNS].to_csv(path, index=False)
+    return len(df)
+
+
+def write_ph_csvs(out_dir: str, plants: list[str], start: date, end: date, rng, interval_minutes: int = 1) -> list[str]:
+    """
+    One sensor CSV per plant (secondary clarifier), one reading every interval_minutes
+
+    Returns:
+        Paths of the written files
+    """
+    timestamps = pd.date_range(start, pd.Timestamp(end) + timedelta(days=1), freq=f"{interval_minutes}min", inclusive="left")
+    daily_cycle = 0.08 * np.sin(2 * np.pi * (timestamps.hour * 60 + timestamps.minute) / 1440)
+    paths = []
+    for i, plant_id in enumerate(plants):
+        values = 6.9 + daily_cycle + np.cumsum(rng.normal(0, 0.002, len(timestamps))) + rng.normal(0, 0.02, len(timestamps))
+        df = pd.DataFrame(
+            {
+                "Timestamp": timestamps.strftime("%Y-%m-%d %H:%M:%S"),
+                "Measurement value": np.round(values, 3),
+                "Unit": "pH",
+                "sensor_id": f"WB{i:04d}",
+                "unit_type_id": "secondary_clarifier",
+                "plant_id": plant_id,
+                "Process value": "pH",
+            }
+        )
+        path = os.path.join(out_dir, f"{plant_id}_PH_sanitized.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def generate_dataset(
+    out_dir: str,
+    n_plants: int,
+    start: date,
+    end: date,
+    ph_interval_minutes: int = 1,
+    seed: int = 0,
+) -> dict:
+    """
+    Write a full synthetic input set
+
+    Plants alternate between Plant A-style workbooks and Plant B-style MPOR exports.
+
+    Args:
+        out_dir: Directory for the generated files
+        n_plants: Number of plants
+        start: First day
+        end: Last day
+        ph_interval_minutes: Minutes between pH sensor readings
+        seed: Seed for reproducible data
+
+    Returns:
+        Manifest: {"plants": {plant_id: {"ops_style": "A"|"B", "ops_files": {...}}}, "calcium": path, "ph": [paths]}
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    plants = plant_ids(n_plants)
+
+    manifest = {"plants": {}}
+    for i, plant_id in enumerate(plants):
+        base_mgd = float(rng.uniform(5, 40))
+        if i % 2 == 0:
+            ops_files = write_plant_a_workbooks(out_dir, plant_id, start, end, rng, base_mgd)
+            manifest["plants"][plant_id] = {"ops_style": "A", "ops_files": ops_files}
+        else:
+            ops_files = write_plant_b_exports(out_dir, plant_id, start, end, rng, base_mgd)
+            manifest["plants"][plant_id] = {"ops_style": "B", "ops_files": ops_files}
+
+    manifest["calcium"] = os.path.join(out_dir, "IC_calcium_synthetic.csv")
+    calcium_rows = write_calcium_csv(manifest["calcium"], plants, start, end, rng)
+    manifest["ph"] = write_ph_csvs(out_dir, plants, start, end, rng, ph_interval_minutes)
+
+    logger.info(
+        f"✓ Generated {n_plants} plants from {start} to {end}: "
+        f"{sum(len(p['ops_files']) for p in manifest['plants'].values())} ops files, "
+        f"{calcium_rows} calcium rows, {len(manifest['ph'])} pH files in {out_dir}"
+    )
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic ops, calcium and pH input files")
+    parser.add_argument("--plants", type=int, default=4)
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=date(2025, 1, 1))
+    parser.add_argument("--ph-interval-minutes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="data/output/synthetic")
+    args = parser.parse_args()
+
+    end_date = args.start_date + timedelta(days=round(365 * args.years) - 1)
+    generate_dataset(args.out, args.plants, args.start_date, end_date, args.ph_interval_minutes, args.seed)
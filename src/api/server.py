@@ -0,0 +1,216 @@
+# src/api/server.py
+"""
+Read-only HTTP data API
+
+Serves CO2 calculations and daily calcium/pH aggregates as JSON or Arrow IPC:
+
+    GET /co2?plant_id=PLANT_A&start_date=2025-04-01&end_date=2025-06-30&calculation_version=v1.0
+    GET /calcium/daily?plant_id=PLANT_A&start_date=2025-04-01
+    GET /ph/daily?format=arrow
+
+ETags are derived from the dataset's data version (crewcarbon_data_version), so
+a client polling with If-None-Match gets 304 Not Modified without any query
+being run; bodies for the current version are also kept in a small in-process
+cache. Responses are gzip-compressed when the client accepts it.
+
+Run with: python -m src.api.server --port 8000
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import io
+import os
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+from src.dashboards.queries import lab_aggregate_query
+from src.models.data_version import get_data_versions
+from src.models.database import get_engine
+from src.utils.logging_config import setup_logger
+
+# pandas and the export module are imported on the first data request, so the server
+# starts (and answers /health) without loading them
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = setup_logger(__name__)
+
+ARROW_MIME = "application/vnd.apache.arrow.stream"
+# Data versions are re-read at most this often; everything else is answered from memory
+VERSION_TTL_SECONDS = float(os.getenv("API_VERSION_TTL_SECONDS", "5"))
+RESPONSE_CACHE_ENTRIES = 128
+GZIP_MIN_BYTES = 1024
+
+# path -> (data version dataset, filters accepted besides plant_id/start_date/end_date)
+ROUTES = {
+    "/co2": ("co2_removal", ("calculation_version",)),
+    "/calcium/daily": ("lab_reading", ()),
+    "/ph/daily": ("lab_reading", ()),
+}
+
+_versions = {"fetched_at": 0.0, "values": {}}
+_versions_lock = threading.Lock()
+
+
+def current_versions() -> dict[str, int]:
+    """Data versions, refreshed at most every VERSION_TTL_SECONDS"""
+    with _versions_lock:
+        if time.monotonic() - _versions["fetched_at"] > VERSION_TTL_SECONDS:
+            with get_engine().connect() as conn:
+                _versions["values"] = get_data_versions(conn)
+            _versions["fetched_at"] = time.monotonic()
+        return _versions["values"]
+
+
+def parse_filters(path: str, query: str) -> tuple:
+    """
+    Validate query parameters for a route
+
+    Returns:
+        Sorted tuple of (name, value) pairs, hashable for caching
+
+    Raises:
+        ValueError: On unknown parameters or malformed dates
+    """
+    allowed = {"plant_id", "start_date", "end_date", "format", *ROUTES[path][1]}
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    unknown = set(params) - allowed
+    if unknown:
+        raise ValueError(f"Unknown query parameters: {sorted(unknown)}")
+
+    for key in ("start_date", "end_date"):
+        if key in params:
+            params[key] = date.fromisoformat(params[key])
+    if path == "/co2":
+        params.setdefault("calculation_version", "v1.0")
+    params.pop("format", None)
+    return tuple(sorted(params.items()))
+
+
+def make_etag(dataset: str, version: int, path: str, filters: tuple, fmt: str) -> str:
+    """Weak ETag: changes when the dataset version, the request or the format changes"""
+    digest = hashlib.sha1(repr((path, filters, fmt)).encode()).hexdigest()[:16]
+    return f'W/"{dataset}-v{version}-{digest}"'
+
+
+def load_frame(path: str, filters: tuple) -> pd.DataFrame:
+    """Run the query behind one route"""
+    import pandas as pd
+
+    from src.dashboards.export import export_statement
+
+    kwargs = dict(filters)
+    with get_engine().connect() as conn:
+        if path == "/co2":
+            statement, _ = export_statement("CO2 calculations", **kwargs)
+            return pd.read_sql(statement, conn)
+        if path == "/calcium/daily":
+            parameter_name, value_alias = "calcium", "ca_mean_mg_per_l"
+        else:
+            parameter_name, value_alias = "pH", "ph_mean"
+        query, params = lab_aggregate_query(parameter_name, "day", value_alias=value_alias, **kwargs)
+        return pd.read_sql(query, conn, params=params)
+
+
+def serialize(df: pd.DataFrame, fmt: str) -> bytes:
+    """JSON records, or an Arrow IPC stream for columnar clients"""
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient="records", date_format="iso").encode()
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_ENTRIES)
+def render(path: str, filters: tuple, fmt: str, version: int, accept_gzip: bool) -> tuple[bytes, bool]:
+    """
+    Response body for one request at one data version (version is part of the cache key)
+
+    Returns:
+        (body, whether the body is gzip-compressed)
+    """
+    body = serialize(load_frame(path, filters), fmt)
+    if accept_gzip and len(body) >= GZIP_MIN_BYTES:
+        return gzip.compress(body, compresslevel=6), True
+    return body, False
+
+
+class DataAPIHandler(BaseHTTPRequestHandler):
+    server_version = "CrewCarbonDataAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            return self._send(HTTPStatus.OK, b"ok", "text/plain")
+        if url.path not in ROUTES:
+            return self._send(HTTPStatus.NOT_FOUND, b"Unknown endpoint", "text/plain")
+
+        try:
+            filters = parse_filters(url.path, url.query)
+        except ValueError as e:
+            return self._send(HTTPStatus.BAD_REQUEST, str(e).encode(), "text/plain")
+
+        fmt_param = parse_qs(url.query).get("format", [None])[-1]
+        fmt = "arrow" if fmt_param == "arrow" or ARROW_MIME in self.headers.get("Accept", "") else "json"
+        dataset = ROUTES[url.path][0]
+        try:
+            version = current_versions().get(dataset, 0)
+        except Exception as e:
+            logger.error(f"✗ {self.path}: data versions unavailable: {e}", exc_info=True)
+            return self._send(HTTPStatus.SERVICE_UNAVAILABLE, b"Database unavailable", "text/plain")
+        etag = make_etag(dataset, version, url.path, filters, fmt)
+
+        if etag in self.headers.get("If-None-Match", ""):
+            return self._send(HTTPStatus.NOT_MODIFIED, b"", etag=etag)
+
+        accept_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        try:
+            body, gzipped = render(url.path, filters, fmt, version, accept_gzip)
+        except Exception as e:
+            logger.error(f"✗ {self.path} failed: {e}", exc_info=True)
+            return self._send(HTTPStatus.INTERNAL_SERVER_ERROR, b"Query failed", "text/plain")
+
+        content_type = ARROW_MIME if fmt == "arrow" else "application/json"
+        self._send(HTTPStatus.OK, body, content_type, etag=etag, gzipped=gzipped)
+
+    def _send(self, status, body: bytes, content_type: str = None, etag: str = None, gzipped: bool = False):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            # Clients may keep the body but must revalidate; revalidation is answered from the version alone
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept, Accept-Encoding")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only CO2 and lab data API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), DataAPIHandler)
+    logger.info(f"Serving data API on http://{args.host}:{args.port}")
+    server.serve_forever()
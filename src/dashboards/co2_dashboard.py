@@ -1,227 +1,217 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-from sqlalchemy import create_engine, text
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from sqlalchemy import create_engine
 import os
 
+from src.dashboards.downsample import downsample_frame
+from src.dashboards.export import EXPORT_DATASETS, EXPORT_FORMATS, build_export
+from src.dashboards.pagination import BROWSE_DATASETS, browse_statement, estimate_total, fetch_page
+from src.dashboards.queries import (
+    co2_calculations_query,
+    estimate_row_counts,
+    has_timescaledb,
+    ph_aggregate_query,
+    ph_bucket_for_span,
+    ph_counts_query,
+)
+from src.models.data_version import DATASETS, get_data_versions
+from src.mrv.rollups import get_co2_totals
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Connections shared by every dashboard session in this Streamlit process
+DASHBOARD_POOL_SIZE = int(os.getenv("DASHBOARD_POOL_SIZE", "5"))
+DASHBOARD_MAX_OVERFLOW = int(os.getenv("DASHBOARD_MAX_OVERFLOW", "10"))
+
+# Independent reads on a rerun are issued together, at most one per pooled connection
+QUERY_WORKERS = DASHBOARD_POOL_SIZE
+
+# Points per chart trace after LTTB downsampling, so figure payloads stay bounded for long ranges
+CHART_MAX_POINTS = int(os.getenv("DASHBOARD_CHART_MAX_POINTS", "1000"))
+
+# Query caches are keyed on the data version, so entries only go stale when a pipeline writes;
+# max_entries bounds each loader's cache and evicts the least recently used results
+CACHE_MAX_ENTRIES = int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "64"))
+DATA_VERSION_TTL_SECONDS = int(os.getenv("DASHBOARD_DATA_VERSION_TTL_SECONDS", "15"))
+# Catalog estimates also move with autovacuum/ANALYZE, not only with pipeline writes
+TABLE_STATS_TTL_SECONDS = int(os.getenv("DASHBOARD_TABLE_STATS_TTL_SECONDS", "300"))
+
+# Sidebar label -> table whose estimated row count it shows
+TABLE_STATS_TABLES = {
+    "CO2 Calculations": "crewcarbon_co2_removal_calculation",
+    "Lab Readings": "crewcarbon_lab_reading",
+    "Plant Metadata": "wastewater_plant_metadata",
+    "Plant Operations": "wastewater_plant_operation",
+}
+
+
+@st.cache_resource
+def get_engine():
+    """One pooled engine per process; loaders borrow connections from it"""
+    return create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=DASHBOARD_POOL_SIZE,
+        max_overflow=DASHBOARD_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_recycle=3600,
+    )
+
+
+def thin(df, y, by=None):
+    """Downsample each trace of df to CHART_MAX_POINTS, keeping peaks"""
+    return downsample_frame(df, "date", y, CHART_MAX_POINTS, by)
 
-@st.cache_data
-def get_table_stats():
-    engine = create_engine(DATABASE_URL)
-    stats = {}
-    tables = {
-        "CO2 Calculations": "crewcarbon_co2_removal_calculation",
-        "Lab Readings": "crewcarbon_lab_reading",
-        "Plant Metadata": "wastewater_plant_metadata",
-        "Plant Operations": "wastewater_plant_operation",
-    }
-    with engine.connect() as conn:
-        for display_name, table_name in tables.items():
-            try:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                count = result.scalar()
-                stats[display_name] = count
-            except Exception as e:
-                stats[display_name] = f"Error: {e}"
-    return stats
-
-
-@st.cache_data
-def load_co2_data(plant_id=None, start_date=None, end_date=None, quality_flags=None):
-    engine = create_engine(DATABASE_URL)
-    query = """
-        SELECT 
-            plant_id,
-            date,
-            ca_upstream_mg_per_l,
-            ca_downstream_mg_per_l,
-            ca_delta_mg_per_l,
-            flow_mgd,
-            co2_removed_metric_tons_per_day,
-            quality_flag
-        FROM crewcarbon_co2_removal_calculation
-        WHERE 1=1
-    """
-    params = {}
-    if plant_id:
-        query += " AND plant_id = %(plant_id)s"
-        params["plant_id"] = plant_id
-    if start_date:
-        query += " AND date >= %(start_date)s"
-        params["start_date"] = start_date
-    if end_date:
-        query += " AND date <= %(end_date)s"
-        params["end_date"] = end_date
-    if quality_flags:
-        placeholders = ", ".join([f"%(flag_{i})s" for i in range(len(quality_flags))])
-        query += f" AND quality_flag IN ({placeholders})"
-        for i, flag in enumerate(quality_flags):
-            params[f"flag_{i}"] = flag
-    query += " ORDER BY date"
-    df = pd.read_sql(query, engine, params=params)
-    if not df.empty:
-        df["date"] = pd.to_datetime(df["date"])
-    return df
 
+def thin_xy(df, y):
+    """x/y arguments for one go.Scatter trace, downsampled"""
+    thinned = thin(df, y)
+    return {"x": thinned["date"], "y": thinned[y]}
 
-@st.cache_data
-def load_calcium_readings(plant_id=None, start_date=None, end_date=None):
-    engine = create_engine(DATABASE_URL)
-    query = """
-        SELECT 
-            plant_id,
-            plant_unit_id,
-            datetime,
-            parameter_name,
-            value,
-            unit
-        FROM crewcarbon_lab_reading
-        WHERE parameter_name = 'calcium'
+
+@st.cache_resource
+def get_query_executor():
+    """Thread pool shared by all sessions for concurrent loader calls"""
+    return ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="dashboard-query")
+
+
+def submit_all(calls):
     """
-    params = {}
-    if plant_id:
-        query += " AND plant_id = %(plant_id)s"
-        params["plant_id"] = plant_id
-    if start_date:
-        query += " AND datetime >= %(start_date)s"
-        params["start_date"] = start_date
-    if end_date:
-        query += " AND datetime <= %(end_date)s"
-        params["end_date"] = end_date
-    query += " ORDER BY datetime"
-    df = pd.read_sql(query, engine, params=params)
-    if not df.empty:
-        df["datetime"] = pd.to_datetime(df["datetime"])
-    return df
+    Start independent loader calls concurrently
 
+    Args:
+        calls: dict of name -> (loader, args)
 
-@st.cache_data
-def load_ph_data(plant_id=None, start_date=None, end_date=None):
-    engine = create_engine(DATABASE_URL)
-    query = """
-        SELECT 
-            plant_id,
-            plant_unit_id,
-            datetime,
-            parameter_name,
-            value,
-            unit
-        FROM crewcarbon_lab_reading
-        WHERE parameter_name = 'pH'
+    Returns:
+        dict of name -> Future; .result() re-raises the loader's exception
     """
-    params = {}
-    if plant_id:
-        query += " AND plant_id = %(plant_id)s"
-        params["plant_id"] = plant_id
-    if start_date:
-        query += " AND datetime >= %(start_date)s"
-        params["start_date"] = start_date
-    if end_date:
-        query += " AND datetime <= %(end_date)s"
-        params["end_date"] = end_date
-    query += " ORDER BY datetime"
-    df = pd.read_sql(query, engine, params=params)
-    if not df.empty:
-        df["datetime"] = pd.to_datetime(df["datetime"])
-        df["date"] = df["datetime"].dt.date
-    return df
+    ctx = get_script_run_ctx()
 
+    def run(loader, args):
+        # Loaders use st.cache_data, which needs the session's script context in worker threads
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return loader(*args)
 
-def calculate_daily_ph_stats(ph_df):
-    if ph_df.empty:
-        return pd.DataFrame()
-    daily_stats = ph_df.groupby(["plant_id", "plant_unit_id", "date"]).agg({"value": "mean"}).reset_index()
-    daily_stats.columns = ["plant_id", "plant_unit_id", "date", "ph_mean"]
-    daily_stats["date"] = pd.to_datetime(daily_stats["date"])
-    return daily_stats
+    executor = get_query_executor()
+    return {name: executor.submit(run, loader, args) for name, (loader, args) in calls.items()}
 
 
-# Dashboard
-st.set_page_config(page_title="CO2 Removal Dashboard", layout="wide")
+@st.cache_data(ttl=DATA_VERSION_TTL_SECONDS)
+def load_data_versions():
+    with get_engine().connect() as conn:
+        return get_data_versions(conn)
 
-st.title("Crew Carbon CO2 Removal Dashboard")
-st.markdown("Monitor Ca levels, pH, and CO2 removal in wastewater plants")
 
-st.sidebar.header("Filters")
-st.sidebar.header("Database Statistics")
-table_stats = get_table_stats()
-for table_name, count in table_stats.items():
-    st.sidebar.metric(table_name, count)
-st.sidebar.markdown("---")
+@st.cache_data(ttl=TABLE_STATS_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def get_table_stats(data_version=None):
+    with get_engine().connect() as conn:
+        estimates = estimate_row_counts(conn, list(TABLE_STATS_TABLES.values()))
+    return {display_name: estimates[table_name] for display_name, table_name in TABLE_STATS_TABLES.items()}
 
-engine = create_engine(DATABASE_URL)
-try:
-    plants_df = pd.read_sql(
-        "SELECT DISTINCT plant_id FROM crewcarbon_co2_removal_calculation ORDER BY plant_id",
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_plant_ids(data_version=None):
+    engine = get_engine()
+    df = pd.read_sql("SELECT DISTINCT plant_id FROM crewcarbon_co2_removal_calculation ORDER BY plant_id", engine)
+    return df["plant_id"].tolist()
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_calculation_versions(data_version=None):
+    engine = get_engine()
+    df = pd.read_sql(
+        "SELECT DISTINCT calculation_version FROM crewcarbon_co2_removal_calculation ORDER BY calculation_version",
         engine,
     )
-    plant_options = ["All"] + plants_df["plant_id"].tolist()
-except Exception as e:
-    st.error(f"Error loading plants: {e}")
-    plant_options = ["All"]
+    return df["calculation_version"].tolist()
 
-selected_plant = st.sidebar.selectbox("Select Plant", plant_options)
-plant_filter = None if selected_plant == "All" else selected_plant
 
-col1, col2 = st.sidebar.columns(2)
-with col1:
-    start_date = st.date_input("Start Date", value=date(2025, 4, 1))
-with col2:
-    end_date = st.date_input("End Date", value=date(2025, 6, 30))
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_co2_data(
+    plant_id=None, start_date=None, end_date=None, quality_flags=None, calculation_version="v1.0", data_version=None
+):
+    query, params = co2_calculations_query(plant_id, start_date, end_date, quality_flags, calculation_version)
+    with get_engine().connect() as conn:
+        df = pd.read_sql(query, conn, params=params)
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"])
+    return df
 
-st.sidebar.header("Data Quality")
-show_valid = st.sidebar.checkbox("Show VALID", value=True)
-show_invalid = st.sidebar.checkbox("Show INVALID", value=True)
 
-quality_flags = []
-if show_valid:
-    quality_flags.append("VALID")
-if show_invalid:
-    quality_flags.append("INVALID")
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_co2_totals(plant_id, start_date, end_date, quality_flags, calculation_version="v1.0", data_version=None):
+    engine = get_engine()
+    with engine.connect() as conn:
+        return get_co2_totals(conn, start_date, end_date, plant_id, quality_flags, calculation_version)
 
-if quality_flags:
-    co2_df = load_co2_data(plant_filter, start_date, end_date, quality_flags)
-else:
-    co2_df = pd.DataFrame()
-ca_df = load_calcium_readings(plant_filter, start_date, end_date)
 
-ph_df = load_ph_data(plant_filter, start_date, end_date)
-ph_daily = calculate_daily_ph_stats(ph_df)
+@st.cache_resource
+def use_time_bucket():
+    with get_engine().connect() as conn:
+        return has_timescaledb(conn)
 
-if not co2_df.empty:
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("Filtered Data Quality")
-    quality_counts = co2_df["quality_flag"].value_counts()
-    for flag, count in quality_counts.items():
-        st.sidebar.metric(f"{flag} records", count)
 
-if not ph_df.empty:
-    st.sidebar.markdown("---")
-    st.sidebar.subheader("pH Data Statistics")
-    st.sidebar.metric("Total pH Measurements", len(ph_df))
-    st.sidebar.metric("Days with pH Data", len(ph_daily))
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_ph_aggregates(plant_id=None, start_date=None, end_date=None, bucket="day", data_version=None):
+    query, params = ph_aggregate_query(bucket, plant_id, start_date, end_date, use_time_bucket())
+    with get_engine().connect() as conn:
+        df = pd.read_sql(query, conn, params=params)
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_ph_counts(plant_id=None, start_date=None, end_date=None, data_version=None):
+    query, params = ph_counts_query(plant_id, start_date, end_date)
+    with get_engine().connect() as conn:
+        row = conn.execute(query, params).one()
+    return {"measurements": row.measurements, "days": row.days}
+
+
+@st.fragment
+def co2_section(co2_all, selected_plant, plant_filter, start_date, end_date, selected_version, co2_version):
+    """Key metrics and every CO2/calcium/flow chart; the quality toggles rerun only this section"""
+    st.header("Key Metrics")
+    flag_col1, flag_col2, _ = st.columns([1, 1, 4])
+    with flag_col1:
+        show_valid = st.checkbox("Show VALID", value=True)
+    with flag_col2:
+        show_invalid = st.checkbox("Show INVALID", value=True)
+
+    quality_flags = []
+    if show_valid:
+        quality_flags.append("VALID")
+    if show_invalid:
+        quality_flags.append("INVALID")
 
-st.header("Key Metrics")
+    co2_df = co2_all[co2_all["quality_flag"].isin(quality_flags)]
+    if co2_df.empty:
+        st.warning("No data available for selected filters")
+        return
 
-if not co2_df.empty:
+    quality_counts = co2_df["quality_flag"].value_counts()
+    st.caption(
+        "Filtered data quality: " + ", ".join(f"{flag} {count} records" for flag, count in quality_counts.items())
+    )
+
+    totals = load_co2_totals(plant_filter, start_date, end_date, quality_flags, selected_version, co2_version)
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        total_co2 = co2_df["co2_removed_metric_tons_per_day"].sum()
-        st.metric("Total CO2 Removed", f"{total_co2:.2f} MT")
+        st.metric("Total CO2 Removed", f"{totals['total_co2_metric_tons']:.2f} MT")
     with col2:
-        avg_co2 = co2_df["co2_removed_metric_tons_per_day"].mean()
-        st.metric("Avg Daily CO2", f"{avg_co2:.4f} MT/day")
+        st.metric("Avg Daily CO2", f"{totals['avg_co2_metric_tons_per_day']:.4f} MT/day")
     with col3:
-        avg_ca_delta = co2_df["ca_delta_mg_per_l"].mean()
-        st.metric("Avg Ca Delta", f"{avg_ca_delta:.2f} mg/L")
+        st.metric("Avg Ca Delta", f"{totals['avg_ca_delta_mg_per_l']:.2f} mg/L")
     with col4:
-        total_days = len(co2_df)
-        st.metric("Days Monitored", total_days)
+        st.metric("Days Monitored", totals["day_count"])
 
     st.header("CO2 Removal Over Time")
     color_col = None
@@ -230,7 +220,7 @@ if not co2_df.empty:
     elif selected_plant == "All":
         color_col = "plant_id"
     fig_co2 = px.line(
-        co2_df,
+        thin(co2_df, "co2_removed_metric_tons_per_day", color_col),
         x="date",
         y="co2_removed_metric_tons_per_day",
         color=color_col,
@@ -240,28 +230,6 @@ if not co2_df.empty:
     fig_co2.update_layout(height=400)
     st.plotly_chart(fig_co2, use_container_width=True)
 
-    # pH Data Visualization - Always daily average line plot, grouped by plant unit
-    if not ph_daily.empty:
-        st.header("Daily Average pH Over Time")
-        color_col_ph = "plant_unit_id"  # ✅ Group by plant_unit_id for lines
-
-        fig_ph = px.line(
-            ph_daily,
-            x="date",
-            y="ph_mean",
-            color=color_col_ph,
-            title="Daily Average pH Levels by Unit",
-            labels={"ph_mean": "pH (Average)", "date": "Date", "plant_unit_id": "Unit"},
-        )
-        fig_ph.update_layout(height=400)
-        st.plotly_chart(fig_ph, use_container_width=True)
-
-        # Table by day and unit
-        with st.expander("View Daily pH Averages Table"):
-            st.dataframe(
-                ph_daily.sort_values(["date", "plant_unit_id"], ascending=[False, True]), use_container_width=True
-            )
-
     st.header("Calcium Levels Over Time")
     fig_ca_calc = go.Figure()
     if selected_plant == "All":
@@ -273,8 +241,7 @@ if not co2_df.empty:
                     line_style = "solid" if flag == "VALID" else "dot"
                     fig_ca_calc.add_trace(
                         go.Scatter(
-                            x=flag_data["date"],
-                            y=flag_data["ca_upstream_mg_per_l"],
+                            **thin_xy(flag_data, "ca_upstream_mg_per_l"),
                             name=f"{plant} Upstream ({flag})",
                             mode="lines",
                             line=dict(dash=line_style),
@@ -282,8 +249,7 @@ if not co2_df.empty:
                     )
                     fig_ca_calc.add_trace(
                         go.Scatter(
-                            x=flag_data["date"],
-                            y=flag_data["ca_downstream_mg_per_l"],
+                            **thin_xy(flag_data, "ca_downstream_mg_per_l"),
                             name=f"{plant} Downstream ({flag})",
                             mode="lines",
                             line=dict(dash="dash" if line_style == "solid" else "dashdot"),
@@ -292,16 +258,14 @@ if not co2_df.empty:
             else:
                 fig_ca_calc.add_trace(
                     go.Scatter(
-                        x=plant_data["date"],
-                        y=plant_data["ca_upstream_mg_per_l"],
+                        **thin_xy(plant_data, "ca_upstream_mg_per_l"),
                         name=f"{plant} Upstream",
                         mode="lines",
                     )
                 )
                 fig_ca_calc.add_trace(
                     go.Scatter(
-                        x=plant_data["date"],
-                        y=plant_data["ca_downstream_mg_per_l"],
+                        **thin_xy(plant_data, "ca_downstream_mg_per_l"),
                         name=f"{plant} Downstream",
                         mode="lines",
                         line=dict(dash="dash"),
@@ -314,8 +278,7 @@ if not co2_df.empty:
                 line_style = "solid" if flag == "VALID" else "dot"
                 fig_ca_calc.add_trace(
                     go.Scatter(
-                        x=flag_data["date"],
-                        y=flag_data["ca_upstream_mg_per_l"],
+                        **thin_xy(flag_data, "ca_upstream_mg_per_l"),
                         name=f"Upstream ({flag})",
                         mode="lines",
                         line=dict(dash=line_style),
@@ -323,8 +286,7 @@ if not co2_df.empty:
                 )
                 fig_ca_calc.add_trace(
                     go.Scatter(
-                        x=flag_data["date"],
-                        y=flag_data["ca_downstream_mg_per_l"],
+                        **thin_xy(flag_data, "ca_downstream_mg_per_l"),
                         name=f"Downstream ({flag})",
                         mode="lines",
                         line=dict(dash="dash" if line_style == "solid" else "dashdot"),
@@ -333,16 +295,14 @@ if not co2_df.empty:
         else:
             fig_ca_calc.add_trace(
                 go.Scatter(
-                    x=co2_df["date"],
-                    y=co2_df["ca_upstream_mg_per_l"],
+                    **thin_xy(co2_df, "ca_upstream_mg_per_l"),
                     name="Upstream",
                     mode="lines",
                 )
             )
             fig_ca_calc.add_trace(
                 go.Scatter(
-                    x=co2_df["date"],
-                    y=co2_df["ca_downstream_mg_per_l"],
+                    **thin_xy(co2_df, "ca_downstream_mg_per_l"),
                     name="Downstream",
                     mode="lines",
                     line=dict(dash="dash"),
@@ -362,7 +322,7 @@ if not co2_df.empty:
     elif selected_plant == "All":
         color_col_delta = "plant_id"
     fig_ca_delta = px.bar(
-        co2_df,
+        thin(co2_df, "ca_delta_mg_per_l", color_col_delta),
         x="date",
         y="ca_delta_mg_per_l",
         color=color_col_delta,
@@ -379,7 +339,7 @@ if not co2_df.empty:
     elif selected_plant == "All":
         color_col_flow = "plant_id"
     fig_flow = px.line(
-        co2_df,
+        thin(co2_df, "flow_mgd", color_col_flow),
         x="date",
         y="flow_mgd",
         color=color_col_flow,
@@ -389,28 +349,202 @@ if not co2_df.empty:
     fig_flow.update_layout(height=400)
     st.plotly_chart(fig_flow, use_container_width=True)
 
-    st.header("Raw Data")
-    st.dataframe(
-        co2_df[
-            [
-                "date",
-                "plant_id",
-                "ca_upstream_mg_per_l",
-                "ca_downstream_mg_per_l",
-                "ca_delta_mg_per_l",
-                "flow_mgd",
-                "co2_removed_metric_tons_per_day",
-                "quality_flag",
-            ]
-        ],
-        use_container_width=True,
-    )
-    csv = co2_df.to_csv(index=False)
+
+@st.fragment
+def ph_section(ph_daily, ph_label):
+    """pH averages per time bucket (aggregated in Postgres), grouped by plant unit"""
+    if not ph_daily.empty:
+        st.header(f"{ph_label} Average pH Over Time")
+        color_col_ph = "plant_unit_id"  # ✅ Group by plant_unit_id for lines
+
+        fig_ph = px.line(
+            thin(ph_daily, "ph_mean", color_col_ph),
+            x="date",
+            y="ph_mean",
+            color=color_col_ph,
+            title=f"{ph_label} Average pH Levels by Unit",
+            labels={"ph_mean": "pH (Average)", "date": "Date", "plant_unit_id": "Unit"},
+        )
+        fig_ph.update_layout(height=400)
+        st.plotly_chart(fig_ph, use_container_width=True)
+
+        # Table by bucket and unit
+        with st.expander(f"View {ph_label} pH Averages Table"):
+            st.dataframe(
+                ph_daily.sort_values(["date", "plant_unit_id"], ascending=[False, True]), use_container_width=True
+            )
+
+
+@st.fragment
+def export_section(plant_filter, start_date, end_date, selected_version):
+    """Dataset/format choices rerun only this section"""
+    # Export files are only built when the button is clicked, streamed from Postgres in chunks
+    st.header("Export Data")
+    export_col1, export_col2 = st.columns(2)
+    with export_col1:
+        export_dataset = st.selectbox("Dataset", list(EXPORT_DATASETS))
+    with export_col2:
+        export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True)
+    export_extension, export_mime = EXPORT_FORMATS[export_format]
+    export_engine = get_engine()
     st.download_button(
-        label="Download Data as CSV",
-        data=csv,
-        file_name=f"co2_removal_{start_date}_{end_date}.csv",
-        mime="text/csv",
+        label=f"Download {export_dataset} as {export_format}",
+        data=lambda: build_export(
+            export_engine,
+            export_dataset,
+            export_format,
+            plant_id=plant_filter,
+            start_date=start_date,
+            end_date=end_date,
+            calculation_version=selected_version,
+        ),
+        file_name=f"{export_dataset.lower().replace(' ', '_')}_{start_date}_{end_date}.{export_extension}",
+        mime=export_mime,
+    )
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_browse_page(dataset, filters, after, page_size, descending, data_version=None):
+    statement, key_columns = browse_statement(dataset, **dict(filters))
+    with get_engine().connect() as conn:
+        return fetch_page(conn, statement, key_columns, after, page_size, descending)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_browse_estimate(dataset, filters, data_version=None):
+    statement, _ = browse_statement(dataset, **dict(filters))
+    with get_engine().connect() as conn:
+        return estimate_total(conn, statement)
+
+
+@st.fragment
+def data_browser_section(plant_filter, start_date, end_date, selected_version, data_versions):
+    """One keyset page at a time of CO2 calculations or raw lab readings"""
+    st.header("Data Browser")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        dataset = st.selectbox("Table", list(BROWSE_DATASETS))
+    with col2:
+        parameter = st.selectbox("Parameter", ["All", "calcium", "pH"], disabled=dataset != "Lab readings")
+    with col3:
+        descending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Descending"
+    with col4:
+        page_size = st.selectbox("Rows per page", [50, 100, 500], index=1)
+
+    filters = (
+        ("plant_id", plant_filter),
+        ("start_date", start_date),
+        ("end_date", end_date),
+        ("calculation_version", selected_version),
+        ("parameter_name", None if parameter == "All" else parameter),
     )
-else:
-    st.warning("No data available for selected filters")
+    data_version = data_versions["co2_removal" if dataset == "CO2 calculations" else "lab_reading"]
+
+    # Start key of every page visited so far; reset whenever the query itself changes
+    signature = (dataset, filters, descending, page_size, data_version)
+    if st.session_state.get("browse_signature") != signature:
+        st.session_state.browse_signature = signature
+        st.session_state.browse_keys = [None]
+    page_keys = st.session_state.browse_keys
+
+    page, next_key = load_browse_page(dataset, filters, page_keys[-1], page_size, descending, data_version)
+    total = load_browse_estimate(dataset, filters, data_version)
+    st.caption(f"Page {len(page_keys)} of ~{max(1, -(-total // page_size)):,} (~{total:,} rows, estimated)")
+    st.dataframe(page, use_container_width=True, hide_index=True)
+
+    prev_col, next_col, _ = st.columns([1, 1, 6])
+    with prev_col:
+        st.button("Previous", disabled=len(page_keys) == 1, on_click=page_keys.pop)
+    with next_col:
+        st.button("Next", disabled=next_key is None, on_click=page_keys.append, args=(next_key,))
+
+
+# Dashboard
+st.set_page_config(page_title="CO2 Removal Dashboard", layout="wide")
+
+st.title("Crew Carbon CO2 Removal Dashboard")
+st.markdown("Monitor Ca levels, pH, and CO2 removal in wastewater plants")
+
+st.sidebar.header("Filters")
+st.sidebar.header("Database Statistics")
+try:
+    data_versions = load_data_versions()
+except Exception as e:
+    st.error(f"Error loading data versions: {e}")
+    data_versions = dict.fromkeys(DATASETS, 0)
+
+# Lookups that don't depend on the filters are fetched together
+lookups = submit_all(
+    {
+        "table_stats": (get_table_stats, (tuple(sorted(data_versions.items())),)),
+        "plants": (load_plant_ids, (data_versions["co2_removal"],)),
+        "versions": (load_calculation_versions, (data_versions["co2_removal"],)),
+    }
+)
+try:
+    table_stats = lookups["table_stats"].result()
+except Exception as e:
+    st.sidebar.error(f"Error loading table statistics: {e}")
+    table_stats = dict.fromkeys(TABLE_STATS_TABLES)
+for table_name, count in table_stats.items():
+    st.sidebar.metric(f"{table_name} (est.)", f"~{count:,}" if count is not None else "N/A")
+st.sidebar.caption("Estimated row counts from Postgres planner statistics (pg_class.reltuples)")
+st.sidebar.markdown("---")
+
+try:
+    plant_options = ["All"] + lookups["plants"].result()
+except Exception as e:
+    st.error(f"Error loading plants: {e}")
+    plant_options = ["All"]
+
+selected_plant = st.sidebar.selectbox("Select Plant", plant_options)
+plant_filter = None if selected_plant == "All" else selected_plant
+
+col1, col2 = st.sidebar.columns(2)
+with col1:
+    start_date = st.date_input("Start Date", value=date(2025, 4, 1))
+with col2:
+    end_date = st.date_input("End Date", value=date(2025, 6, 30))
+
+try:
+    version_options = lookups["versions"].result() or ["v1.0"]
+except Exception as e:
+    st.error(f"Error loading calculation versions: {e}")
+    version_options = ["v1.0"]
+selected_version = st.sidebar.selectbox(
+    "Calculation Version",
+    version_options,
+    index=version_options.index("v1.0") if "v1.0" in version_options else 0,
+)
+
+ph_bucket = ph_bucket_for_span(start_date, end_date)
+ph_label = {"hour": "Hourly", "day": "Daily", "week": "Weekly", "month": "Monthly"}[ph_bucket]
+
+# Every filtered read is independent: issue them together so the page waits for the slowest, not the sum.
+# CO2 rows are loaded for both quality flags so the CO2 section can toggle them without another query
+co2_version, lab_version = data_versions["co2_removal"], data_versions["lab_reading"]
+loaded = submit_all(
+    {
+        "co2": (
+            load_co2_data,
+            (plant_filter, start_date, end_date, ["VALID", "INVALID"], selected_version, co2_version),
+        ),
+        "ph_daily": (load_ph_aggregates, (plant_filter, start_date, end_date, ph_bucket, lab_version)),
+        "ph_counts": (load_ph_counts, (plant_filter, start_date, end_date, lab_version)),
+    }
+)
+co2_all = loaded["co2"].result()
+ph_daily = loaded["ph_daily"].result()
+ph_counts = loaded["ph_counts"].result()
+
+if ph_counts["measurements"]:
+    st.sidebar.markdown("---")
+    st.sidebar.subheader("pH Data Statistics")
+    st.sidebar.metric("Total pH Measurements", ph_counts["measurements"])
+    st.sidebar.metric("Days with pH Data", ph_counts["days"])
+
+# Each section is a fragment: its own widgets rerun only that section, sidebar filters rerun the page
+co2_section(co2_all, selected_plant, plant_filter, start_date, end_date, selected_version, co2_version)
+ph_section(ph_daily, ph_label)
+data_browser_section(plant_filter, start_date, end_date, selected_version, data_versions)
+export_section(plant_filter, start_date, end_date, selected_version)
@@ -0,0 +1,84 @@
+"""
+Downsampling of dashboard time series
+
+Largest-Triangle-Three-Buckets keeps the points that shape a line (peaks,
+dips, negative deltas) while bounding the number of points sent to Plotly,
+so chart payloads stay the same size however long the selected range is.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _bucket_means(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """NaN-ignoring mean of values[edges[i]:edges[i + 1]] for every bucket, via cumulative sums"""
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums[edges[1:]] - sums[edges[:-1]]) / (counts[edges[1:]] - counts[edges[:-1]])
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of the points LTTB keeps
+
+    Args:
+        x: Sorted x values (numbers or datetimes)
+        y: y values (NaN points are only kept when a bucket has nothing else)
+        n_out: Target number of points (first and last points are always kept)
+
+    Returns:
+        Sorted integer indices into x/y, at most n_out long
+    """
+    x = pd.Series(x)
+    if not pd.api.types.is_numeric_dtype(x):
+        x = pd.to_datetime(x).astype("int64")
+    x = x.to_numpy(dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last points
+    edges = np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    x_means = np.append(_bucket_means(x, edges)[1:], x[-1])
+    y_means = np.append(_bucket_means(y, edges)[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Twice the area of the triangle (previous pick, candidate, next bucket's mean)
+        area = np.abs(
+            (x[a] - x_means[i]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (y_means[i] - y[a])
+        )
+        a = start + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_frame(df: pd.DataFrame, x: str, y: str, n_out: int, by: str = None) -> pd.DataFrame:
+    """
+    Downsample each trace of a long-format frame to at most n_out points
+
+    Args:
+        df: Frame sorted by x within each trace
+        x: Column plotted on the x axis
+        y: Column plotted on the y axis
+        n_out: Target points per trace
+        by: Column that splits the frame into traces (one trace if None)
+
+    Returns:
+        Row subset of df in the original order
+    """
+    if df.empty:
+        return df
+    if by is None:
+        return df.iloc[lttb_indices(df[x], df[y], n_out)]
+
+    positions = [
+        rows[lttb_indices(df[x].iloc[rows], df[y].iloc[rows], n_out)]
+        for rows in df.groupby(by, sort=False, dropna=False).indices.values()
+    ]
+    return df.iloc[np.sort(np.concatenate(positions))]
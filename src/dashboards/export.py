@@ -0,0 +1,170 @@
+"""
+Chunked data export for the dashboard
+
+Exports are built only when requested: rows are streamed from Postgres through
+a server-side cursor and written chunk by chunk to a spooled temporary file
+(kept in memory while small, moved to disk when large), as CSV or Parquet.
+st.download_button can't stream to the browser: it keeps the whole file in
+memory, as the bytes build_export returns. Exports are therefore capped at
+EXPORT_MAX_BYTES (DASHBOARD_EXPORT_MAX_MB, default 200), and writing stops
+with a ValueError asking for narrower filters once a file grows past it.
+"""
+import os
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, Integer, String, select
+
+from src.models.schemas import CO2RemovalCalculation, CrewCarbonLabReading
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# display name -> (model, date column, lab parameter_name filter)
+EXPORT_DATASETS = {
+    "CO2 calculations": (CO2RemovalCalculation, "date", None),
+    "Calcium readings": (CrewCarbonLabReading, "datetime", "calcium"),
+    "pH readings": (CrewCarbonLabReading, "datetime", "pH"),
+}
+
+# display name -> (file extension, MIME type)
+EXPORT_FORMATS = {"CSV": ("csv", "text/csv"), "Parquet": ("parquet", "application/vnd.apache.parquet")}
+
+EXPORT_CHUNK_ROWS = 50_000
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+# Largest export handed to st.download_button, which holds it in memory while the user is connected
+EXPORT_MAX_BYTES = int(os.getenv("DASHBOARD_EXPORT_MAX_MB", "200")) * 1024 * 1024
+
+
+def export_statement(
+    dataset: str,
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    calculation_version: str = None,
+):
+    """
+    SELECT for one export dataset with the dashboard filters applied
+
+    JSON metadata columns are left out; they have no flat CSV/Parquet representation.
+
+    Returns:
+        (select statement, list of exported columns)
+    """
+    model, date_column, parameter_name = EXPORT_DATASETS[dataset]
+    table = model.__table__
+    columns = [column for column in table.columns if not isinstance(column.type, JSON)]
+    statement = select(*columns)
+
+    if parameter_name:
+        statement = statement.where(table.c.parameter_name == parameter_name)
+    if calculation_version and "calculation_version" in table.c:
+        statement = statement.where(table.c.calculation_version == calculation_version)
+    if plant_id:
+        statement = statement.where(table.c.plant_id == plant_id)
+    if start_date:
+        statement = statement.where(table.c[date_column] >= start_date)
+    if end_date:
+        # Whole end day, also for timestamp columns
+        statement = statement.where(table.c[date_column] < end_date + timedelta(days=1))
+
+    return statement.order_by(table.c[date_column], table.c.id), columns
+
+
+def iter_export_chunks(conn, statement, columns, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """Yield DataFrames of at most chunk_rows rows, fetched through a server-side cursor"""
+    result = conn.execute(statement.execution_options(stream_results=True, yield_per=chunk_rows))
+    names = [column.name for column in columns]
+    for rows in result.partitions():
+        yield pd.DataFrame(rows, columns=names)
+
+
+def _arrow_schema(columns):
+    """Arrow schema from the model's column types, so every chunk is written with the same types"""
+    import pyarrow as pa
+
+    arrow_types = [
+        (Boolean, pa.bool_()),
+        (Integer, pa.int64()),
+        (Float, pa.float64()),
+        (DateTime, pa.timestamp("us")),
+        (Date, pa.date32()),
+        (String, pa.string()),
+    ]
+    fields = []
+    for column in columns:
+        arrow_type = next((at for sa_type, at in arrow_types if isinstance(column.type, sa_type)), pa.string())
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _check_export_size(out, max_bytes: int) -> None:
+    """Stop an export that has grown past max_bytes, before more rows are fetched"""
+    if out.tell() > max_bytes:
+        raise ValueError(
+            f"Export is larger than {max_bytes / 1024 / 1024:.0f} MiB; narrow the plant or date filters"
+        )
+
+
+def write_export(chunks, columns, export_format: str, max_bytes: int = EXPORT_MAX_BYTES):
+    """
+    Write chunks to a spooled temporary file in the requested format
+
+    Args:
+        chunks: Iterable of DataFrames (e.g. from iter_export_chunks)
+        columns: Exported SQLAlchemy columns, used for the Parquet schema
+        export_format: A key of EXPORT_FORMATS
+        max_bytes: Largest file allowed; checked after each chunk
+
+    Returns:
+        Binary file object positioned at the start
+
+    Raises:
+        ValueError: On an unknown format or when the file grows past max_bytes
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"export_format must be one of {list(EXPORT_FORMATS)}")
+
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        rows = 0
+        if export_format == "CSV":
+            header = True
+            for chunk in chunks:
+                out.write(chunk.to_csv(index=False, header=header).encode())
+                header = False
+                rows += len(chunk)
+                _check_export_size(out, max_bytes)
+            if header:
+                out.write((",".join(column.name for column in columns) + "\n").encode())
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            schema = _arrow_schema(columns)
+            with pq.ParquetWriter(out, schema) as writer:
+                for chunk in chunks:
+                    # Each write_table call flushes a row group, so out.tell() tracks the file size
+                    writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                    rows += len(chunk)
+                    _check_export_size(out, max_bytes)
+    except Exception:
+        out.close()
+        raise
+
+    logger.info(f"✓ Exported {rows} rows as {export_format} ({out.tell() / 1024:.0f} KiB)")
+    out.seek(0)
+    return out
+
+
+def build_export(engine, dataset: str, export_format: str, max_bytes: int = EXPORT_MAX_BYTES, **filters) -> bytes:
+    """
+    Stream one dataset from the database into an export file and return its contents
+
+    Raises ValueError once the file grows past max_bytes (see write_export); filters are those of export_statement.
+    """
+    statement, columns = export_statement(dataset, **filters)
+    with engine.connect() as conn:
+        with write_export(iter_export_chunks(conn, statement, columns), columns, export_format, max_bytes) as out:
+            return out.read()
@@ -0,0 +1,100 @@
+"""
+Keyset pagination for the dashboard data browser
+
+Pages are fetched with a row-value comparison on (plant_id, date/datetime, id)
+against the last row of the previous page, which the composite indexes serve
+directly. Each page costs the same however deep into the table it is, and only
+one page is ever held in memory.
+"""
+import json
+from datetime import date, timedelta
+
+import pandas as pd
+from sqlalchemy import JSON, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from src.models.schemas import CO2RemovalCalculation, CrewCarbonLabReading
+
+# display name -> (model, date column)
+BROWSE_DATASETS = {
+    "CO2 calculations": (CO2RemovalCalculation, "date"),
+    "Lab readings": (CrewCarbonLabReading, "datetime"),
+}
+
+
+def browse_statement(
+    dataset: str,
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    calculation_version: str = None,
+    parameter_name: str = None,
+):
+    """
+    Filtered SELECT for one dataset, without ordering or paging
+
+    Returns:
+        (select statement, keyset columns)
+    """
+    model, date_column = BROWSE_DATASETS[dataset]
+    table = model.__table__
+    statement = select(*[column for column in table.columns if not isinstance(column.type, JSON)])
+
+    if calculation_version and "calculation_version" in table.c:
+        statement = statement.where(table.c.calculation_version == calculation_version)
+    if parameter_name and "parameter_name" in table.c:
+        statement = statement.where(table.c.parameter_name == parameter_name)
+    if plant_id:
+        statement = statement.where(table.c.plant_id == plant_id)
+    if start_date:
+        statement = statement.where(table.c[date_column] >= start_date)
+    if end_date:
+        statement = statement.where(table.c[date_column] < end_date + timedelta(days=1))
+
+    return statement, [table.c.plant_id, table.c[date_column], table.c.id]
+
+
+def fetch_page(
+    conn,
+    statement,
+    key_columns,
+    after: tuple = None,
+    page_size: int = 100,
+    descending: bool = False,
+) -> tuple[pd.DataFrame, tuple | None]:
+    """
+    Fetch one page that starts after the given key
+
+    Args:
+        conn: SQLAlchemy connection
+        statement: Output of browse_statement
+        key_columns: Keyset columns from browse_statement
+        after: Key of the last row on the previous page (None for the first page)
+        page_size: Rows per page
+        descending: Sort newest/last key first
+
+    Returns:
+        (page rows, key to pass as `after` for the next page, or None on the last page)
+    """
+    key = tuple_(*key_columns)
+    if after is not None:
+        statement = statement.where(key < tuple_(*after) if descending else key > tuple_(*after))
+    order = [column.desc() for column in key_columns] if descending else key_columns
+    result = conn.execute(statement.order_by(*order).limit(page_size + 1))
+
+    # One extra row tells us whether another page exists without a COUNT(*)
+    rows = result.fetchall()
+    page = pd.DataFrame(rows[:page_size], columns=list(result.keys()))
+    if len(rows) <= page_size:
+        return page, None
+    last = rows[page_size - 1]._mapping
+    return page, tuple(last[column.name] for column in key_columns)
+
+
+def estimate_total(conn, statement) -> int:
+    """Planner estimate of the rows a statement returns (EXPLAIN, no scan)"""
+    compiled = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,211 @@
+"""
+SQL helpers for the CO2 dashboard
+
+Aggregations are pushed down to Postgres so the dashboard only receives the
+rows it plots, never the raw minute-level sensor readings.
+"""
+from datetime import date
+
+from sqlalchemy import text
+
+# date_trunc field -> equivalent TimescaleDB time_bucket width
+PH_BUCKETS = {"hour": "1 hour", "day": "1 day", "week": "1 week", "month": "1 month"}
+
+
+def ph_bucket_for_span(start_date: date, end_date: date) -> str:
+    """Pick a pH aggregation resolution that keeps a chart to a few hundred points per unit"""
+    span_days = (end_date - start_date).days + 1
+    if span_days <= 7:
+        return "hour"
+    if span_days <= 366:
+        return "day"
+    if span_days <= 3 * 366:
+        return "week"
+    return "month"
+
+
+def has_timescaledb(conn) -> bool:
+    """True when the TimescaleDB extension is installed in the connected database"""
+    return bool(conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'")).scalar())
+
+
+def _lab_filters(parameter_name, plant_id, start_date, end_date) -> tuple[str, dict]:
+    filters = "parameter_name = :parameter_name"
+    params = {"parameter_name": parameter_name}
+    if plant_id:
+        filters += " AND plant_id = :plant_id"
+        params["plant_id"] = plant_id
+    if start_date:
+        filters += " AND datetime >= :start_date"
+        params["start_date"] = start_date
+    if end_date:
+        # end_date is inclusive of the whole day
+        filters += " AND datetime < CAST(:end_date AS date) + 1"
+        params["end_date"] = end_date
+    return filters, params
+
+
+def co2_calculations_query(
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    quality_flags: list[str] = None,
+    calculation_version: str = "v1.0",
+):
+    """
+    Daily CO2 calculations for the charts and tables
+
+    Returns:
+        (text clause, bind params) yielding one row per plant-day, ordered by date
+    """
+    query = """
+        SELECT
+            plant_id,
+            date,
+            ca_upstream_mg_per_l,
+            ca_downstream_mg_per_l,
+            ca_delta_mg_per_l,
+            flow_mgd,
+            co2_removed_metric_tons_per_day,
+            quality_flag
+        FROM crewcarbon_co2_removal_calculation
+        WHERE calculation_version = :calculation_version
+    """
+    params = {"calculation_version": calculation_version}
+    if plant_id:
+        query += " AND plant_id = :plant_id"
+        params["plant_id"] = plant_id
+    if start_date:
+        query += " AND date >= :start_date"
+        params["start_date"] = start_date
+    if end_date:
+        query += " AND date <= :end_date"
+        params["end_date"] = end_date
+    if quality_flags:
+        placeholders = ", ".join(f":flag_{i}" for i in range(len(quality_flags)))
+        query += f" AND quality_flag IN ({placeholders})"
+        params.update({f"flag_{i}": flag for i, flag in enumerate(quality_flags)})
+    query += " ORDER BY date"
+    return text(query), params
+
+
+def calcium_readings_query(plant_id: str = None, start_date: date = None, end_date: date = None):
+    """
+    Raw calcium readings for the calcium chart (one or two per unit and day, so not aggregated)
+
+    Returns:
+        (text clause, bind params) ordered by datetime
+    """
+    filters, params = _lab_filters("calcium", plant_id, start_date, end_date)
+    query = f"""
+        SELECT plant_id, plant_unit_id, datetime, parameter_name, value, unit
+        FROM crewcarbon_lab_reading
+        WHERE {filters}
+        ORDER BY datetime
+    """
+    return text(query), params
+
+
+def lab_aggregate_query(
+    parameter_name: str,
+    bucket: str,
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    use_time_bucket: bool = False,
+    value_alias: str = "mean_value",
+):
+    """
+    Mean of one lab parameter per plant, unit and time bucket, aggregated in the database
+
+    Args:
+        parameter_name: crewcarbon_lab_reading.parameter_name, e.g. 'pH' or 'calcium'
+        bucket: One of PH_BUCKETS
+        plant_id: One plant, or all plants if None
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        use_time_bucket: Use TimescaleDB time_bucket instead of date_trunc
+        value_alias: Name of the mean column
+
+    Returns:
+        (text clause, bind params) yielding plant_id, plant_unit_id, date, <value_alias>, n_measurements
+    """
+    if bucket not in PH_BUCKETS:
+        raise ValueError(f"bucket must be one of {list(PH_BUCKETS)}")
+
+    filters, params = _lab_filters(parameter_name, plant_id, start_date, end_date)
+    if use_time_bucket:
+        bucket_expr = "time_bucket(CAST(:bucket_width AS interval), datetime)"
+        params["bucket_width"] = PH_BUCKETS[bucket]
+    else:
+        bucket_expr = "date_trunc(:bucket, datetime)"
+        params["bucket"] = bucket
+
+    query = f"""
+        SELECT
+            plant_id,
+            plant_unit_id,
+            {bucket_expr} AS date,
+            AVG(value) AS {value_alias},
+            COUNT(*) AS n_measurements
+        FROM crewcarbon_lab_reading
+        WHERE {filters}
+        GROUP BY plant_id, plant_unit_id, 3
+        ORDER BY 3, plant_unit_id
+    """
+    return text(query), params
+
+
+def ph_aggregate_query(
+    bucket: str,
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+    use_time_bucket: bool = False,
+):
+    """Mean pH per plant, unit and time bucket (see lab_aggregate_query), as `ph_mean`"""
+    return lab_aggregate_query("pH", bucket, plant_id, start_date, end_date, use_time_bucket, value_alias="ph_mean")
+
+
+def ph_counts_query(plant_id: str = None, start_date: date = None, end_date: date = None):
+    """Total pH measurements and distinct measurement days for the sidebar"""
+    filters, params = _lab_filters("pH", plant_id, start_date, end_date)
+    query = f"""
+        SELECT COUNT(*) AS measurements, COUNT(DISTINCT CAST(datetime AS date)) AS days
+        FROM crewcarbon_lab_reading
+        WHERE {filters}
+    """
+    return text(query), params
+
+
+def estimate_row_counts(conn, table_names: list[str]) -> dict[str, int | None]:
+    """
+    Planner row-count estimates, read from the catalog instead of scanning tables
+
+    Uses pg_class.reltuples (maintained by VACUUM/ANALYZE) and falls back to
+    pg_stat_user_tables.n_live_tup for tables that have never been analyzed.
+
+    Args:
+        conn: SQLAlchemy connection
+        table_names: Tables in the current schema
+
+    Returns:
+        dict of table name -> estimated rows (None when no statistics exist yet)
+    """
+    rows = conn.execute(
+        text(
+            """
+            SELECT c.relname, c.reltuples, s.n_live_tup
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+            WHERE n.nspname = current_schema() AND c.relname = ANY(:table_names)
+            """
+        ),
+        {"table_names": list(table_names)},
+    )
+    estimates = dict.fromkeys(table_names)
+    for relname, reltuples, n_live_tup in rows:
+        # reltuples is -1 until the first VACUUM/ANALYZE
+        estimates[relname] = int(reltuples) if reltuples >= 0 else n_live_tup
+    return estimates
@@ -1,20 +1,21 @@
-from src.ingest.utils import transform_crew_data
+from src.ingest.utils import metadata_to_json, transform_crew_data
 from src.models.schemas import CrewCarbonLabReading
 import pandas as pd
-import json
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import timed_stage
 
 logger = setup_logger(__name__)
 
 
-def run_ca_pipeline():
+@timed_stage()
+def run_ca_pipeline(fpath: str = "data/crew_lab/IC_calcium.csv"):
     """
     runner for the logic behind
     the Ca data ingest
     uses a generalized utility func
     called transform_crew_data
     """
-    FPATH = "data/crew_lab/IC_calcium.csv"
+    FPATH = fpath
     crew_lab_ca = pd.read_csv(FPATH)
     crew_lab_ca["source_file"] = FPATH
     logger.info(f"[run_ca_pipeline]: Done Loading CSV from {FPATH}")
@@ -47,9 +48,7 @@ def run_ca_pipeline():
         metadata_col_name="reading_metadata",
     )
     logger.info("[run_ca_pipeline]: Done with transform_crew_data")
-    transformed_crew_lab_ca["reading_metadata"] = transformed_crew_lab_ca["reading_metadata"].apply(
-        lambda x: (json.dumps({k: (None if pd.isna(v) else v) for k, v in x.items()}) if isinstance(x, dict) else None)
-    )
+    transformed_crew_lab_ca["reading_metadata"] = metadata_to_json(transformed_crew_lab_ca["reading_metadata"])
     logger.info("[run_ca_pipeline]: Done with compressing `reading_metadata` ")
 
     return transformed_crew_lab_ca
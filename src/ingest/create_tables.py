@@ -1,26 +1,79 @@
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import inspect
+from src.models.data_version import DATASETS, VERSION_TABLE, bump_data_version
+from src.models.database import get_engine
 from src.models.schemas import Base
-import os
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import pipeline_run
 
 
 logger = setup_logger(__name__)
 
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+def find_schema_drift(engine) -> list[str]:
+    """
+    Columns and indexes of the models that existing tables lack (create_all never adds them)
 
-def recreate_schema():
-    """Drop and recreate all tables using SQLAlchemy"""
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Missing objects as 'table.name (column|index)'
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    drift = []
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        drift += [f"{table.name}.{column.name} (column)" for column in table.columns if column.name not in columns]
+        drift += [f"{table.name}.{index.name} (index)" for index in table.indexes if index.name not in indexes]
+    return drift
+
+
+def ensure_schema(engine=None) -> list[str]:
+    """
+    Create any missing tables, leaving existing tables and their data alone
+
+    Args:
+        engine: SQLAlchemy engine (the shared engine from src/models/database.py if None)
+
+    Returns:
+        Names of the tables that were created
+
+    Raises:
+        ValueError: If existing tables lack columns or indexes of the current models
+    """
+    engine = engine or get_engine()
+    drift = find_schema_drift(engine)
+    if drift:
+        for missing_object in drift:
+            logger.error(f"  ✗ missing {missing_object}")
+        raise ValueError(
+            f"Existing tables are missing {len(drift)} columns/indexes of the current models. "
+            "Rerun with --recreate-schema (drops all data) or add them to the database by hand."
+        )
+
+    existing_tables = set(inspect(engine).get_table_names())
+    missing = [table for table in Base.metadata.tables if table not in existing_tables]
+
+    if missing:
+        Base.metadata.create_all(engine)
+        for table in missing:
+            logger.info(f"  ✓ created {table}")
+    logger.info(f"✓ Schema check: {len(Base.metadata.tables) - len(missing)} tables present, {len(missing)} created")
+    return missing
+
+
+def recreate_schema(engine=None):
+    """Drop and recreate all tables using SQLAlchemy (the shared engine if `engine` is None)"""
     logger.info("=" * 60)
     logger.info("RECREATING DATABASE SCHEMA")
     logger.info("=" * 60)
 
-    if not DATABASE_URL:
-        logger.error("DATABASE_URL environment variable not set")
-        raise ValueError("DATABASE_URL is required")
-
     logger.info(f"Connecting to database...")
-    engine = create_engine(DATABASE_URL)
+    engine = engine or get_engine()
 
     # Get list of existing tables before dropping
     inspector = inspect(engine)
@@ -33,10 +86,11 @@ def recreate_schema():
     else:
         logger.info("No existing tables found")
 
-    # Drop all tables defined in Base metadata
-    logger.info("Dropping all tables...")
+    # Drop all tables defined in Base metadata except the data versions: they must keep counting
+    # up, or caches keyed on (dataset, version) would serve pre-recreate data for a repeated version
+    logger.info(f"Dropping all tables except {VERSION_TABLE}...")
     try:
-        Base.metadata.drop_all(engine)
+        Base.metadata.drop_all(engine, tables=[t for t in Base.metadata.sorted_tables if t.name != VERSION_TABLE])
         logger.info("✓ All tables dropped successfully")
     except Exception as e:
         logger.error(f"Error dropping tables: {e}")
@@ -51,6 +105,10 @@ def recreate_schema():
         logger.error(f"Error creating tables: {e}")
         raise
 
+    # Every dataset was emptied, so cached reads of any of them are stale
+    with engine.begin() as conn:
+        bump_data_version(conn, *DATASETS)
+
     # List created tables
     tables = list(Base.metadata.tables.keys())
     logger.info(f"Created {len(tables)} tables:")
@@ -73,7 +131,9 @@ def recreate_schema():
 
 if __name__ == "__main__":
     try:
-        recreate_schema()
+        # The metrics table is recreated above, so this run's metrics are written after it exists
+        with pipeline_run("create_tables", engine=get_engine()):
+            recreate_schema()
     except Exception as e:
         logger.error(f"Schema recreation failed: {e}")
         raise
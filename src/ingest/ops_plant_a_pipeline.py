@@ -2,15 +2,30 @@ import pandas as pd
 
 from src.models.schemas import WasteWaterPlantOperation
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import timed_stage
 
 logger = setup_logger(__name__)
 
 
-def run_ops_plant_a():
+# workbook path -> source_file label
+PLANT_A_FILES = {
+    "data/ops/PLANT_A-OPS DATA-APR25.xlsx": "PLANT_A-OPS DATA-APR25",
+    "data/ops/PLANT_A-OPS DATA-MAY25.xls": "PLANT_A-OPS DATA-JUNE25",
+    "data/ops/PLANT_A-OPS DATA-JUNE25.xls": "PLANT_A-OPS DATA-MAY25",
+}
 
-    plant_a_apr25_fpath = pd.read_excel("data/ops/PLANT_A-OPS DATA-APR25.xlsx")
-    plant_a_jun25_fpath = pd.read_excel("data/ops/PLANT_A-OPS DATA-JUNE25.xls")
-    plant_a_may25_fpath = pd.read_excel("data/ops/PLANT_A-OPS DATA-MAY25.xls")
+
+@timed_stage()
+def run_ops_plant_a(files: dict = None, plant_id: str = "PLANT_A"):
+    """
+    Transform Plant A-style monthly operator workbooks
+
+    Args:
+        files: Workbook path -> source_file label (defaults to the PLANT_A sample files)
+        plant_id: Plant the workbooks belong to
+    """
+    files = files or PLANT_A_FILES
+    workbooks = {path: pd.read_excel(path) for path in files}
     print("done loading files")
     # Define all column mappings
     OPERATOR_COLUMN_MAPPING = {
@@ -63,23 +78,15 @@ def run_ops_plant_a():
             ]
         ]
 
-    # Usage
-    plant_a_apr25_fpath = standardize_operator_columns(plant_a_apr25_fpath, date_col_pattern="OPERATOR DATA_Daily_4")
-    plant_a_apr25_fpath["source_file"] = "PLANT_A-OPS DATA-APR25"
-    plant_a_apr25_fpath["plant_id"] = "PLANT_A"
-
-    plant_a_may25_fpath = standardize_operator_columns(plant_a_may25_fpath, date_col_pattern="OPERATOR DATA_Daily_5")
-    plant_a_may25_fpath["source_file"] = "PLANT_A-OPS DATA-JUNE25"
-    plant_a_may25_fpath["plant_id"] = "PLANT_A"
-
-    plant_a_jun25_fpath = standardize_operator_columns(plant_a_jun25_fpath, date_col_pattern="OPERATOR DATA_Daily_6")
-    plant_a_jun25_fpath["source_file"] = "PLANT_A-OPS DATA-MAY25"
-    plant_a_jun25_fpath["plant_id"] = "PLANT_A"
+    # Usage: the first column header is "OPERATOR DATA\nDaily\n<month range>" in every workbook
+    standardized = []
+    for path, source_file in files.items():
+        df = standardize_operator_columns(workbooks[path], date_col_pattern="OPERATOR DATA_Daily_")
+        df["source_file"] = source_file
+        df["plant_id"] = plant_id
+        standardized.append(df)
 
-    plant_a_combined_df = pd.concat(
-        [plant_a_apr25_fpath, plant_a_may25_fpath, plant_a_jun25_fpath],
-        ignore_index=True,
-    )
+    plant_a_combined_df = pd.concat(standardized, ignore_index=True)
 
     plant_a_combined_df["date"] = pd.to_datetime(plant_a_combined_df["date"], errors="coerce")
 
@@ -5,19 +5,37 @@ from sqlalchemy import create_engine
 
 from src.models.schemas import WasteWaterPlantOperation
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import timed_stage
 
 
-def run_ops_plant_b():
+# source_file label -> MPOR export path
+PLANT_B_FILES = {
+    "plant_b_mar25": "data/ops/PLANT_B-MPOR_Crew_04042025to04252025.xlsx",
+    "plant_b_apr25_1": "data/ops/PLANT_B-MPOR_Crew_04042025to04252025.xlsx",
+    "plant_b_apr25_2": "data/ops/PLANT_B-MPOR_Crew_04182025to05232025.xlsx",
+    "plant_b_may25_1": "data/ops/PLANT_B-MPOR_Crew_05162025to06072025.xlsx",
+    "plant_b_may25_2": "data/ops/PLANT_B-MPOR_Crew_05302025to06232025.xlsx",
+    "plant_b_jun25": "data/ops/PLANT_B-MPOR_Crew_06132025to07112025.xlsx",
+}
+
+
+def flatten_header_columns(columns) -> list[str]:
+    """Join the levels of the 7-row MPOR header into one column name per column"""
+    return ["_".join(str(x) for x in col).strip() for col in columns.values]
+
+
+@timed_stage()
+def run_ops_plant_b(files: dict = None, plant_id: str = "PLANT_B"):
+    """
+    Transform Plant B-style MPOR rolling-window exports (7-row header)
+
+    Args:
+        files: source_file label -> export path (defaults to the PLANT_B sample files)
+        plant_id: Plant the exports belong to
+    """
     logger = setup_logger(__name__)
 
-    files = {
-        "plant_b_mar25": "data/ops/PLANT_B-MPOR_Crew_04042025to04252025.xlsx",
-        "plant_b_apr25_1": "data/ops/PLANT_B-MPOR_Crew_04042025to04252025.xlsx",
-        "plant_b_apr25_2": "data/ops/PLANT_B-MPOR_Crew_04182025to05232025.xlsx",
-        "plant_b_may25_1": "data/ops/PLANT_B-MPOR_Crew_05162025to06072025.xlsx",
-        "plant_b_may25_2": "data/ops/PLANT_B-MPOR_Crew_05302025to06232025.xlsx",
-        "plant_b_jun25": "data/ops/PLANT_B-MPOR_Crew_06132025to07112025.xlsx",
-    }
+    files = files or PLANT_B_FILES
 
     # Values to exclude from date column
     exclude_values = ["TOTAL", "MAX", "MIN", "AVG"]
@@ -32,7 +50,7 @@ def run_ops_plant_b():
             df = pd.read_excel(fpath, header=[5, 6, 7, 8, 9, 10, 11])
 
             # Clean columns
-            df.columns = ["_".join(str(x) for x in col).strip() for col in df.columns.values]
+            df.columns = flatten_header_columns(df.columns)
 
             initial_rows = len(df)
 
@@ -54,7 +72,7 @@ def run_ops_plant_b():
                 logger.warning("  Could not find DATE column to filter TOTAL/MAX/MIN/AVG")
 
             df["source_file"] = name
-            df["plant_id"] = "PLANT_B"
+            df["plant_id"] = plant_id
             all_dataframes.append(df)
 
             logger.info(
@@ -1,13 +1,19 @@
-import json
-
 import pandas as pd
 
-from src.ingest.utils import transform_crew_data
+from src.ingest.utils import metadata_to_json, transform_crew_data
 from src.models.schemas import CrewCarbonLabReading
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import timed_stage
+
+
+PH_FILES = [
+    "data/minute_data/WB0038_PH_2025_sanitized.csv",
+    "data/minute_data/WB0039_PH_2025_sanitized.csv",
+]
 
 
-def run_ph_pipeline():
+@timed_stage()
+def run_ph_pipeline(fpaths: list[str] = None):
     """
     runner for the logic behind
     the pH data ingest
@@ -15,17 +21,14 @@ def run_ph_pipeline():
     called transform_crew_data
     """
     logger = setup_logger(__name__)
-    FPATH1 = "data/minute_data/WB0038_PH_2025_sanitized.csv"
-    FPATH2 = "data/minute_data/WB0039_PH_2025_sanitized.csv"
-    minute_data_ph1 = pd.read_csv(FPATH1)
-    minute_data_ph1["source_file"] = FPATH1
-    logger.info(f"[run_ph_pipeline]: Done Loading CSV from {FPATH1}")
+    minute_frames = []
+    for fpath in fpaths or PH_FILES:
+        minute_data_ph = pd.read_csv(fpath)
+        minute_data_ph["source_file"] = fpath
+        logger.info(f"[run_ph_pipeline]: Done Loading CSV from {fpath}")
+        minute_frames.append(minute_data_ph)
 
-    minute_data_ph2 = pd.read_csv(FPATH2)
-    minute_data_ph2["source_file"] = FPATH2
-    logger.info(f"[run_ph_pipeline]: Done Loading CSV from {FPATH2}")
-
-    ph_minute = pd.concat([minute_data_ph1, minute_data_ph2], ignore_index=True, sort=False)
+    ph_minute = pd.concat(minute_frames, ignore_index=True, sort=False)
     ph_minute["medium"] = "aqueous"
 
     transformed_ph_minute = transform_crew_data(
@@ -56,9 +59,7 @@ def run_ph_pipeline():
     )
     logger.info(f"[run_ph_pipeline]: Done transforming `transformed_ph_minute` ")
 
-    transformed_ph_minute["reading_metadata"] = transformed_ph_minute["reading_metadata"].apply(
-        lambda x: (json.dumps({k: (None if pd.isna(v) else v) for k, v in x.items()}) if isinstance(x, dict) else None)
-    )
+    transformed_ph_minute["reading_metadata"] = metadata_to_json(transformed_ph_minute["reading_metadata"])
     logger.info(f"[run_ph_pipeline]: Done compressing `reading_metadata` ")
 
     return transformed_ph_minute
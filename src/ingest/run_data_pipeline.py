@@ -1,49 +1,82 @@
-import json
+import argparse
 import os
 
-import pandas as pd
-from sqlalchemy import create_engine, inspect
-from sqlalchemy.orm import sessionmaker
+from src.models.data_version import bump_data_version
+from src.models.database import get_engine
+from sqlalchemy import select
 
-from src.ingest.ca_pipeline import run_ca_pipeline
-from src.ingest.ops_plant_a_pipeline import run_ops_plant_a
-from src.ingest.ops_plant_b_pipeline import run_ops_plant_b
-from src.ingest.ph_pipeline import run_ph_pipeline
-from src.ingest.utils import create_wastewater_facilities
 from src.models.schemas import (CrewCarbonLabReading,
+                                WastewaterPlant,
                                 WasteWaterPlantOperation)
 from src.utils.logging_config import setup_logger
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-if __name__ == "__main__":
-    logger = setup_logger(__name__)
-    engine = create_engine(DATABASE_URL)
-    inspector = inspect(engine)
-
+from src.utils.metrics import increment, pipeline_run, stage
+
+logger = setup_logger(__name__)
+
+# Waste Water Plants created before their data is written
+FACILITIES = [
+    {
+        "plant_id": "PLANT_A",
+        "operator": "Connecticut Water Authority",
+        "city": "New Haven",
+        "state": "CT",
+        "country": "USA",
+        "active": True,
+    },
+    {
+        "plant_id": "PLANT_B",
+        "operator": "New York City DEP",
+        "city": "New York",
+        "state": "NY",
+        "country": "USA",
+        "active": False,
+    },
+]
+
+
+# Tables the ingest appends to; a second ingest into them duplicates every row
+INGEST_TABLES = (WastewaterPlant, CrewCarbonLabReading, WasteWaterPlantOperation)
+
+
+def populated_ingest_tables(engine) -> list[str]:
+    """Names of the INGEST_TABLES that already hold rows (one LIMIT 1 probe per table)"""
+    with engine.connect() as conn:
+        return [
+            model.__tablename__
+            for model in INGEST_TABLES
+            if conn.execute(select(model.__table__).limit(1)).first() is not None
+        ]
+
+
+def run_data_pipeline(engine=None, append: bool = False) -> None:
+    """
+    Create the facilities, transform the lab and plant operations files and write them
+
+    Args:
+        engine: SQLAlchemy engine (the shared engine from src/models/database.py if None)
+        append: Write even if the tables already hold data (rows are added, not replaced)
+
+    Raises:
+        ValueError: If the tables already hold data and append is False
+    """
+    engine = engine or get_engine()
+    populated = populated_ingest_tables(engine)
+    if populated and not append:
+        raise ValueError(
+            f"Ingest tables already hold data ({', '.join(populated)}). Ingest appends, so rerunning it duplicates "
+            "every row: recreate the schema first (--recreate-schema), or pass --append to add the rows anyway."
+        )
     logger.info("Starting data pipeline...")
 
+    # The transformation modules (pandas, openpyxl) load only when the ingest actually runs
+    from src.ingest.ca_pipeline import run_ca_pipeline
+    from src.ingest.ops_plant_a_pipeline import run_ops_plant_a
+    from src.ingest.ops_plant_b_pipeline import run_ops_plant_b
+    from src.ingest.ph_pipeline import run_ph_pipeline
+    from src.ingest.utils import create_wastewater_facilities
+
     # Step 1: Create Waste Water Plants by defining their params
-    facilities_to_create = [
-        {
-            "plant_id": "PLANT_A",
-            "operator": "Connecticut Water Authority",
-            "city": "New Haven",
-            "state": "CT",
-            "country": "USA",
-            "active": True,
-        },
-        {
-            "plant_id": "PLANT_B",
-            "operator": "New York City DEP",
-            "city": "New York",
-            "state": "NY",
-            "country": "USA",
-            "active": False,
-        },
-    ]
-
-    created_plants = create_wastewater_facilities(facilities_to_create)
+    created_plants = create_wastewater_facilities(FACILITIES, engine=engine)
 
     # Step 2: Start the transformation of the chemical data
     ca_data = run_ca_pipeline()  # Calcium data transformation
@@ -55,23 +88,29 @@ if __name__ == "__main__":
 
     # Step 2: write the transformed data to tables
     logger.info(f"Writing {len(ca_data)} calcium readings...")
-    ca_data.to_sql(
-        CrewCarbonLabReading.__tablename__,
-        con=engine,
-        if_exists="append",
-        index=False,
-        chunksize=500,
-    )
+    with stage("write_calcium_readings", rows_in=len(ca_data)) as write_stats:
+        ca_data.to_sql(
+            CrewCarbonLabReading.__tablename__,
+            con=engine,
+            if_exists="append",
+            index=False,
+            chunksize=500,
+        )
+        write_stats.rows_out = len(ca_data)
+    increment("lab_reading_rows_written", len(ca_data))
     logger.info(f"Successfully wrote {len(ca_data)} rows to CrewCarbonLabReading")
 
     logger.info(f"Writing {len(ph_data)} pH readings...")
-    ph_data.to_sql(
-        CrewCarbonLabReading.__tablename__,
-        con=engine,
-        if_exists="append",
-        index=False,
-        chunksize=500,
-    )
+    with stage("write_ph_readings", rows_in=len(ph_data)) as write_stats:
+        ph_data.to_sql(
+            CrewCarbonLabReading.__tablename__,
+            con=engine,
+            if_exists="append",
+            index=False,
+            chunksize=500,
+        )
+        write_stats.rows_out = len(ph_data)
+    increment("lab_reading_rows_written", len(ph_data))
 
     logger.info(f"Successfully wrote {len(ph_data)} rows to CrewCarbonLabReading")
 
@@ -79,24 +118,52 @@ if __name__ == "__main__":
     ops_plant_data_a = run_ops_plant_a()
 
     logger.info(f"Writing {len(ops_plant_data_a)} WasteWaterPlantOperation...")
-    ops_plant_data_a.to_sql(
-        name=WasteWaterPlantOperation.__tablename__,
-        con=engine,
-        if_exists="append",
-        index=False,
-        chunksize=500,
-    )
+    with stage("write_ops_plant_a", rows_in=len(ops_plant_data_a)) as write_stats:
+        ops_plant_data_a.to_sql(
+            name=WasteWaterPlantOperation.__tablename__,
+            con=engine,
+            if_exists="append",
+            index=False,
+            chunksize=500,
+        )
+        write_stats.rows_out = len(ops_plant_data_a)
+    increment("plant_operation_rows_written", len(ops_plant_data_a))
     logger.info(f"Successfully wrote {len(ops_plant_data_a)} rows to WasteWaterPlantOperation")
 
     # Step 3: Transform the plan ops data (PLANT B)
     ops_plant_data_b = run_ops_plant_b()
 
     logger.info(f"Writing {len(ops_plant_data_b)} WasteWaterPlantOperation...")
-    ops_plant_data_b.to_sql(
-        name=WasteWaterPlantOperation.__tablename__,
-        con=engine,
-        if_exists="append",
-        index=False,
-        chunksize=500,
-    )
+    with stage("write_ops_plant_b", rows_in=len(ops_plant_data_b)) as write_stats:
+        ops_plant_data_b.to_sql(
+            name=WasteWaterPlantOperation.__tablename__,
+            con=engine,
+            if_exists="append",
+            index=False,
+            chunksize=500,
+        )
+        write_stats.rows_out = len(ops_plant_data_b)
+    increment("plant_operation_rows_written", len(ops_plant_data_b))
     logger.info(f"Successfully wrote {len(ops_plant_data_b)} rows to WasteWaterPlantOperation")
+
+    # Step 4: Invalidate dashboard caches that depend on the newly written data
+    with engine.begin() as conn:
+        bump_data_version(conn, "lab_reading", "plant_operation")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Transform lab and plant operations data and write it to the database")
+    parser.add_argument(
+        "--profile",
+        default=os.getenv("PROFILE", ""),
+        help="Profile the run: cpu, mem, cpu,mem or all (output in data/output/profiles)",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Ingest even if the tables already hold data (rows are appended, not replaced)",
+    )
+    args = parser.parse_args()
+
+    with pipeline_run("data_pipeline", engine=get_engine(), profile=args.profile):
+        run_data_pipeline(append=args.append)
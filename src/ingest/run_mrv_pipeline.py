@@ -1,58 +1,192 @@
+import argparse
 import os
 from datetime import date
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
+from src.models.data_version import bump_data_version
+from src.models.database import get_engine
 from src.utils.logging_config import setup_logger
-from src.mrv.utils import bulk_calculate_co2_removal
+from src.utils.metrics import pipeline_run
+from src.mrv.rollups import get_co2_totals, refresh_co2_rollups
+from src.mrv.utils import MRVParameters, bulk_calculate_co2_removal, calculate_co2_removal_uncertainty
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Scenario and streaming modules (pandas, YAML) are imported only by the modes that use them
+
+logger = setup_logger(__name__)
+
+DEFAULT_PLANTS = ["PLANT_A", "PLANT_B"]
+DEFAULT_START_DATE = date(2025, 4, 1)
+DEFAULT_END_DATE = date(2025, 6, 30)
+
+
+def add_mrv_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """Plant, date range and mode options of an MRV run (shared with src/ingest/run_pipeline.py)"""
+    parser.add_argument("--plants", nargs="+", default=DEFAULT_PLANTS, help="Plants to calculate")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=DEFAULT_START_DATE, help="First date (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=DEFAULT_END_DATE, help="Last date (YYYY-MM-DD)")
+    parser.add_argument(
+        "--uncertainty-draws",
+        type=int,
+        default=0,
+        help="Monte Carlo draws per plant-day for uncertainty propagation (0 = point estimate only)",
+    )
+    parser.add_argument(
+        "--flow-rel-sigma",
+        type=float,
+        default=0.0,
+        help="Relative std dev of flow in uncertainty mode (0 = flow fixed)",
+    )
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible uncertainty draws")
+    parser.add_argument(
+        "--scenarios",
+        default=None,
+        help="YAML file of named parameter sets to evaluate side by side (e.g. config/mrv_scenarios.yaml)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Walk the date range in bounded chunks, keeping only running totals in memory (for long backfills)",
+    )
+    parser.add_argument("--chunk-months", type=int, default=1, help="Calendar months per chunk in --stream mode")
+    parser.add_argument(
+        "--calcium-match",
+        choices=["exact", "asof"],
+        default="exact",
+        help="Match calcium samples on the same date only, or to the nearest sample date within a tolerance",
+    )
+    parser.add_argument(
+        "--asof-tolerance-hours",
+        type=float,
+        default=24.0,
+        help="Largest gap between sample date and ops date accepted in --calcium-match asof",
+    )
+    return parser
+
+
+# Options the scenario mode has no use for: each scenario sets its own calcium matching, and
+# scenarios are neither streamed nor sampled for uncertainty
+SCENARIO_IGNORED_OPTIONS = (
+    "calcium_match",
+    "asof_tolerance_hours",
+    "uncertainty_draws",
+    "flow_rel_sigma",
+    "seed",
+    "stream",
+    "chunk_months",
+)
 
-if __name__ == "__main__":
-    logger = setup_logger(__name__)
-    engine = create_engine(DATABASE_URL)
 
-    Session = sessionmaker(bind=engine)
-    session = Session()
+def check_mrv_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> argparse.Namespace:
+    """Reject option combinations run_mrv would otherwise silently ignore (exits through parser.error)"""
+    if args.scenarios:
+        given = [name for name in SCENARIO_IGNORED_OPTIONS if getattr(args, name) != parser.get_default(name)]
+        if given:
+            options = ", ".join("--" + name.replace("_", "-") for name in given)
+            parser.error(
+                f"{options} can't be combined with --scenarios: scenario runs are neither streamed nor sampled "
+                "for uncertainty, and each scenario sets its own calcium_match in the scenario file"
+            )
+    return args
 
-    plants = ["PLANT_A", "PLANT_B"]
-    all_results = {}
+
+def run_mrv(session: Session, args: argparse.Namespace) -> None:
+    """
+    Calculate (or evaluate scenarios for) CO2 removal for each plant and log the totals
+
+    Args:
+        session: SQLAlchemy session (committed per plant)
+        args: Options registered by add_mrv_arguments
+    """
+    params = MRVParameters(calcium_match=args.calcium_match, asof_tolerance_hours=args.asof_tolerance_hours)
+    plants = args.plants
+    start_date = args.start_date
+    end_date = args.end_date
+
+    if args.scenarios:
+        from src.mrv.scenarios import load_scenarios, run_mrv_scenarios
+
+        scenarios = load_scenarios(args.scenarios)
+        for plant_id in plants:
+            logger.info(f"=== Scenarios for {plant_id} ===")
+            run_mrv_scenarios(
+                session=session,
+                plant_id=plant_id,
+                scenarios=scenarios,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            refresh_co2_rollups(session, plant_id, start_date, end_date)
+            bump_data_version(session, "co2_removal")
+            session.commit()
+        return
 
     for plant_id in plants:
         logger.info(f"=== Calculating {plant_id} ===")
-        results, summary = bulk_calculate_co2_removal(
-            session=session,
-            plant_id=plant_id,
-            start_date=date(2025, 4, 1),
-            end_date=date(2025, 6, 30),
-        )
-        all_results[plant_id] = results
+        if args.stream:
+            from src.mrv.streaming import stream_calculate_co2_removal
 
-        # Calculate totals only for VALID records
-        valid_results = [r for r in results if r.quality_flag == "VALID"]
-        invalid_count = len(results) - len(valid_results)
+            stream_calculate_co2_removal(
+                session=session,
+                plant_id=plant_id,
+                start_date=start_date,
+                end_date=end_date,
+                params=params,
+                chunk_months=args.chunk_months,
+            )
+        else:
+            bulk_calculate_co2_removal(
+                session=session,
+                plant_id=plant_id,
+                start_date=start_date,
+                end_date=end_date,
+                params=params,
+            )
 
-        total_co2 = sum(r.co2_removed_metric_tons_per_day for r in valid_results)
-        avg_co2 = total_co2 / len(valid_results) if valid_results else 0
+        # Refresh only the periods this run touched, once for the whole range, then report from the rollups
+        refresh_co2_rollups(session, plant_id, start_date, end_date)
+        bump_data_version(session, "co2_removal")
+        session.commit()
 
-        logger.info(f"{plant_id}: {len(results)} dates ({len(valid_results)} valid, {invalid_count} invalid)")
-        logger.info(f"Total CO2 (valid only): {total_co2:.2f} MT")
-        logger.info(f"Avg daily (valid only): {avg_co2:.4f} MT/day")
+        valid_totals = get_co2_totals(session, start_date, end_date, plant_id, quality_flags=["VALID"])
+        all_totals = get_co2_totals(session, start_date, end_date, plant_id, quality_flags=["VALID", "INVALID"])
+        invalid_count = all_totals["day_count"] - valid_totals["day_count"]
 
-    # Grand total (valid records only)
-    grand_total = sum(
-        sum(r.co2_removed_metric_tons_per_day for r in results if r.quality_flag == "VALID")
-        for results in all_results.values()
-    )
+        logger.info(
+            f"{plant_id}: {all_totals['day_count']} dates ({valid_totals['day_count']} valid, {invalid_count} invalid)"
+        )
+        logger.info(f"Total CO2 (valid only): {valid_totals['total_co2_metric_tons']:.2f} MT")
+        logger.info(f"Avg daily (valid only): {valid_totals['avg_co2_metric_tons_per_day']:.4f} MT/day")
 
-    total_records = sum(len(results) for results in all_results.values())
-    total_valid = sum(
-        len([r for r in results if r.quality_flag == "VALID"]) 
-        for results in all_results.values()
-    )
+        if args.uncertainty_draws:
+            calculate_co2_removal_uncertainty(
+                session=session,
+                plant_id=plant_id,
+                start_date=start_date,
+                end_date=end_date,
+                n_draws=args.uncertainty_draws,
+                flow_rel_sigma=args.flow_rel_sigma,
+                seed=args.seed,
+                params=params,
+            )
+
+    # Grand total across all plants in the database (valid records only)
+    grand_valid = get_co2_totals(session, start_date, end_date, quality_flags=["VALID"])
+    grand_all = get_co2_totals(session, start_date, end_date, quality_flags=["VALID", "INVALID"])
 
     logger.info(f"=== Summary ===")
-    logger.info(f"Total records: {total_records} ({total_valid} valid)")
-    logger.info(f"Grand Total CO2 Removed (VALID only): {grand_total:.2f} MT")
+    logger.info(f"Total records: {grand_all['day_count']} ({grand_valid['day_count']} valid)")
+    logger.info(f"Grand Total CO2 Removed (VALID only): {grand_valid['total_co2_metric_tons']:.2f} MT")
+
+
+if __name__ == "__main__":
+    parser = add_mrv_arguments(argparse.ArgumentParser(description="Calculate CO2 removal for all plants"))
+    parser.add_argument(
+        "--profile",
+        default=os.getenv("PROFILE", ""),
+        help="Profile the run: cpu, mem, cpu,mem or all (output in data/output/profiles)",
+    )
+    args = check_mrv_arguments(parser, parser.parse_args())
 
-    session.close()
+    engine = get_engine()
+    with pipeline_run("mrv_pipeline", engine=engine, profile=args.profile), Session(engine) as session:
+        run_mrv(session, args)
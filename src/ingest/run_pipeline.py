@@ -0,0 +1,91 @@
+# src/ingest/run_pipeline.py
+"""
+Run schema check, ingest and MRV as stages of one process
+
+All stages share the pooled engine from src/models/database.py, so a full run
+pays interpreter start, imports and pool warm-up once, and Postgres sees one
+set of connections instead of one per script.
+
+    python -m src.ingest.run_pipeline
+    python -m src.ingest.run_pipeline --stages mrv --plants PLANT_A --start-date 2025-06-01 --end-date 2025-06-30
+    python -m src.ingest.run_pipeline --recreate-schema
+
+Ingest appends, so it refuses to run into tables that already hold data unless
+the schema is recreated first (--recreate-schema) or --append is given.
+"""
+import argparse
+import os
+
+from sqlalchemy.orm import Session
+
+from src.ingest.create_tables import ensure_schema, recreate_schema
+from src.ingest.run_data_pipeline import run_data_pipeline
+from src.ingest.run_mrv_pipeline import add_mrv_arguments, check_mrv_arguments, run_mrv
+from src.models.database import get_engine
+from src.utils.logging_config import setup_logger
+from src.utils.metrics import pipeline_run, stage
+
+logger = setup_logger(__name__)
+
+STAGES = ["schema", "ingest", "mrv"]
+
+
+def run_pipeline(args: argparse.Namespace) -> None:
+    """
+    Run the selected stages in order on the shared engine
+
+    Args:
+        args: Parsed options (`stages`, `recreate_schema`, `append` and the add_mrv_arguments options)
+    """
+    engine = get_engine()
+    stages = [name for name in STAGES if name in args.stages]
+    logger.info(f"Running stages: {', '.join(stages)}")
+
+    if "schema" in stages:
+        with stage("schema"):
+            if args.recreate_schema:
+                recreate_schema(engine)
+            else:
+                ensure_schema(engine)
+
+    if "ingest" in stages:
+        with stage("ingest"):
+            run_data_pipeline(engine, append=args.append)
+
+    if "mrv" in stages:
+        with stage("mrv"), Session(engine) as session:
+            run_mrv(session, args)
+
+    logger.info(f"✓ Pipeline complete: {engine.pool.checkedin()} database connections shared by all stages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run schema check, ingest and MRV in one process")
+    parser.add_argument(
+        "--stages",
+        nargs="+",
+        choices=STAGES,
+        default=STAGES,
+        help="Stages to run, always in schema -> ingest -> mrv order",
+    )
+    parser.add_argument(
+        "--recreate-schema",
+        action="store_true",
+        help="Drop and recreate every table in the schema stage (default: only create missing tables)",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Let the ingest stage append to tables that already hold data (default: refuse)",
+    )
+    parser.add_argument(
+        "--profile",
+        default=os.getenv("PROFILE", ""),
+        help="Profile the run: cpu, mem, cpu,mem or all (output in data/output/profiles)",
+    )
+    add_mrv_arguments(parser)
+    args = check_mrv_arguments(parser, parser.parse_args())
+
+    # With --recreate-schema the metrics table is recreated in the schema stage, before this run's metrics are written
+    with pipeline_run("pipeline", engine=get_engine(), profile=args.profile):
+        run_pipeline(args)
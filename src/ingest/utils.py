@@ -1,35 +1,34 @@
 import pandas as pd
 from typing import List, Dict, Optional
+import json
 import logging
-import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
+from src.models.database import get_engine
 from src.models.schemas import WastewaterPlant
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import timed_stage
 
 logger = setup_logger(__name__)
 
 
-def create_wastewater_facilities(facility_data: list[dict], database_url: str = None) -> list[WastewaterPlant]:
+def create_wastewater_facilities(facility_data: list[dict], database_url: str = None, engine=None) -> list[WastewaterPlant]:
     """
     Create wastewater facility records in the database
 
     Args:
         facility_data: List of dicts with facility information
-        database_url: Database connection string (uses env var if not provided)
+        database_url: Database connection string for a dedicated engine
+        engine: SQLAlchemy engine to use; with neither argument the shared
+            engine from src/models/database.py is used
 
     Returns:
         List of created WastewaterPlant objects
     """
-    if database_url is None:
-        database_url = os.getenv("DATABASE_URL")
-
-    if not database_url:
-        raise ValueError("DATABASE_URL must be provided or set as environment variable")
-
     logger.info(f"Creating {len(facility_data)} wastewater facilities...")
 
-    engine = create_engine(database_url)
+    if engine is None:
+        engine = create_engine(database_url) if database_url else get_engine()
     SessionLocal = sessionmaker(bind=engine)
     session = SessionLocal()
 
@@ -62,6 +61,7 @@ def create_wastewater_facilities(facility_data: list[dict], database_url: str =
         session.close()
 
 
+@timed_stage()
 def transform_crew_data(
     df: pd.DataFrame,
     columns_to_keep: List[str],
@@ -171,3 +171,18 @@ def transform_crew_data(
     logger.info(f"Final shape: {new_df.shape[0]} rows x {new_df.shape[1]} columns")
 
     return new_df
+
+
+def metadata_to_json(metadata: pd.Series) -> pd.Series:
+    """
+    Serialize the metadata dicts built by transform_crew_data to JSON strings
+
+    Args:
+        metadata: Series of dicts (missing values such as NaN/NaT become null)
+
+    Returns:
+        Series of JSON strings (None where the entry is not a dict)
+    """
+    return metadata.apply(
+        lambda x: (json.dumps({k: (None if pd.isna(v) else v) for k, v in x.items()}) if isinstance(x, dict) else None)
+    )
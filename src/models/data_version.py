@@ -0,0 +1,52 @@
+# src/models/data_version.py
+"""
+Data-version watermarks
+
+Pipelines bump a dataset's version after each successful write; readers such as
+the dashboard include the version in their cache keys, so cached results stay
+valid until the underlying data actually changes.
+"""
+from sqlalchemy import text
+
+from src.models.schemas import DataVersion
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DATASETS = ("lab_reading", "plant_operation", "co2_removal")
+
+VERSION_TABLE = DataVersion.__tablename__
+
+
+def bump_data_version(conn, *datasets: str) -> None:
+    """
+    Increment the version of each dataset (caller commits)
+
+    Args:
+        conn: SQLAlchemy connection or session
+        datasets: Names from DATASETS
+    """
+    unknown = set(datasets) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"Unknown datasets {sorted(unknown)}; expected any of {DATASETS}")
+
+    for dataset in datasets:
+        conn.execute(
+            text(
+                f"""
+                INSERT INTO {VERSION_TABLE} (dataset, version, updated_at)
+                VALUES (:dataset, 1, CURRENT_TIMESTAMP)
+                ON CONFLICT (dataset) DO UPDATE
+                SET version = {VERSION_TABLE}.version + 1, updated_at = CURRENT_TIMESTAMP
+                """
+            ),
+            {"dataset": dataset},
+        )
+    logger.info(f"✓ Bumped data version for {', '.join(datasets)}")
+
+
+def get_data_versions(conn) -> dict[str, int]:
+    """Current version of every dataset (0 for datasets never written)"""
+    versions = dict.fromkeys(DATASETS, 0)
+    versions.update(dict(conn.execute(text(f"SELECT dataset, version FROM {VERSION_TABLE}")).all()))
+    return versions
@@ -1,15 +1,20 @@
 # src/models/database.py
 """
 Database connection and session management with TimescaleDB + PostGIS support
+
+Nothing is read or connected at import time: `.env` is loaded, DATABASE_URL
+validated and the pooled engine built on the first call to get_engine() (or
+first use of `engine`/`SessionLocal`), so importing this module costs no more
+than importing SQLAlchemy.
 """
 import os
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
 
-# Load environment variables from .env file
-from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session as SQLAlchemySession
 from sqlalchemy.orm import sessionmaker
 
@@ -17,39 +22,72 @@ from src.utils.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-# Load .env file
 # Look for .env in project root
-env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
-
-# Get configuration from environment
-DATABASE_URL = os.getenv("DATABASE_URL")
-ENV = os.getenv("ENV", "development")
-
-# Validate required environment variables
-if not DATABASE_URL:
-    raise ValueError(
-        "DATABASE_URL environment variable is not set. "
-        "Please create a .env file with DATABASE_URL defined."
-    )
-
-logger.info(f"Environment: {ENV}")
-logger.info(
-    f"Database URL: {DATABASE_URL.replace(DATABASE_URL.split('@')[0].split('//')[1], '***')}"
-)  # Hide password in logs
-
-# Create SQLAlchemy engine
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=(ENV == "development"),  # Show SQL queries in development
-    pool_recycle=3600,
-)
-
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ENV_PATH = Path(__file__).parent.parent.parent / ".env"
+
+_engine = None
+_session_factory = None
+_lock = threading.Lock()
+
+
+def get_database_url() -> str:
+    """
+    DATABASE_URL from the environment, after loading .env (existing variables win)
+
+    Raises:
+        ValueError: If DATABASE_URL is not set
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv(dotenv_path=ENV_PATH)
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise ValueError(
+            "DATABASE_URL environment variable is not set. "
+            "Please create a .env file with DATABASE_URL defined."
+        )
+    return database_url
+
+
+def get_engine() -> Engine:
+    """Process-wide pooled engine, created on first use"""
+    global _engine
+    with _lock:
+        if _engine is None:
+            database_url = get_database_url()
+            logger.info(f"Environment: {os.getenv('ENV', 'development')}")
+            logger.info(
+                f"Database URL: {database_url.replace(database_url.split('@')[0].split('//')[1], '***')}"
+            )  # Hide password in logs
+            _engine = create_engine(
+                database_url,
+                pool_pre_ping=True,
+                pool_size=10,
+                max_overflow=20,
+                # Printing every statement slows bulk loads; SQL_ECHO=1 to debug, src/utils/sql_profiler.py to measure
+                echo=os.getenv("SQL_ECHO", "0") == "1",
+                pool_recycle=3600,
+            )
+        return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """Session factory bound to get_engine(), created on first use"""
+    global _session_factory
+    engine = get_engine()
+    with _lock:
+        if _session_factory is None:
+            _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        return _session_factory
+
+
+def __getattr__(name: str):
+    # `from src.models.database import engine, SessionLocal` keeps working, built on first access
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @contextmanager
@@ -58,7 +96,7 @@ def get_db() -> Generator[SQLAlchemySession, None, None]:
     Context manager for database sessions
     Automatically handles commits and rollbacks
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
         db.commit()
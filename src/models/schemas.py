@@ -11,8 +11,10 @@ from sqlalchemy import (
     Date,
     DateTime,
     Float,
+    Index,
     Integer,
     String,
+    UniqueConstraint,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
@@ -36,6 +38,8 @@ class WastewaterPlant(Base):
 
 class CrewCarbonLabReading(Base):
     __tablename__ = "crewcarbon_lab_reading"
+    # Keyset pagination order for the dashboard data browser
+    __table_args__ = (Index("ix_lab_reading_plant_datetime_id", "plant_id", "datetime", "id"),)
     id = Column(Integer, primary_key=True, autoincrement=True, comment="internal id for each reading")
     reading_id = Column(String, nullable=True, comment="id for each reading per source doocument")
     plant_id = Column(String, nullable=False, index=True, comment="human readable id for each ww plant")
@@ -86,6 +90,8 @@ class CO2RemovalCalculation(Base):
     """Calculated CO2 removal with intermediate values"""
 
     __tablename__ = "crewcarbon_co2_removal_calculation"
+    # Keyset pagination order for the dashboard data browser
+    __table_args__ = (Index("ix_co2_removal_calc_plant_date_id", "plant_id", "date", "id"),)
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     # ops_id = Column(Integer, ForeignKey(
@@ -97,6 +103,8 @@ class CO2RemovalCalculation(Base):
     ca_upstream_mg_per_l = Column(Float, nullable=False, comment="Ca conc. at primary clarifier")
     ca_downstream_mg_per_l = Column(Float, nullable=False, comment="Ca conc. at secondary clarifier")
     flow_mgd = Column(Float, nullable=False, comment="plant flow rate in MGD")
+    ca_upstream_offset_hours = Column(Float, nullable=True, comment="upstream sample date - ops date (as-of matching)")
+    ca_downstream_offset_hours = Column(Float, nullable=True, comment="downstream sample date - ops date (as-of matching)")
 
     # Intermediate calculations
     ca_delta_mg_per_l = Column(Float, nullable=False, comment="(Ca_downstream - Ca_upstream)")
@@ -115,3 +123,130 @@ class CO2RemovalCalculation(Base):
     quality_flag = Column(String, nullable=True)
     validation_message = Column(String(500), nullable=True)  # ← ADD THIS
     created_at = Column(DateTime, server_default=func.now())
+
+
+class CO2RemovalUncertainty(Base):
+    """Monte Carlo uncertainty of daily CO2 removal"""
+
+    __tablename__ = "crewcarbon_co2_removal_uncertainty"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plant_id = Column(String, nullable=False, index=True)
+    date = Column(Date, nullable=False, index=True)
+
+    # Sampling inputs
+    n_draws = Column(Integer, nullable=False, comment="number of Monte Carlo draws")
+    ca_upstream_sigma_mg_per_l = Column(Float, nullable=False, comment="std dev used for upstream Ca")
+    ca_downstream_sigma_mg_per_l = Column(Float, nullable=False, comment="std dev used for downstream Ca")
+    flow_rel_sigma = Column(Float, nullable=False, comment="relative std dev used for flow (0 = fixed)")
+
+    # Distribution of co2_removed_metric_tons_per_day
+    co2_mean_metric_tons_per_day = Column(Float, nullable=False)
+    co2_std_metric_tons_per_day = Column(Float, nullable=False)
+    co2_p5_metric_tons_per_day = Column(Float, nullable=False)
+    co2_p95_metric_tons_per_day = Column(Float, nullable=False)
+
+    # Metadata
+    calculation_version = Column(String(20), default="v1.0")
+    quality_flag = Column(String, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class CO2RemovalUncertaintyPeriod(Base):
+    """Monte Carlo uncertainty of total CO2 removal over a period (VALID days only)"""
+
+    __tablename__ = "crewcarbon_co2_removal_uncertainty_period"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plant_id = Column(String, nullable=False, index=True)
+    period_start = Column(Date, nullable=False)
+    period_end = Column(Date, nullable=False)
+    n_days = Column(Integer, nullable=False, comment="number of VALID days summed per draw")
+    n_draws = Column(Integer, nullable=False, comment="number of Monte Carlo draws")
+
+    # Distribution of the period total
+    co2_mean_metric_tons = Column(Float, nullable=False)
+    co2_std_metric_tons = Column(Float, nullable=False)
+    co2_p5_metric_tons = Column(Float, nullable=False)
+    co2_p95_metric_tons = Column(Float, nullable=False)
+
+    # Metadata
+    calculation_version = Column(String(20), default="v1.0")
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class CO2RemovalRollup(Base):
+    """Weekly/monthly/quarterly CO2 removal per plant, refreshed after each MRV run"""
+
+    __tablename__ = "crewcarbon_co2_removal_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "plant_id",
+            "calculation_version",
+            "period_type",
+            "period_start",
+            "quality_scope",
+            name="uq_co2_removal_rollup_period",
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    plant_id = Column(String, nullable=False, index=True)
+    calculation_version = Column(String(20), nullable=False)
+    period_type = Column(String(10), nullable=False, comment="week, month or quarter")
+    period_start = Column(Date, nullable=False, comment="date_trunc(period_type, date)")
+    quality_scope = Column(String(10), nullable=False, comment="VALID = VALID rows only, ALL = every quality flag")
+
+    # Additive aggregates - averages are derived as sum / day_count
+    day_count = Column(Integer, nullable=False)
+    total_co2_metric_tons = Column(Float, nullable=False)
+    sum_ca_delta_mg_per_l = Column(Float, nullable=False)
+
+    updated_at = Column(DateTime, server_default=func.now())
+
+
+class DataVersion(Base):
+    """Monotonic version per dataset, bumped by pipelines after each successful write"""
+
+    __tablename__ = "crewcarbon_data_version"
+
+    dataset = Column(String(50), primary_key=True, comment="lab_reading, plant_operation or co2_removal")
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, server_default=func.now())
+
+
+class QAEvent(Base):
+    """One validation finding per plant-day, written in bulk at the end of an MRV run"""
+
+    __tablename__ = "crewcarbon_qa_event"
+    __table_args__ = (Index("ix_qa_event_plant_date", "plant_id", "date"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(36), nullable=False, index=True, comment="uuid shared by all events of one run")
+    plant_id = Column(String, nullable=False)
+    date = Column(Date, nullable=False)
+    check_name = Column(String(50), nullable=False, comment="validation or calculation step that raised the event")
+    quality_flag = Column(String(50), nullable=False)
+    severity = Column(String(10), nullable=False, comment="warning (still calculated) or error (skipped)")
+    message = Column(String(500), nullable=True)
+    calculation_version = Column(String(20), nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class PipelineRunMetric(Base):
+    """Per-stage timings and throughput of one pipeline run (stage 'total' holds the run and its counters)"""
+
+    __tablename__ = "pipeline_run_metrics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(36), nullable=False, index=True)
+    pipeline = Column(String(50), nullable=False, comment="entry point, e.g. data_pipeline or mrv_pipeline")
+    stage = Column(String(100), nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    rows_in = Column(Integer, nullable=True)
+    rows_out = Column(Integer, nullable=True)
+    rows_per_second = Column(Float, nullable=True, comment="rows_out (or rows_in) / duration")
+    peak_rss_mb = Column(Float, nullable=True, comment="process peak RSS when the stage finished")
+    counters = Column(JSON, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
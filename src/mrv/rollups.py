@@ -0,0 +1,247 @@
+"""
+Period rollups of CO2 removal
+
+crewcarbon_co2_removal_rollup holds additive weekly/monthly/quarterly aggregates
+per plant, calculation version and quality scope. After each MRV run only the
+periods overlapping the run's date range are recomputed, so reporting queries
+read a handful of rollup rows instead of scanning every daily result.
+"""
+from calendar import monthrange
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from src.models.schemas import CO2RemovalCalculation, CO2RemovalRollup
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+# date_trunc field -> length of one period
+ROLLUP_PERIODS = {"week": "1 week", "month": "1 month", "quarter": "3 months"}
+QUALITY_SCOPES = ("VALID", "ALL")
+
+CALC_TABLE = CO2RemovalCalculation.__tablename__
+ROLLUP_TABLE = CO2RemovalRollup.__tablename__
+
+
+def refresh_co2_rollups(
+    conn,
+    plant_id: str = None,
+    start_date: date = None,
+    end_date: date = None,
+) -> int:
+    """
+    Recompute rollups for every period that overlaps [start_date, end_date]
+
+    Args:
+        conn: SQLAlchemy connection or session (caller commits)
+        plant_id: Restrict the refresh to one plant (all plants if None)
+        start_date: First date written by the MRV run (full rebuild if None)
+        end_date: Last date written by the MRV run (full rebuild if None)
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    for period_type, period_interval in ROLLUP_PERIODS.items():
+        filters = ""
+        params = {"period_type": period_type, "period_interval": period_interval}
+        if plant_id:
+            filters += " AND plant_id = :plant_id"
+            params["plant_id"] = plant_id
+        if start_date and end_date:
+            params["start_date"] = start_date
+            params["end_date"] = end_date
+
+        # Widen the run's range to whole periods so partially touched periods are rebuilt completely
+        period_range = (
+            " AND {col} >= CAST(date_trunc(:period_type, CAST(:start_date AS date)) AS date)"
+            " AND {col} < CAST(date_trunc(:period_type, CAST(:end_date AS date))"
+            " + CAST(:period_interval AS interval) AS date)"
+            if start_date and end_date
+            else ""
+        )
+
+        conn.execute(
+            text(
+                f"DELETE FROM {ROLLUP_TABLE} WHERE period_type = :period_type"
+                + filters
+                + period_range.format(col="period_start")
+            ),
+            params,
+        )
+        result = conn.execute(
+            text(
+                f"""
+                INSERT INTO {ROLLUP_TABLE} (
+                    plant_id, calculation_version, period_type, period_start, quality_scope,
+                    day_count, total_co2_metric_tons, sum_ca_delta_mg_per_l, updated_at
+                )
+                SELECT
+                    plant_id,
+                    calculation_version,
+                    :period_type,
+                    CAST(date_trunc(:period_type, date) AS date) AS period_start,
+                    scope.quality_scope,
+                    COUNT(*),
+                    SUM(co2_removed_metric_tons_per_day),
+                    SUM(ca_delta_mg_per_l),
+                    now()
+                FROM {CALC_TABLE}
+                CROSS JOIN (VALUES ('VALID'), ('ALL')) AS scope(quality_scope)
+                WHERE (scope.quality_scope = 'ALL' OR quality_flag = 'VALID')
+                """
+                + filters
+                + period_range.format(col="date")
+                + " GROUP BY plant_id, calculation_version, period_start, scope.quality_scope"
+            ),
+            params,
+        )
+        written += result.rowcount
+
+    logger.info(f"Refreshed {written} CO2 rollup rows for {plant_id or 'all plants'}")
+    return written
+
+
+def get_co2_rollups(
+    conn,
+    period_type: str = "month",
+    plant_id: str = None,
+    quality_scope: str = "VALID",
+    calculation_version: str = "v1.0",
+) -> list[dict]:
+    """
+    Read rollup rows for one period type, with derived daily averages
+
+    Returns:
+        List of dicts ordered by plant_id, period_start
+    """
+    if period_type not in ROLLUP_PERIODS:
+        raise ValueError(f"period_type must be one of {list(ROLLUP_PERIODS)}")
+    if quality_scope not in QUALITY_SCOPES:
+        raise ValueError(f"quality_scope must be one of {QUALITY_SCOPES}")
+
+    query = f"""
+        SELECT plant_id, period_start, day_count, total_co2_metric_tons,
+               total_co2_metric_tons / day_count AS avg_co2_metric_tons_per_day,
+               sum_ca_delta_mg_per_l / day_count AS avg_ca_delta_mg_per_l
+        FROM {ROLLUP_TABLE}
+        WHERE period_type = :period_type
+          AND quality_scope = :quality_scope
+          AND calculation_version = :calculation_version
+    """
+    params = {"period_type": period_type, "quality_scope": quality_scope, "calculation_version": calculation_version}
+    if plant_id:
+        query += " AND plant_id = :plant_id"
+        params["plant_id"] = plant_id
+    query += " ORDER BY plant_id, period_start"
+
+    return [dict(row._mapping) for row in conn.execute(text(query), params)]
+
+
+def _full_month_span(start_date: date, end_date: date) -> tuple[date, date] | None:
+    """First day of the first and last whole calendar months inside [start_date, end_date]"""
+    first = start_date if start_date.day == 1 else (start_date.replace(day=1) + timedelta(days=32)).replace(day=1)
+    last = end_date.replace(day=1)
+    if end_date.day != monthrange(end_date.year, end_date.month)[1]:
+        last = (last - timedelta(days=1)).replace(day=1)
+    return (first, last) if first <= last else None
+
+
+def _scope_totals(conn, quality_scope, plant_id, start_date, end_date, calculation_version) -> dict:
+    """Totals for one quality scope: whole months from rollups, ragged edges from daily rows"""
+    params = {"quality_scope": quality_scope, "calculation_version": calculation_version}
+    plant_filter = ""
+    if plant_id:
+        plant_filter = " AND plant_id = :plant_id"
+        params["plant_id"] = plant_id
+    quality_filter = " AND quality_flag = 'VALID'" if quality_scope == "VALID" else ""
+
+    parts = []
+    span = _full_month_span(start_date, end_date)
+    if span:
+        params["month_first"], params["month_last"] = span
+        parts.append(
+            f"""
+            SELECT day_count, total_co2_metric_tons, sum_ca_delta_mg_per_l
+            FROM {ROLLUP_TABLE}
+            WHERE period_type = 'month' AND quality_scope = :quality_scope
+              AND calculation_version = :calculation_version
+              AND period_start BETWEEN :month_first AND :month_last{plant_filter}
+            """
+        )
+        edges = [(start_date, span[0] - timedelta(days=1))]
+        next_month = (span[1] + timedelta(days=32)).replace(day=1)
+        edges.append((next_month, end_date))
+    else:
+        edges = [(start_date, end_date)]
+
+    for i, (edge_start, edge_end) in enumerate(edges):
+        if edge_start > edge_end:
+            continue
+        params[f"edge_start_{i}"], params[f"edge_end_{i}"] = edge_start, edge_end
+        parts.append(
+            f"""
+            SELECT COUNT(*), SUM(co2_removed_metric_tons_per_day), SUM(ca_delta_mg_per_l)
+            FROM {CALC_TABLE}
+            WHERE calculation_version = :calculation_version
+              AND date BETWEEN :edge_start_{i} AND :edge_end_{i}{plant_filter}{quality_filter}
+            """
+        )
+
+    row = conn.execute(
+        text(
+            "SELECT COALESCE(SUM(day_count), 0), COALESCE(SUM(total_co2), 0), COALESCE(SUM(sum_ca_delta), 0) "
+            "FROM (" + " UNION ALL ".join(parts) + ") AS parts(day_count, total_co2, sum_ca_delta)"
+        ),
+        params,
+    ).one()
+    return {"day_count": int(row[0]), "total_co2_metric_tons": float(row[1]), "sum_ca_delta_mg_per_l": float(row[2])}
+
+
+def get_co2_totals(
+    conn,
+    start_date: date,
+    end_date: date,
+    plant_id: str = None,
+    quality_flags: list[str] = ("VALID",),
+    calculation_version: str = "v1.0",
+) -> dict:
+    """
+    Total/average CO2 removal for any date range, reading whole months from rollups
+
+    Only the partial months at either end of the range touch daily rows, so the
+    cost stays bounded however many days have accumulated.
+
+    Args:
+        conn: SQLAlchemy connection or session
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        plant_id: One plant, or all plants if None
+        quality_flags: Any combination of "VALID" and "INVALID"
+        calculation_version: Calculation version to report
+
+    Returns:
+        dict with day_count, total_co2_metric_tons, avg_co2_metric_tons_per_day, avg_ca_delta_mg_per_l
+    """
+    flags = set(quality_flags)
+    if not flags <= {"VALID", "INVALID"}:
+        raise ValueError("quality_flags may only contain 'VALID' and 'INVALID'")
+
+    def scope(name):
+        return _scope_totals(conn, name, plant_id, start_date, end_date, calculation_version)
+
+    if flags == {"VALID"}:
+        totals = scope("VALID")
+    elif flags == {"VALID", "INVALID"}:
+        totals = scope("ALL")
+    elif flags == {"INVALID"}:
+        all_totals, valid_totals = scope("ALL"), scope("VALID")
+        totals = {key: all_totals[key] - valid_totals[key] for key in all_totals}
+    else:
+        totals = {"day_count": 0, "total_co2_metric_tons": 0.0, "sum_ca_delta_mg_per_l": 0.0}
+
+    day_count = totals["day_count"]
+    totals["avg_co2_metric_tons_per_day"] = totals["total_co2_metric_tons"] / day_count if day_count else 0.0
+    totals["avg_ca_delta_mg_per_l"] = totals["sum_ca_delta_mg_per_l"] / day_count if day_count else 0.0
+    return totals
@@ -0,0 +1,165 @@
+"""
+Streaming MRV for long date ranges
+
+Walks a plant's date range in bounded chunks (monthly by default): each chunk's
+inputs are read through a server-side cursor, evaluated in one vectorized pass,
+written and released before the next chunk is loaded. Only running summary
+statistics are kept, so peak memory is that of a single chunk however long the
+backfill is.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from src.models.schemas import CO2RemovalCalculation, WasteWaterPlantOperation
+from src.mrv.scenarios import evaluate_scenarios, record_results_events
+from src.mrv.utils import (
+    DEFAULT_PARAMETERS,
+    MRVParameters,
+    calcium_load_range,
+    delete_existing_results,
+    load_calcium_frame,
+    load_ops_frame,
+)
+from src.qaqc.events import ValidationEventCollector
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+@dataclass
+class RunningSummary:
+    """Summary statistics accumulated chunk by chunk"""
+
+    plant_id: str
+    total_dates: int = 0
+    calculated: int = 0
+    skipped: int = 0
+    valid_count: int = 0
+    total_co2_valid_mt: float = 0.0
+    quality_flags: Counter = field(default_factory=Counter)
+
+    def update(self, results) -> None:
+        calculated = results[results["should_calculate"]]
+        valid = calculated["quality_flag"] == "VALID"
+
+        self.total_dates += len(results)
+        self.calculated += len(calculated)
+        self.skipped += len(results) - len(calculated)
+        self.valid_count += int(valid.sum())
+        self.total_co2_valid_mt += float(calculated.loc[valid, "co2_removed_metric_tons_per_day"].sum())
+        self.quality_flags.update(calculated["quality_flag"].value_counts().to_dict())
+
+    def as_dict(self) -> dict:
+        return {
+            "plant_id": self.plant_id,
+            "total_dates": self.total_dates,
+            "calculated": self.calculated,
+            "skipped": self.skipped,
+            "quality_flags": dict(self.quality_flags),
+            "total_co2_valid_mt": self.total_co2_valid_mt,
+            "avg_co2_valid_mt_per_day": self.total_co2_valid_mt / self.valid_count if self.valid_count else 0.0,
+        }
+
+
+def iter_date_chunks(start_date: date, end_date: date, months: int = 1):
+    """Yield (chunk_start, chunk_end) pairs aligned to calendar months"""
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        year_offset, month_index = divmod(chunk_start.month - 1 + months, 12)
+        next_start = date(chunk_start.year + year_offset, month_index + 1, 1)
+        yield chunk_start, min(next_start - timedelta(days=1), end_date)
+        chunk_start = next_start
+
+
+def stream_calculate_co2_removal(
+    session: Session,
+    plant_id: str,
+    start_date: date = None,
+    end_date: date = None,
+    params: MRVParameters = DEFAULT_PARAMETERS,
+    chunk_months: int = 1,
+    yield_per: int = 5_000,
+) -> dict:
+    """
+    Calculate CO2 removal chunk by chunk, writing each chunk before loading the next
+
+    Results and quality flags match bulk_calculate_co2_removal; previous results for
+    each chunk are replaced. Like the bulk path, rollups are left to the caller, which
+    refreshes the whole range once after the run.
+
+    Args:
+        session: SQLAlchemy session
+        plant_id: Plant identifier (string like 'PLANT_A')
+        start_date: First date (defaults to the plant's first ops date)
+        end_date: Last date (defaults to the plant's last ops date)
+        params: Parameter set for the calculation
+        chunk_months: Calendar months per chunk
+        yield_per: Rows fetched per server-side cursor batch
+
+    Returns:
+        dict with summary stats including calculated/skipped/invalid counts
+    """
+    if start_date is None or end_date is None:
+        first_date, last_date = (
+            session.query(func.min(WasteWaterPlantOperation.date), func.max(WasteWaterPlantOperation.date))
+            .filter(WasteWaterPlantOperation.plant_id == plant_id)
+            .one()
+        )
+        start_date = start_date or first_date
+        end_date = end_date or last_date
+
+    summary = RunningSummary(plant_id=plant_id)
+    if start_date is None or end_date is None:
+        logger.warning(f"No ops data found for {plant_id}")
+        return summary.as_dict()
+
+    logger.info(f"Streaming {plant_id} from {start_date} to {end_date} in {chunk_months}-month chunks")
+
+    units = [params.upstream_unit, params.downstream_unit]
+    # Counts and exemplars accumulate over the run; event rows are written with each chunk
+    events = ValidationEventCollector(calculation_version=params.calculation_version)
+    for chunk_start, chunk_end in iter_date_chunks(start_date, end_date, chunk_months):
+        # Cleared before the empty check, so a chunk whose ops rows are gone loses its old results too
+        delete_existing_results(session, plant_id, [params.calculation_version], chunk_start, chunk_end)
+        ops = load_ops_frame(session, plant_id, chunk_start, chunk_end, yield_per=yield_per)
+        if ops.empty:
+            session.commit()
+            continue
+        ca_start, ca_end = calcium_load_range([params], chunk_start, chunk_end)
+        ca = load_calcium_frame(session, plant_id, units, ca_start, ca_end, yield_per=yield_per)
+
+        results = evaluate_scenarios(ops, ca, [params])
+        calculated = results[results["should_calculate"]].drop(columns="should_calculate")
+        calculated.insert(0, "plant_id", plant_id)
+
+        session.bulk_insert_mappings(CO2RemovalCalculation, calculated.to_dict("records"))
+        record_results_events(results, plant_id, events)
+        events.flush(session)
+        session.commit()
+        session.expunge_all()
+
+        summary.update(results)
+        logger.info(
+            f"  {chunk_start} → {chunk_end}: {len(calculated)}/{len(results)} calculated, "
+            f"running VALID total {summary.total_co2_valid_mt:.2f} MT"
+        )
+        del ops, ca, results, calculated
+
+    events.log_summary(logger)
+    summary_dict = summary.as_dict()
+    logger.info(f"Summary for {plant_id}")
+    logger.info(f"{'='*60}")
+    logger.info(f"Total dates processed:        {summary.total_dates}")
+    logger.info(f"Successfully calculated:     {summary.calculated}")
+    logger.info(f"Skipped (no data):           {summary.skipped}")
+    logger.info(f"Quality Flag Breakdown:")
+    for flag, count in sorted(summary.quality_flags.items()):
+        pct = (count / summary.calculated * 100) if summary.calculated else 0
+        logger.info(f"  {flag:20s}: {count:4d} ({pct:5.1f}%)")
+    logger.info(f"{'='*60}\n")
+
+    return summary_dict
@@ -1,27 +1,211 @@
+from __future__ import annotations
+
+import logging
+import math
 import os
-from datetime import date
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
 
+import numpy as np
 from sqlalchemy import inspect
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
 
-from src.models.schemas import CO2RemovalCalculation, CrewCarbonLabReading, WasteWaterPlantOperation
+from src.models.schemas import (
+    CO2RemovalCalculation,
+    CO2RemovalUncertainty,
+    CO2RemovalUncertaintyPeriod,
+    CrewCarbonLabReading,
+    WasteWaterPlantOperation,
+)
 from src.utils.logging_config import setup_logger
+from src.utils.metrics import increment, timed_stage
+from src.qaqc.events import ValidationEventCollector
 from src.qaqc.mrv_utils import (
     validate_ops_data,
     validate_calcium_readings,
     validate_ca_delta,
     validate_all_inputs,
     ValidationResult,
+    classify_inputs,
+    record_classified_events,
 )
 
+# pandas is imported inside the frame helpers so the per-day path (a short rerun) never loads it
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = setup_logger(__name__)
 
+# Molecular weights (g/mol)
+MW_CA = 40.078
+MW_CACO3 = 100.0869
+MW_CO2 = 44.0095
+
+# Unit conversions
+M3_PER_MILLION_GALLONS = 3785.41
+L_PER_M3 = 1000
+MG_PER_METRIC_TON = 1_000_000_000
+
+
+REPLICATE_RULES = {
+    "first": None,  # first reading of the day, same as the per-day `.first()` lookup
+    "mean": np.mean,
+    "median": np.median,
+}
+
+
+# MRVParameters fields that enter the stoichiometry, passed to co2_stoichiometry by name
+STOICHIOMETRY_PARAMETERS = ("mw_ca", "mw_caco3", "mw_co2", "m3_per_million_gallons")
+
+
+@dataclass(frozen=True)
+class MRVParameters:
+    """
+    Named parameter set for the CO2 removal calculation
+
+    Results calculated with a parameter set are stored under its
+    `calculation_version`, so variants can be compared side by side.
+    """
+
+    calculation_version: str = "v1.0"
+    mw_ca: float = MW_CA
+    mw_caco3: float = MW_CACO3
+    mw_co2: float = MW_CO2
+    m3_per_million_gallons: float = M3_PER_MILLION_GALLONS
+    flow_column: str = "actual_eff_flow_mgd"
+    upstream_unit: str = "primary_clarifier"
+    downstream_unit: str = "secondary_clarifier"
+    replicate_rule: str = "first"
+    calcium_match: str = "exact"  # "exact" calendar date or "asof" nearest sample within tolerance
+    asof_tolerance_hours: float = 24.0
+
+    def __post_init__(self):
+        version_length = CO2RemovalCalculation.calculation_version.type.length
+        if len(self.calculation_version) > version_length:
+            raise ValueError(f"calculation_version must be at most {version_length} characters")
+        if self.flow_column not in ("actual_eff_flow_mgd", "actual_inf_flow_mgd"):
+            raise ValueError(f"Unsupported flow_column: {self.flow_column}")
+        if self.replicate_rule not in REPLICATE_RULES:
+            raise ValueError(f"replicate_rule must be one of {list(REPLICATE_RULES)}")
+        if self.calcium_match not in ("exact", "asof"):
+            raise ValueError("calcium_match must be 'exact' or 'asof'")
+        if self.asof_tolerance_hours < 0:
+            raise ValueError("asof_tolerance_hours must be non-negative")
+
+    def stoichiometry_parameters(self) -> dict:
+        """Keyword arguments of co2_stoichiometry taken from this parameter set"""
+        return {name: getattr(self, name) for name in STOICHIOMETRY_PARAMETERS}
+
+
+DEFAULT_PARAMETERS = MRVParameters()
+
+
+def co2_stoichiometry(
+    ca_upstream,
+    ca_downstream,
+    flow_mgd,
+    mw_ca=MW_CA,
+    mw_caco3=MW_CACO3,
+    mw_co2=MW_CO2,
+    m3_per_million_gallons=M3_PER_MILLION_GALLONS,
+) -> dict:
+    """
+    Ca -> CaCO3 -> CO2 stoichiometry, the one implementation every MRV path uses
+
+    Works on floats or NumPy arrays of any (broadcastable) shape, including
+    per-scenario parameter columns and Monte Carlo draws
+
+    Returns:
+        dict of CO2RemovalCalculation column name -> value for every intermediate,
+        from ca_delta_mg_per_l to co2_removed_metric_tons_per_day
+    """
+    ca_delta = ca_downstream - ca_upstream
+    flow_m3_day = flow_mgd * m3_per_million_gallons
+    flow_l_day = flow_m3_day * L_PER_M3
+    ca_to_caco3 = mw_caco3 / mw_ca
+    co2_to_caco3 = mw_co2 / mw_caco3
+    caco3_mg = ca_delta * flow_l_day * ca_to_caco3
+    co2_mg = caco3_mg * co2_to_caco3
+    return {
+        "ca_delta_mg_per_l": ca_delta,
+        "flow_m3_per_day": flow_m3_day,
+        "flow_l_per_day": flow_l_day,
+        "ca_to_caco3_ratio": ca_to_caco3,
+        "co2_to_caco3_ratio": co2_to_caco3,
+        "caco3_mg": caco3_mg,
+        "co2_mg": co2_mg,
+        "co2_removed_metric_tons_per_day": co2_mg / MG_PER_METRIC_TON,
+    }
+
+
+def co2_removed_metric_tons_per_day(ca_delta, flow_mgd, **stoichiometry_parameters):
+    """Daily CO2 removal (MT) from Ca delta (mg/L) and flow (MGD); see co2_stoichiometry"""
+    return co2_stoichiometry(0.0, ca_delta, flow_mgd, **stoichiometry_parameters)["co2_removed_metric_tons_per_day"]
+
+
+def _first_or_aggregated_reading(query, replicate_rule: str):
+    """Return the day's calcium reading, or a transient reading holding the replicate aggregate"""
+    if replicate_rule == "first":
+        return query.first()
+
+    readings = query.all()
+    if not readings:
+        return None
+    return CrewCarbonLabReading(value=float(REPLICATE_RULES[replicate_rule]([r.value for r in readings])))
+
+
+def delete_existing_results(
+    session: Session,
+    plant_id: str,
+    calculation_versions: list[str],
+    start_date: date = None,
+    end_date: date = None,
+) -> int:
+    """Delete stored results for a plant, versions and date range so reruns replace rather than duplicate"""
+    query = session.query(CO2RemovalCalculation).filter(
+        CO2RemovalCalculation.plant_id == plant_id,
+        CO2RemovalCalculation.calculation_version.in_(calculation_versions),
+    )
+    if start_date:
+        query = query.filter(CO2RemovalCalculation.date >= start_date)
+    if end_date:
+        query = query.filter(CO2RemovalCalculation.date <= end_date)
+    return query.delete(synchronize_session=False)
+
+
+def delete_existing_uncertainty(
+    session: Session,
+    plant_id: str,
+    calculation_versions: list[str],
+    start_date: date = None,
+    end_date: date = None,
+) -> int:
+    """Delete stored uncertainty days, and period totals inside the range, so reruns replace rather than duplicate"""
+    days = session.query(CO2RemovalUncertainty).filter(
+        CO2RemovalUncertainty.plant_id == plant_id,
+        CO2RemovalUncertainty.calculation_version.in_(calculation_versions),
+    )
+    periods = session.query(CO2RemovalUncertaintyPeriod).filter(
+        CO2RemovalUncertaintyPeriod.plant_id == plant_id,
+        CO2RemovalUncertaintyPeriod.calculation_version.in_(calculation_versions),
+    )
+    if start_date:
+        days = days.filter(CO2RemovalUncertainty.date >= start_date)
+        periods = periods.filter(CO2RemovalUncertaintyPeriod.period_start >= start_date)
+    if end_date:
+        days = days.filter(CO2RemovalUncertainty.date <= end_date)
+        periods = periods.filter(CO2RemovalUncertaintyPeriod.period_end <= end_date)
+    # "fetch" also drops the deleted objects from the session; the rerun's rows may reuse their ids
+    return days.delete(synchronize_session="fetch") + periods.delete(synchronize_session="fetch")
+
 
 def calculate_co2_removal_from_sources(
     session: Session,
     plant_id: str,
     calc_date: date,
+    params: MRVParameters = DEFAULT_PARAMETERS,
+    events: ValidationEventCollector = None,
 ) -> CO2RemovalCalculation | None:
     """
     Calculate CO2 removal by joining ops data and lab readings
@@ -30,10 +214,15 @@ def calculate_co2_removal_from_sources(
         session: SQLAlchemy session
         plant_id: Plant identifier (string like 'PLANT_A')
         calc_date: Date to calculate for
+        params: Parameter set (molecular weights, flow column, units, replicate rule)
+        events: Collector for validation events; when given, per-day lines are
+            not logged (successes only at DEBUG)
 
     Returns:
         CO2RemovalCalculation record or None if data constraints violated
     """
+    if params.calcium_match != "exact":
+        raise ValueError("Per-day lookups only support calcium_match='exact'; use bulk_calculate_co2_removal")
 
     # Get ops data for this plant and date
     ops = (
@@ -45,36 +234,47 @@ def calculate_co2_removal_from_sources(
         .first()
     )
 
-    # Get calcium readings for this plant and date
-    ca_upstream_reading = (
-        session.query(CrewCarbonLabReading)
-        .filter(
+    # Get calcium readings for this plant and date. A range on the raw column (not
+    # date(datetime) = calc_date) lets Postgres use ix_lab_reading_plant_datetime_id
+    day_end = calc_date + timedelta(days=1)
+    ca_upstream_reading = _first_or_aggregated_reading(
+        session.query(CrewCarbonLabReading).filter(
             CrewCarbonLabReading.plant_id == plant_id,
             CrewCarbonLabReading.parameter_name == "calcium",
-            CrewCarbonLabReading.plant_unit_id == "primary_clarifier",
-            func.date(CrewCarbonLabReading.datetime) == calc_date,
-        )
-        .first()
+            CrewCarbonLabReading.plant_unit_id == params.upstream_unit,
+            CrewCarbonLabReading.datetime >= calc_date,
+            CrewCarbonLabReading.datetime < day_end,
+        ),
+        params.replicate_rule,
     )
 
-    ca_downstream_reading = (
-        session.query(CrewCarbonLabReading)
-        .filter(
+    ca_downstream_reading = _first_or_aggregated_reading(
+        session.query(CrewCarbonLabReading).filter(
             CrewCarbonLabReading.plant_id == plant_id,
             CrewCarbonLabReading.parameter_name == "calcium",
-            CrewCarbonLabReading.plant_unit_id == "secondary_clarifier",
-            func.date(CrewCarbonLabReading.datetime) == calc_date,
-        )
-        .first()
+            CrewCarbonLabReading.plant_unit_id == params.downstream_unit,
+            CrewCarbonLabReading.datetime >= calc_date,
+            CrewCarbonLabReading.datetime < day_end,
+        ),
+        params.replicate_rule,
     )
 
     # Run all validations - THIS IS KEY
     should_calculate, quality_flag, validation_message = validate_all_inputs(
-        ops, ca_upstream_reading, ca_downstream_reading, plant_id, calc_date, logger
+        ops,
+        ca_upstream_reading,
+        ca_downstream_reading,
+        plant_id,
+        calc_date,
+        logger,
+        flow_column=params.flow_column,
+        events=events,
     )
 
     # If validation failed critically, return None (but log why)
     if not should_calculate:
+        if events is not None:
+            return None
         logger.warning(
             f"✗ Skipping {plant_id} {calc_date}: {quality_flag} - {validation_message}"
         )
@@ -83,28 +283,10 @@ def calculate_co2_removal_from_sources(
     # Extract values (we know they exist from validation)
     ca_upstream = ca_upstream_reading.value
     ca_downstream = ca_downstream_reading.value
-    flow_mgd = ops.actual_eff_flow_mgd
-
-    # Molecular weights (g/mol)
-    MW_Ca = 40.078
-    MW_CaCO3 = 100.0869
-    MW_CO2 = 44.0095
-
-    # Calculate intermediate values
-    ca_delta = ca_downstream - ca_upstream
+    flow_mgd = getattr(ops, params.flow_column)
 
-    # Flow calculations
-    flow_m3_day = flow_mgd * 3785.41
-    flow_l_day = flow_m3_day * 1000
-
-    # Molecular weight ratios
-    ca_to_caco3 = MW_CaCO3 / MW_Ca
-    co2_to_caco3 = MW_CO2 / MW_CaCO3
-
-    # Mass calculations
-    caco3_mg = ca_delta * flow_l_day * ca_to_caco3
-    co2_mg = caco3_mg * co2_to_caco3
-    co2_mt_day = co2_mg / 1_000_000_000
+    stoichiometry = co2_stoichiometry(ca_upstream, ca_downstream, flow_mgd, **params.stoichiometry_parameters())
+    co2_mt_day = stoichiometry["co2_removed_metric_tons_per_day"]
 
     # Create calculation record with BOTH quality_flag AND validation_message
     calc = CO2RemovalCalculation(
@@ -113,37 +295,32 @@ def calculate_co2_removal_from_sources(
         ca_upstream_mg_per_l=ca_upstream,
         ca_downstream_mg_per_l=ca_downstream,
         flow_mgd=flow_mgd,
-        ca_delta_mg_per_l=ca_delta,
-        flow_m3_per_day=flow_m3_day,
-        flow_l_per_day=flow_l_day,
-        ca_to_caco3_ratio=ca_to_caco3,
-        co2_to_caco3_ratio=co2_to_caco3,
-        caco3_mg=caco3_mg,
-        co2_mg=co2_mg,
-        co2_removed_metric_tons_per_day=co2_mt_day,
+        **stoichiometry,
+        ca_upstream_offset_hours=0.0,
+        ca_downstream_offset_hours=0.0,
+        calculation_version=params.calculation_version,
         quality_flag=quality_flag,
         validation_message=validation_message,  # ← ADD THIS
     )
 
-    # Log the calculation
-    flag_symbol = "✓" if quality_flag == "VALID" else "⚠"
-    logger.info(
-        f"{flag_symbol} {plant_id} {calc_date}: "
-        f"CO2={co2_mt_day:.6f} MT/day "
-        f"[{quality_flag}]"
-    )
-
-    if validation_message:
-        logger.info(f"  └─ {validation_message}")
+    # Log the calculation (per day only at DEBUG when events are aggregated)
+    log = logger.info if events is None else logger.debug
+    if events is None or logger.isEnabledFor(logging.DEBUG):
+        flag_symbol = "✓" if quality_flag == "VALID" else "⚠"
+        log(f"{flag_symbol} {plant_id} {calc_date}: CO2={co2_mt_day:.6f} MT/day [{quality_flag}]")
+        if validation_message:
+            log(f"  └─ {validation_message}")
 
     return calc
 
 
+@timed_stage()
 def bulk_calculate_co2_removal(
     session: Session, 
     plant_id: str, 
     start_date: date = None, 
-    end_date: date = None
+    end_date: date = None,
+    params: MRVParameters = DEFAULT_PARAMETERS,
 ) -> tuple[list[CO2RemovalCalculation], dict]:
 
     """
@@ -152,6 +329,13 @@ def bulk_calculate_co2_removal(
     Returns:
         dict with summary stats including calculated/skipped/invalid counts
     """
+    if params.calcium_match == "asof":
+        # As-of alignment joins the whole range at once instead of looking up each day
+        from src.mrv.scenarios import run_mrv_scenarios
+
+        calculated, summaries = run_mrv_scenarios(session, plant_id, [params], start_date, end_date)
+        results = [CO2RemovalCalculation(**row) for row in calculated.to_dict("records")]
+        return results, summaries[params.calculation_version]
 
     # Get all ops dates for this plant
     query = session.query(WasteWaterPlantOperation.date).filter(
@@ -171,26 +355,42 @@ def bulk_calculate_co2_removal(
 
     logger.info(f"Processing {len(dates)} dates for {plant_id}")
 
+    # Rerunning a range replaces its previous results instead of double counting them
+    delete_existing_results(session, plant_id, [params.calculation_version], start_date, end_date)
+
+    # Failures are summarized once below and written to the QA events table
+    events = ValidationEventCollector(calculation_version=params.calculation_version)
+
     for calc_date in dates:
         calc = calculate_co2_removal_from_sources(
             session=session,
             plant_id=plant_id,
             calc_date=calc_date,
+            params=params,
+            events=events,
         )
 
         if calc is not None:
             results.append(calc)
-            session.add(calc)
-            
+
             # Track quality flags
             flag = calc.quality_flag
             quality_flags[flag] = quality_flags.get(flag, 0) + 1
         else:
             skipped_count += 1
 
-    # Commit all valid calculations
+    # Added after the loop: adding per day would autoflush one INSERT per row before
+    # the next day's lookups instead of one batched INSERT
+    session.add_all(results)
+
+    # Commit all valid calculations together with their QA events
+    events.log_summary(logger)
+    events.flush(session)
     session.commit()
 
+    increment("co2_days_calculated", len(results))
+    increment("co2_days_skipped", skipped_count)
+
     # Print summary
     summary = {
         'plant_id': plant_id,
@@ -212,3 +412,412 @@ def bulk_calculate_co2_removal(
     logger.info(f"{'='*60}\n")
 
     return results, summary
+
+
+def read_sql_frame(session: Session, statement, yield_per: int = None) -> pd.DataFrame:
+    """
+    Run a select through the session's connection and return a DataFrame
+
+    With `yield_per` the rows are fetched through a server-side cursor in
+    batches, so the driver never buffers the full result next to the frame.
+    """
+    import pandas as pd
+
+    if not yield_per:
+        return pd.read_sql(statement, session.connection())
+
+    result = session.connection().execute(statement.execution_options(stream_results=True, yield_per=yield_per))
+    columns = list(result.keys())
+    frames = [pd.DataFrame.from_records(rows, columns=columns) for rows in result.partitions()]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+@timed_stage()
+def load_ops_frame(
+    session: Session,
+    plant_id: str,
+    start_date: date = None,
+    end_date: date = None,
+    yield_per: int = None,
+) -> pd.DataFrame:
+    """
+    Load both flow columns for every ops date in the range in one query
+
+    Keeps the first ops row per date, the same row the per-day lookup picks
+    """
+    import pandas as pd
+
+    query = session.query(
+        WasteWaterPlantOperation.id,
+        WasteWaterPlantOperation.date,
+        WasteWaterPlantOperation.actual_eff_flow_mgd,
+        WasteWaterPlantOperation.actual_inf_flow_mgd,
+    ).filter(WasteWaterPlantOperation.plant_id == plant_id)
+
+    if start_date:
+        query = query.filter(WasteWaterPlantOperation.date >= start_date)
+    if end_date:
+        query = query.filter(WasteWaterPlantOperation.date <= end_date)
+
+    ops = read_sql_frame(session, query.statement, yield_per)
+    ops = ops.sort_values("id").drop_duplicates("date").drop(columns="id")
+    ops["date"] = pd.to_datetime(ops["date"]).dt.date
+    ops["has_ops"] = True
+    return ops.sort_values("date").reset_index(drop=True)
+
+
+@timed_stage()
+def load_calcium_frame(
+    session: Session,
+    plant_id: str,
+    units: list[str],
+    start_date: date = None,
+    end_date: date = None,
+    yield_per: int = None,
+) -> pd.DataFrame:
+    """
+    Load every calcium reading for the given plant units and range in one query
+
+    Returns:
+        Long DataFrame of readings ordered by id, with a `date` column
+    """
+    import pandas as pd
+
+    query = session.query(
+        CrewCarbonLabReading.id,
+        CrewCarbonLabReading.plant_unit_id,
+        CrewCarbonLabReading.datetime,
+        CrewCarbonLabReading.value,
+        CrewCarbonLabReading.uncertainty,
+    ).filter(
+        CrewCarbonLabReading.plant_id == plant_id,
+        CrewCarbonLabReading.parameter_name == "calcium",
+        CrewCarbonLabReading.plant_unit_id.in_(units),
+    )
+
+    if start_date:
+        query = query.filter(CrewCarbonLabReading.datetime >= start_date)
+    if end_date:
+        query = query.filter(CrewCarbonLabReading.datetime < end_date + timedelta(days=1))
+
+    ca = read_sql_frame(session, query.statement, yield_per)
+    ca["date"] = pd.to_datetime(ca["datetime"]).dt.date
+    return ca.sort_values("id").reset_index(drop=True)
+
+
+def daily_calcium_values(ca: pd.DataFrame, unit: str, replicate_rule: str = "first") -> pd.DataFrame:
+    """
+    Reduce one unit's readings to a value per date using a replicate rule
+
+    Returns:
+        DataFrame indexed by date with `value`, the chosen reading's `uncertainty`
+        (NaN for aggregated rules) and `replicate_uncertainty`, the largest
+        uncertainty reported among the day's replicates
+    """
+    unit_readings = ca[ca["plant_unit_id"] == unit]
+    grouped = unit_readings.groupby("date")
+
+    if replicate_rule == "first":
+        daily = unit_readings.drop_duplicates("date", keep="first").set_index("date")[["value", "uncertainty"]]
+    else:
+        daily = grouped["value"].agg(replicate_rule).to_frame()
+        daily["uncertainty"] = np.nan
+
+    daily["replicate_uncertainty"] = grouped["uncertainty"].max()
+    return daily
+
+
+def calcium_load_range(
+    params_list: list[MRVParameters],
+    start_date: date = None,
+    end_date: date = None,
+) -> tuple[date | None, date | None]:
+    """Widen an ops date range by the largest as-of tolerance so edge days can match nearby samples"""
+    tolerance_hours = max(
+        (p.asof_tolerance_hours for p in params_list if p.calcium_match == "asof"),
+        default=0.0,
+    )
+    pad = timedelta(days=math.ceil(tolerance_hours / 24))
+    return (start_date - pad if start_date else None, end_date + pad if end_date else None)
+
+
+def align_calcium_to_ops(
+    dates,
+    daily: pd.DataFrame,
+    calcium_match: str = "exact",
+    tolerance_hours: float = 24.0,
+) -> pd.DataFrame:
+    """
+    Align one unit's per-sample-date calcium values to ops dates
+
+    "exact" keeps same-calendar-date matches only. "asof" runs one sorted
+    merge_asof over the whole range and takes the nearest sample date within
+    the tolerance (earlier sample on ties). Frames are already scoped to one
+    plant and unit, so the join is effectively by plant and unit.
+
+    Args:
+        dates: Ops dates to align to
+        daily: Output of daily_calcium_values (indexed by sample date)
+        calcium_match: "exact" or "asof"
+        tolerance_hours: Largest |sample date - ops date| accepted in asof mode
+
+    Returns:
+        DataFrame with daily's columns aligned row-for-row to `dates`, plus
+        `offset_hours` (sample date - ops date, NaN when unmatched)
+    """
+    import pandas as pd
+
+    target = pd.DataFrame({"date": pd.to_datetime(pd.Series(dates, dtype=object))})
+
+    if calcium_match == "exact" or daily.empty:
+        aligned = daily.reindex(pd.Index(dates, dtype=object)).reset_index(drop=True)
+        aligned["offset_hours"] = np.where(aligned["value"].notna(), 0.0, np.nan)
+        return aligned
+
+    samples = daily.reset_index(names="sample_date")
+    samples["sample_date"] = pd.to_datetime(samples["sample_date"])
+    samples = samples.sort_values("sample_date")
+
+    # Two nearest-neighbour candidates: the closest sample at or before, and at or after, each ops date
+    ordered = target.reset_index().sort_values("date")
+    tolerance = pd.Timedelta(hours=tolerance_hours)
+    backward = pd.merge_asof(ordered, samples, left_on="date", right_on="sample_date", direction="backward", tolerance=tolerance)
+    forward = pd.merge_asof(ordered, samples, left_on="date", right_on="sample_date", direction="forward", tolerance=tolerance)
+
+    backward_gap = (backward["date"] - backward["sample_date"]).abs()
+    forward_gap = (forward["sample_date"] - forward["date"]).abs()
+    use_forward = backward["sample_date"].isna() | (forward_gap < backward_gap)
+    merged = backward.copy()
+    merged.loc[use_forward] = forward.loc[use_forward]
+
+    merged["offset_hours"] = (merged["sample_date"] - merged["date"]) / pd.Timedelta(hours=1)
+    merged = merged.set_index("index").sort_index()
+    return merged.drop(columns=["date", "sample_date"]).reset_index(drop=True)
+
+
+def load_mrv_inputs(
+    session: Session,
+    plant_id: str,
+    start_date: date = None,
+    end_date: date = None,
+    params: MRVParameters = DEFAULT_PARAMETERS,
+) -> pd.DataFrame:
+    """
+    Load ops flow and calcium readings for a whole date range in two queries
+
+    For each ops date the upstream/downstream calcium value is picked with the
+    parameter set's replicate rule ("first" matches the per-day lookups) and
+    aligned with its calcium_match mode.
+
+    Returns:
+        DataFrame with one row per ops date, sorted by date
+    """
+    import pandas as pd
+
+    ops = load_ops_frame(session, plant_id, start_date, end_date)
+    ca_start, ca_end = calcium_load_range([params], start_date, end_date)
+    ca = load_calcium_frame(session, plant_id, [params.upstream_unit, params.downstream_unit], ca_start, ca_end)
+
+    inputs = ops[["date", "has_ops"]].assign(flow_mgd=ops[params.flow_column])
+    for position, unit in (("upstream", params.upstream_unit), ("downstream", params.downstream_unit)):
+        aligned = align_calcium_to_ops(
+            inputs["date"],
+            daily_calcium_values(ca, unit, params.replicate_rule),
+            params.calcium_match,
+            params.asof_tolerance_hours,
+        ).rename(
+            columns={
+                "value": f"ca_{position}_mg_per_l",
+                "uncertainty": f"ca_{position}_uncertainty",
+                "replicate_uncertainty": f"ca_{position}_replicate_uncertainty",
+                "offset_hours": f"ca_{position}_offset_hours",
+            }
+        )
+        inputs = pd.concat([inputs.reset_index(drop=True), aligned], axis=1)
+
+    return inputs
+
+
+def sample_co2_removal(
+    ca_upstream,
+    ca_upstream_sigma,
+    ca_downstream,
+    ca_downstream_sigma,
+    flow_mgd,
+    flow_rel_sigma: float = 0.0,
+    n_draws: int = 10_000,
+    rng: np.random.Generator | int | None = None,
+    params: MRVParameters = DEFAULT_PARAMETERS,
+) -> np.ndarray:
+    """
+    Draw Monte Carlo samples of daily CO2 removal for many days at once
+
+    Calcium concentrations are sampled from normal distributions around the
+    measured values; flow is optionally scaled by a normal factor around 1.
+    All days and draws go through the stoichiometry as one batched operation.
+
+    Returns:
+        Array of shape (days, n_draws) in MT/day
+    """
+    rng = np.random.default_rng(rng)
+    shape = (len(ca_upstream), n_draws)
+
+    up = rng.normal(np.asarray(ca_upstream, dtype=float)[:, None], np.asarray(ca_upstream_sigma, dtype=float)[:, None], size=shape)
+    down = rng.normal(np.asarray(ca_downstream, dtype=float)[:, None], np.asarray(ca_downstream_sigma, dtype=float)[:, None], size=shape)
+
+    flow = np.asarray(flow_mgd, dtype=float)[:, None]
+    if flow_rel_sigma:
+        flow = flow * rng.normal(1.0, flow_rel_sigma, size=shape)
+
+    draws = co2_stoichiometry(up, down, flow, **params.stoichiometry_parameters())
+    return draws["co2_removed_metric_tons_per_day"]
+
+
+def summarize_draws(draws: np.ndarray, axis: int = -1) -> dict:
+    """Mean, std and P5/P95 of Monte Carlo draws along an axis"""
+    p5, p95 = np.percentile(draws, [5, 95], axis=axis)
+    return {
+        "mean": draws.mean(axis=axis),
+        "std": draws.std(axis=axis, ddof=1),
+        "p5": p5,
+        "p95": p95,
+    }
+
+
+def calculate_co2_removal_uncertainty(
+    session: Session,
+    plant_id: str,
+    start_date: date = None,
+    end_date: date = None,
+    n_draws: int = 10_000,
+    flow_rel_sigma: float = 0.0,
+    default_ca_rel_sigma: float = 0.01,
+    seed: int | None = None,
+    chunk_days: int = 365,
+    params: MRVParameters = DEFAULT_PARAMETERS,
+) -> tuple[list[CO2RemovalUncertainty], CO2RemovalUncertaintyPeriod | None]:
+    """
+    Propagate calcium (and optionally flow) uncertainty to CO2 removal
+
+    Each calcium reading is sampled with its own `uncertainty`; readings without
+    one fall back to the largest uncertainty among the day's replicates, then to
+    `default_ca_rel_sigma` times the value. Days are processed in chunks of
+    `chunk_days` so memory stays bounded at chunk_days x n_draws floats.
+
+    Args:
+        session: SQLAlchemy session
+        plant_id: Plant identifier (string like 'PLANT_A')
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        n_draws: Monte Carlo draws per day
+        flow_rel_sigma: Relative std dev of flow (0 keeps flow fixed)
+        default_ca_rel_sigma: Relative std dev for readings with no uncertainty
+        seed: Seed for reproducible draws
+        chunk_days: Days sampled per batch
+        params: Parameter set used for inputs and stoichiometry
+
+    Returns:
+        Tuple of (per-day records, period total record or None if no VALID days)
+    """
+    if n_draws < 2:
+        raise ValueError("n_draws must be at least 2")
+
+    inputs = load_mrv_inputs(session, plant_id, start_date, end_date, params)
+    should_calculate, quality_flags = classify_inputs(
+        inputs["has_ops"],
+        inputs["flow_mgd"],
+        inputs["ca_upstream_mg_per_l"],
+        inputs["ca_downstream_mg_per_l"],
+    )
+    events = ValidationEventCollector(calculation_version=params.calculation_version)
+    record_classified_events(
+        events,
+        plant_id,
+        inputs["date"].to_numpy(),
+        quality_flags,
+        inputs["flow_mgd"].to_numpy(),
+        inputs["ca_upstream_mg_per_l"].to_numpy(),
+        inputs["ca_downstream_mg_per_l"].to_numpy(),
+    )
+    inputs = inputs.assign(quality_flag=quality_flags)[should_calculate].reset_index(drop=True)
+
+    logger.info(f"Sampling {len(inputs)} dates x {n_draws} draws for {plant_id}")
+
+    # Rerunning a range replaces its previous summaries instead of double counting them
+    delete_existing_uncertainty(session, plant_id, [params.calculation_version], start_date, end_date)
+
+    sigmas = {}
+    for position in ("upstream", "downstream"):
+        sigmas[position] = (
+            inputs[f"ca_{position}_uncertainty"]
+            .fillna(inputs[f"ca_{position}_replicate_uncertainty"])
+            .fillna(inputs[f"ca_{position}_mg_per_l"].abs() * default_ca_rel_sigma)
+            .to_numpy(dtype=float)
+        )
+
+    rng = np.random.default_rng(seed)
+    valid = (inputs["quality_flag"] == "VALID").to_numpy()
+    period_draws = np.zeros(n_draws)
+    records = []
+
+    for start in range(0, len(inputs), chunk_days):
+        chunk = slice(start, start + chunk_days)
+        draws = sample_co2_removal(
+            inputs["ca_upstream_mg_per_l"].to_numpy()[chunk],
+            sigmas["upstream"][chunk],
+            inputs["ca_downstream_mg_per_l"].to_numpy()[chunk],
+            sigmas["downstream"][chunk],
+            inputs["flow_mgd"].to_numpy()[chunk],
+            flow_rel_sigma=flow_rel_sigma,
+            n_draws=n_draws,
+            rng=rng,
+            params=params,
+        )
+        stats = summarize_draws(draws, axis=1)
+        period_draws += draws[valid[chunk]].sum(axis=0)
+
+        for i, row in enumerate(inputs.iloc[chunk].itertuples(index=False)):
+            records.append(
+                CO2RemovalUncertainty(
+                    plant_id=plant_id,
+                    date=row.date,
+                    n_draws=n_draws,
+                    ca_upstream_sigma_mg_per_l=float(sigmas["upstream"][start + i]),
+                    ca_downstream_sigma_mg_per_l=float(sigmas["downstream"][start + i]),
+                    flow_rel_sigma=flow_rel_sigma,
+                    co2_mean_metric_tons_per_day=float(stats["mean"][i]),
+                    co2_std_metric_tons_per_day=float(stats["std"][i]),
+                    co2_p5_metric_tons_per_day=float(stats["p5"][i]),
+                    co2_p95_metric_tons_per_day=float(stats["p95"][i]),
+                    calculation_version=params.calculation_version,
+                    quality_flag=row.quality_flag,
+                )
+            )
+
+    period = None
+    if valid.any():
+        totals = summarize_draws(period_draws)
+        period = CO2RemovalUncertaintyPeriod(
+            plant_id=plant_id,
+            period_start=start_date or inputs["date"].min(),
+            period_end=end_date or inputs["date"].max(),
+            n_days=int(valid.sum()),
+            n_draws=n_draws,
+            co2_mean_metric_tons=float(totals["mean"]),
+            co2_std_metric_tons=float(totals["std"]),
+            co2_p5_metric_tons=float(totals["p5"]),
+            co2_p95_metric_tons=float(totals["p95"]),
+            calculation_version=params.calculation_version,
+        )
+        session.add(period)
+        logger.info(
+            f"{plant_id} period total (VALID only): {period.co2_mean_metric_tons:.2f} MT "
+            f"[P5 {period.co2_p5_metric_tons:.2f}, P95 {period.co2_p95_metric_tons:.2f}]"
+        )
+
+    session.add_all(records)
+    events.log_summary(logger)
+    events.flush(session)
+    session.commit()
+
+    return records, period
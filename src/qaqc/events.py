@@ -0,0 +1,93 @@
+"""
+Aggregated validation events
+
+Validation checks report failures to a ValidationEventCollector instead of
+logging each plant-day. The collector counts events by flag and plant, keeps
+the first few exemplars for the console summary, and writes the full detail
+to crewcarbon_qa_event in one bulk insert.
+"""
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from src.models.schemas import QAEvent
+
+MAX_EXEMPLARS = 3
+
+
+@dataclass
+class ValidationEventCollector:
+    """Collects validation events for one run and reports them once"""
+
+    calculation_version: Optional[str] = None
+    max_exemplars: int = MAX_EXEMPLARS
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    counts: Counter = field(default_factory=Counter)
+    exemplars: dict = field(default_factory=dict)
+    events: list = field(default_factory=list)
+
+    def record(
+        self,
+        check_name: str,
+        plant_id: str,
+        calc_date: date,
+        quality_flag: str,
+        message: str = None,
+        severity: str = "warning",
+    ) -> None:
+        """
+        Record one finding
+
+        Args:
+            check_name: Validation step, e.g. 'validate_ops_data'
+            plant_id: Plant identifier
+            calc_date: Plant-day the finding applies to
+            quality_flag: Flag assigned by the check
+            message: Detail for the QA events table
+            severity: 'warning' (still calculated) or 'error' (skipped)
+        """
+        self.counts[(quality_flag, plant_id)] += 1
+        examples = self.exemplars.setdefault(quality_flag, [])
+        if len(examples) < self.max_exemplars:
+            examples.append(f"{plant_id} {calc_date}: {message}")
+        self.events.append(
+            {
+                "run_id": self.run_id,
+                "plant_id": plant_id,
+                "date": calc_date,
+                "check_name": check_name,
+                "quality_flag": quality_flag,
+                "severity": severity,
+                "message": message[:500] if message else None,
+                "calculation_version": self.calculation_version,
+            }
+        )
+
+    def log_summary(self, logger) -> None:
+        """One warning per flag and plant, followed by its first exemplars"""
+        if not self.counts:
+            logger.info("✓ No validation events")
+            return
+        for (quality_flag, plant_id), count in sorted(self.counts.items()):
+            logger.warning(f"⚠ {quality_flag}: {count} plant-days for {plant_id}")
+        for quality_flag, examples in sorted(self.exemplars.items()):
+            for example in examples:
+                logger.warning(f"  └─ e.g. {example}")
+        logger.info(f"Full detail: {sum(self.counts.values())} events in {QAEvent.__tablename__} (run_id={self.run_id})")
+
+    def flush(self, session: Session) -> int:
+        """
+        Bulk insert the recorded events (caller commits)
+
+        Returns:
+            Number of events written
+        """
+        written = len(self.events)
+        if written:
+            session.bulk_insert_mappings(QAEvent, self.events)
+        self.events = []
+        return written
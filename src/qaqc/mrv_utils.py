@@ -5,6 +5,8 @@ from typing import Tuple, Optional
 from dataclasses import dataclass
 from datetime import date
 
+import numpy as np
+
 
 @dataclass
 class ValidationResult:
@@ -18,29 +20,43 @@ def validate_ops_data(
     ops,  # WasteWaterPlantOperation or None
     plant_id: str,
     calc_date: date,
-    logger
+    logger,
+    flow_column: str = "actual_eff_flow_mgd",
+    events=None,
 ) -> ValidationResult:
     """
     Validate operational data exists and has valid flow
+
+    Failures are logged per plant-day, or recorded to `events`
+    (a ValidationEventCollector) when one is given.
     
     Returns:
         ValidationResult with validity status and quality flag
     """
     if not ops:
-        logger.warning(f"✗ No ops data found for {plant_id} on {calc_date}")
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=False,
             quality_flag="NO_OPS_DATA",
             message="No operational data found"
         )
+        if events is not None:
+            events.record("validate_ops_data", plant_id, calc_date, result.quality_flag, result.message, "error")
+        else:
+            logger.warning(f"✗ No ops data found for {plant_id} on {calc_date}")
+        return result
     
-    if ops.actual_eff_flow_mgd is None or ops.actual_eff_flow_mgd <= 0:
-        logger.warning(f"✗ Missing or invalid flow data for {plant_id} on {calc_date}")
-        return ValidationResult(
+    flow_mgd = getattr(ops, flow_column)
+    if flow_mgd is None or flow_mgd <= 0:
+        result = ValidationResult(
             is_valid=False,
             quality_flag="INVALID_FLOW",
-            message=f"Flow data invalid: {ops.actual_eff_flow_mgd}"
+            message=f"Flow data invalid: {flow_mgd}"
         )
+        if events is not None:
+            events.record("validate_ops_data", plant_id, calc_date, result.quality_flag, result.message, "error")
+        else:
+            logger.warning(f"✗ Missing or invalid flow data for {plant_id} on {calc_date}")
+        return result
     
     return ValidationResult(is_valid=True, quality_flag="VALID")
 
@@ -50,7 +66,8 @@ def validate_calcium_readings(
     ca_downstream_reading,  # CrewCarbonLabReading or None
     plant_id: str,
     calc_date: date,
-    logger
+    logger,
+    events=None,
 ) -> ValidationResult:
     """
     Validate calcium readings exist
@@ -65,14 +82,16 @@ def validate_calcium_readings(
         if not ca_downstream_reading:
             missing.append("downstream")
         
-        logger.warning(
-            f"✗ Missing calcium readings ({', '.join(missing)}) for {plant_id} on {calc_date}"
-        )
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=False,
             quality_flag="MISSING_CA_READINGS",
             message=f"Missing {', '.join(missing)} calcium readings"
         )
+        if events is not None:
+            events.record("validate_calcium_readings", plant_id, calc_date, result.quality_flag, result.message, "error")
+        else:
+            logger.warning(f"✗ Missing calcium readings ({', '.join(missing)}) for {plant_id} on {calc_date}")
+        return result
     
     return ValidationResult(is_valid=True, quality_flag="VALID")
 
@@ -82,7 +101,8 @@ def validate_ca_delta(
     ca_downstream: float,
     plant_id: str,
     calc_date: date,
-    logger
+    logger,
+    events=None,
 ) -> ValidationResult:
     """
     Validate calcium delta is positive
@@ -93,15 +113,19 @@ def validate_ca_delta(
     ca_delta = ca_downstream - ca_upstream
     
     if ca_delta <= 0:
-        logger.warning(
-            f"⚠ Non-positive ca_delta ({ca_delta:.4f}) for {plant_id} on {calc_date} - "
-            f"upstream: {ca_upstream}, downstream: {ca_downstream}"
-        )
-        return ValidationResult(
+        result = ValidationResult(
             is_valid=True,  # Still calculate, but flag it
             quality_flag="INVALID",
             message=f"Non-positive ca_delta: {ca_delta:.4f}"
         )
+        if events is not None:
+            events.record("validate_ca_delta", plant_id, calc_date, result.quality_flag, result.message, "warning")
+        else:
+            logger.warning(
+                f"⚠ Non-positive ca_delta ({ca_delta:.4f}) for {plant_id} on {calc_date} - "
+                f"upstream: {ca_upstream}, downstream: {ca_downstream}"
+            )
+        return result
     
     return ValidationResult(is_valid=True, quality_flag="VALID")
 
@@ -112,7 +136,9 @@ def validate_all_inputs(
     ca_downstream_reading,  # CrewCarbonLabReading or None
     plant_id: str,
     calc_date: date,
-    logger
+    logger,
+    flow_column: str = "actual_eff_flow_mgd",
+    events=None,
 ) -> Tuple[bool, str, Optional[str]]:
     """
     Run all validation checks
@@ -124,7 +150,7 @@ def validate_all_inputs(
         - message: Optional validation message
     """
     # Validate ops data
-    ops_result = validate_ops_data(ops, plant_id, calc_date, logger)
+    ops_result = validate_ops_data(ops, plant_id, calc_date, logger, flow_column, events)
     if not ops_result.is_valid:
         return False, ops_result.quality_flag, ops_result.message
     
@@ -134,7 +160,8 @@ def validate_all_inputs(
         ca_downstream_reading,
         plant_id,
         calc_date,
-        logger
+        logger,
+        events,
     )
     if not ca_result.is_valid:
         return False, ca_result.quality_flag, ca_result.message
@@ -145,8 +172,93 @@ def validate_all_inputs(
         ca_downstream_reading.value,
         plant_id,
         calc_date,
-        logger
+        logger,
+        events,
     )
     
     # Return True to calculate, but with appropriate quality flag
     return True, ca_delta_result.quality_flag, ca_delta_result.message
+
+
+def classify_inputs(
+    has_ops,
+    flow_mgd,
+    ca_upstream,
+    ca_downstream,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized counterpart of validate_all_inputs for many plant-days at once
+
+    Applies the same checks in the same order, with missing values passed as NaN
+
+    Returns:
+        Tuple of (should_calculate, quality_flag) arrays
+    """
+    has_ops = np.asarray(has_ops, dtype=bool)
+    flow_mgd = np.asarray(flow_mgd, dtype=float)
+    ca_upstream = np.asarray(ca_upstream, dtype=float)
+    ca_downstream = np.asarray(ca_downstream, dtype=float)
+
+    no_ops = ~has_ops
+    invalid_flow = ~no_ops & ~(flow_mgd > 0)
+    missing_ca = ~no_ops & ~invalid_flow & (np.isnan(ca_upstream) | np.isnan(ca_downstream))
+    should_calculate = ~(no_ops | invalid_flow | missing_ca)
+
+    with np.errstate(invalid="ignore"):
+        non_positive_delta = should_calculate & ((ca_downstream - ca_upstream) <= 0)
+
+    quality_flag = np.select(
+        [no_ops, invalid_flow, missing_ca, non_positive_delta],
+        ["NO_OPS_DATA", "INVALID_FLOW", "MISSING_CA_READINGS", "INVALID"],
+        default="VALID",
+    )
+    return should_calculate, quality_flag
+
+
+# quality flag -> (check that assigns it in validate_all_inputs, event severity)
+FLAG_CHECKS = {
+    "NO_OPS_DATA": ("validate_ops_data", "error"),
+    "INVALID_FLOW": ("validate_ops_data", "error"),
+    "MISSING_CA_READINGS": ("validate_calcium_readings", "error"),
+    "INVALID": ("validate_ca_delta", "warning"),
+}
+
+
+def record_classified_events(
+    events,
+    plant_id: str,
+    dates,
+    quality_flag,
+    flow_mgd,
+    ca_upstream,
+    ca_downstream,
+) -> int:
+    """
+    Record the findings of classify_inputs to a ValidationEventCollector
+
+    Produces the same check names, severities and messages as the per-day
+    validate_* functions, so QA events look alike whichever path ran.
+
+    Returns:
+        Number of events recorded
+    """
+    quality_flag = np.asarray(quality_flag)
+    flow_mgd = np.asarray(flow_mgd, dtype=float)
+    ca_upstream = np.asarray(ca_upstream, dtype=float)
+    ca_downstream = np.asarray(ca_downstream, dtype=float)
+
+    flagged = np.flatnonzero(quality_flag != "VALID")
+    for i in flagged:
+        flag = str(quality_flag[i])
+        if flag == "NO_OPS_DATA":
+            message = "No operational data found"
+        elif flag == "INVALID_FLOW":
+            message = f"Flow data invalid: {None if np.isnan(flow_mgd[i]) else flow_mgd[i]}"
+        elif flag == "MISSING_CA_READINGS":
+            missing = [name for name, value in (("upstream", ca_upstream[i]), ("downstream", ca_downstream[i])) if np.isnan(value)]
+            message = f"Missing {', '.join(missing)} calcium readings"
+        else:
+            message = f"Non-positive ca_delta: {ca_downstream[i] - ca_upstream[i]:.4f}"
+        check_name, severity = FLAG_CHECKS[flag]
+        events.record(check_name, plant_id, dates[i], flag, message, severity)
+    return len(flagged)
@@ -1,11 +1,22 @@
 # src/utils/logging_config.py
 """
 Logging configuration for the application
-Provides colored console output only
+Provides colored console output (when attached to a TTY), plain text or JSON lines.
+
+By default records are handed to a queue and written by a single background
+listener thread, so logging I/O never blocks the calling code (LOG_QUEUE=0 to
+write synchronously). LOG_FORMAT selects 'auto' (color on a TTY, plain
+otherwise), 'color', 'plain' or 'json'.
 """
+import atexit
+import copy
+import json
 import logging
-import sys
+import logging.handlers
 import os
+import queue
+import sys
+import threading
 from typing import Optional
 
 
@@ -37,19 +48,104 @@ class ColoredFormatter(logging.Formatter):
         logging.ERROR: f"{LogColors.TIME}%(asctime)s{LogColors.RESET} | {LogColors.ERROR}ERROR{LogColors.RESET}    | {LogColors.NAME}%(name)s{LogColors.RESET} | %(message)s",
         logging.CRITICAL: f"{LogColors.TIME}%(asctime)s{LogColors.RESET} | {LogColors.CRITICAL}CRITICAL{LogColors.RESET} | {LogColors.NAME}%(name)s{LogColors.RESET} | %(message)s",
     }
+    PLAIN_FORMAT = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
+    
+    def __init__(self, use_color: bool = True):
+        super().__init__()
+        # Build one formatter per level up front instead of one per record
+        self._formatters = {
+            level: logging.Formatter(fmt if use_color else self.PLAIN_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+            for level, fmt in self.FORMATS.items()
+        }
+        self._default = logging.Formatter(self.PLAIN_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+    
+    def format(self, record):
+        return self._formatters.get(record.levelno, self._default).format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line for machine parsing"""
     
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(
-            log_fmt,
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        return formatter.format(record)
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Records from the queue carry the traceback already formatted
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that keeps the exception out of the message
+
+    The stock prepare() formats the traceback into msg and clears exc_info and
+    exc_text, so the listener's formatter can't emit it as its own field. Here
+    only the message arguments are merged and the traceback travels as exc_text.
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Traceback objects hold frames alive; their text is all the formatters need
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    """Formatter for LOG_FORMAT ('auto', 'color', 'plain' or 'json')"""
+    if log_format == 'json':
+        return JsonFormatter()
+    if log_format == 'auto':
+        return ColoredFormatter(use_color=sys.stdout.isatty())
+    return ColoredFormatter(use_color=(log_format == 'color'))
+
+
+# One output handler shared by every logger in the process
+_output_handler: Optional[logging.Handler] = None
+_output_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _get_output_handler() -> logging.Handler:
+    """
+    Process-wide handler that all loggers share
+
+    In queue mode loggers only enqueue records; a QueueListener thread owns the
+    stdout handler and does the formatting and writing.
+    """
+    global _output_handler, _listener
+    with _output_lock:
+        if _output_handler is not None:
+            return _output_handler
+    
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(_build_formatter(os.getenv('LOG_FORMAT', 'auto').lower()))
+    
+        if os.getenv('LOG_QUEUE', '1') == '1':
+            log_queue = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+            _listener.start()
+            # Drain queued records before the interpreter exits
+            atexit.register(_listener.stop)
+            _output_handler = StructuredQueueHandler(log_queue)
+        else:
+            _output_handler = stream_handler
+        return _output_handler
 
 
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
-    Setup and configure a logger with colored console output
+    Setup and configure a logger writing to the shared console handler
     
     Args:
         name: Logger name (typically __name__ from calling module)
@@ -78,11 +174,8 @@ def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     # Remove existing handlers to avoid duplicates
     logger.handlers.clear()
     
-    # Console handler with colors
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(ColoredFormatter())
-    logger.addHandler(console_handler)
+    # Shared console handler (queued unless LOG_QUEUE=0); the logger's level does the filtering
+    logger.addHandler(_get_output_handler())
     
     # Prevent propagation to root logger
     logger.propagate = False
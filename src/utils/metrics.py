@@ -0,0 +1,303 @@
+# src/utils/metrics.py
+"""
+Lightweight pipeline instrumentation
+
+Stages are timed with the `stage` context manager or the `timed_stage`
+decorator; each records duration, rows in/out, rows/sec and the process peak
+RSS. Stages and counters are collected on the active `pipeline_run`, which on
+exit writes one row per stage to `pipeline_run_metrics` and a Prometheus
+textfile (node_exporter textfile collector format).
+
+    with pipeline_run("data_pipeline", engine=engine):
+        with stage("write_calcium", rows_in=len(df)) as s:
+            df.to_sql(...)
+            s.rows_out = len(df)
+"""
+import functools
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Optional
+
+from src.utils.logging_config import setup_logger
+from src.utils.profiling import PROFILE, PROFILE_STAGES, profile_block, stage_profile
+
+logger = setup_logger(__name__)
+
+# node_exporter --collector.textfile.directory; written after every run
+METRICS_TEXTFILE_DIR = os.getenv("METRICS_TEXTFILE_DIR", "data/output/metrics")
+# Attach the SQL profiler to the run's engine. Opt-in like PROFILE (SQL_PROFILE=1): it is cheap enough
+# for production runs, but its per-run statement report is diagnostic output nightly logs don't need
+SQL_PROFILE = os.getenv("SQL_PROFILE", "0") == "1"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MiB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class StageStats:
+    """Measurements of one stage; set rows_in/rows_out inside the stage when known"""
+
+    stage: str
+    started_at: datetime = field(default_factory=datetime.now)
+    duration_seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+
+
+@dataclass
+class PipelineRun:
+    """Stages and counters collected during one run of an entry point"""
+
+    pipeline: str
+    run_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    started_at: datetime = field(default_factory=datetime.now)
+    stages: list = field(default_factory=list)
+    counters: dict = field(default_factory=dict)
+
+
+_active_run: Optional[PipelineRun] = None
+# Names of the stages currently executing, innermost last
+_stage_stack: list = []
+
+
+def current_stage() -> Optional[str]:
+    """Innermost running stage, e.g. for attributing SQL statements (None outside stages)"""
+    return _stage_stack[-1] if _stage_stack else None
+
+
+def increment(name: str, value: int = 1) -> None:
+    """Add to a counter of the active run (no-op outside a run)"""
+    if _active_run is not None:
+        _active_run.counters[name] = _active_run.counters.get(name, 0) + value
+
+
+@contextmanager
+def stage(name: str, rows_in: int = None):
+    """
+    Time a block of pipeline work
+
+    Args:
+        name: Stage name (repeated stages are summed in the textfile)
+        rows_in: Rows entering the stage, if known up front
+
+    Yields:
+        StageStats whose rows_in/rows_out may be set inside the block
+    """
+    stats = StageStats(stage=name, rows_in=rows_in)
+    _stage_stack.append(name)
+    start = time.perf_counter()
+    try:
+        with stage_profile(name):
+            yield stats
+    finally:
+        _stage_stack.pop()
+        stats.duration_seconds = time.perf_counter() - start
+        rows = stats.rows_out if stats.rows_out is not None else stats.rows_in
+        if rows is not None and stats.duration_seconds > 0:
+            stats.rows_per_second = rows / stats.duration_seconds
+        stats.peak_rss_mb = peak_rss_mb()
+        if _active_run is not None:
+            _active_run.stages.append(stats)
+
+        throughput = f", {stats.rows_per_second:,.0f} rows/s" if stats.rows_per_second else ""
+        rows_out = f", {stats.rows_out} rows out" if stats.rows_out is not None else ""
+        logger.info(f"⏱ {name}: {stats.duration_seconds:.2f}s{rows_out}{throughput}")
+
+
+def _is_frame(value) -> bool:
+    """True for a pandas DataFrame, without importing pandas in processes that never load it"""
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(value, pd.DataFrame)
+
+
+def _row_count(value) -> Optional[int]:
+    """Rows in a DataFrame/list result, or in the first element of a tuple result"""
+    if isinstance(value, tuple) and value:
+        value = value[0]
+    if isinstance(value, list) or _is_frame(value):
+        return len(value)
+    return None
+
+
+def timed_stage(name: str = None):
+    """
+    Decorator running a function as a stage
+
+    Rows in are taken from a DataFrame first argument (or `df=`), rows out
+    from a DataFrame/list result or the first element of a tuple result.
+    """
+
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            source = kwargs.get("df", args[0] if args else None)
+            rows_in = len(source) if _is_frame(source) else None
+            with stage(stage_name, rows_in=rows_in) as stats:
+                result = func(*args, **kwargs)
+                stats.rows_out = _row_count(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def write_run_metrics(conn, run: PipelineRun, total: StageStats) -> int:
+    """
+    Insert one row per stage plus the run total (caller commits)
+
+    Returns:
+        Number of rows written
+    """
+    from src.models.schemas import PipelineRunMetric
+
+    rows = [
+        {**asdict(stats), "run_id": run.run_id, "pipeline": run.pipeline, "counters": None}
+        for stats in run.stages
+    ]
+    rows.append({**asdict(total), "run_id": run.run_id, "pipeline": run.pipeline, "counters": run.counters})
+    conn.execute(PipelineRunMetric.__table__.insert(), rows)
+    return len(rows)
+
+
+def _labels(**labels) -> str:
+    """Prometheus label set, with backslashes and quotes escaped"""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _combine_stages(stages: list) -> list:
+    """Merge repeated stages (e.g. one call per plant) so every label set appears once"""
+    combined = {}
+    for stats in stages:
+        if stats.stage not in combined:
+            combined[stats.stage] = StageStats(**asdict(stats))
+            continue
+        merged = combined[stats.stage]
+        merged.duration_seconds += stats.duration_seconds
+        for attr in ("rows_in", "rows_out"):
+            if getattr(stats, attr) is not None:
+                setattr(merged, attr, (getattr(merged, attr) or 0) + getattr(stats, attr))
+        merged.peak_rss_mb = max(filter(None, [merged.peak_rss_mb, stats.peak_rss_mb]), default=None)
+        rows = merged.rows_out if merged.rows_out is not None else merged.rows_in
+        merged.rows_per_second = rows / merged.duration_seconds if rows is not None and merged.duration_seconds > 0 else None
+    return list(combined.values())
+
+
+def format_prometheus(run: PipelineRun, total: StageStats) -> str:
+    """Prometheus text exposition of the run's stages (repeated stages summed) and counters"""
+    metrics = [
+        ("crewcarbon_stage_duration_seconds", "gauge", "Wall time of the stage", "duration_seconds"),
+        ("crewcarbon_stage_rows_in", "gauge", "Rows entering the stage", "rows_in"),
+        ("crewcarbon_stage_rows_out", "gauge", "Rows produced by the stage", "rows_out"),
+        ("crewcarbon_stage_rows_per_second", "gauge", "Stage throughput", "rows_per_second"),
+        ("crewcarbon_stage_peak_rss_bytes", "gauge", "Process peak RSS when the stage finished", "peak_rss_mb"),
+    ]
+    lines = []
+    for metric, metric_type, help_text, attr in metrics:
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {metric_type}"]
+        for stats in [*_combine_stages(run.stages), total]:
+            value = getattr(stats, attr)
+            if value is None:
+                continue
+            if attr == "peak_rss_mb":
+                value = value * 1024 * 1024
+            lines.append(f"{metric}{_labels(pipeline=run.pipeline, stage=stats.stage)} {value:g}")
+
+    lines += ["# HELP crewcarbon_run_counter Counters of the last run", "# TYPE crewcarbon_run_counter gauge"]
+    for counter, value in sorted(run.counters.items()):
+        lines.append(f"crewcarbon_run_counter{_labels(pipeline=run.pipeline, name=counter)} {value:g}")
+
+    lines += [
+        "# HELP crewcarbon_run_last_completed_timestamp_seconds End of the last run",
+        "# TYPE crewcarbon_run_last_completed_timestamp_seconds gauge",
+        f"crewcarbon_run_last_completed_timestamp_seconds{_labels(pipeline=run.pipeline)} {time.time():.0f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(run: PipelineRun, total: StageStats, directory: str = METRICS_TEXTFILE_DIR) -> str:
+    """Write <pipeline>.prom atomically (write then rename) so scrapers never read a partial file"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{run.pipeline}.prom")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(format_prometheus(run, total))
+    os.replace(tmp_path, path)
+    return path
+
+
+@contextmanager
+def pipeline_run(
+    pipeline: str,
+    engine=None,
+    textfile_dir: str = METRICS_TEXTFILE_DIR,
+    profile_sql: bool = SQL_PROFILE,
+    profile: str = PROFILE,
+):
+    """
+    Collect stages and counters for one run and export them on success
+
+    Args:
+        pipeline: Entry point name, used as the `pipeline` label
+        engine: SQLAlchemy engine for pipeline_run_metrics (skipped if None)
+        textfile_dir: Directory for the Prometheus textfile (skipped if None)
+        profile_sql: Profile the statements run through `engine` (see src/utils/sql_profiler.py)
+        profile: CPU/memory profile modes for the whole run (see src/utils/profiling.py);
+            ignored when PROFILE_STAGES narrows profiling to single stages
+
+    Yields:
+        The PipelineRun being collected
+    """
+    from src.utils.sql_profiler import SQLProfiler
+
+    global _active_run
+    run = PipelineRun(pipeline=pipeline)
+    profiler = SQLProfiler().attach(engine) if engine is not None and profile_sql else None
+    previous, _active_run = _active_run, run
+    try:
+        with profile_block(pipeline, "" if PROFILE_STAGES else profile), stage("total") as total:
+            yield run
+    finally:
+        _active_run = previous
+        if profiler is not None:
+            profiler.detach()
+            profiler.log_report()
+
+    # The "total" stage was recorded on the run; keep it separate for export
+    run.stages.remove(total)
+    logger.info(f"✓ {pipeline} run {run.run_id}: {len(run.stages)} stages in {total.duration_seconds:.2f}s, peak RSS {total.peak_rss_mb or 0:.0f} MiB")
+
+    # Metrics must never fail the pipeline they describe
+    if engine is not None:
+        try:
+            with engine.begin() as conn:
+                write_run_metrics(conn, run, total)
+        except Exception as e:
+            logger.warning(f"⚠ Could not write pipeline_run_metrics: {e}")
+    if textfile_dir:
+        try:
+            path = write_prometheus_textfile(run, total, textfile_dir)
+            logger.info(f"✓ Wrote metrics to {path}")
+        except OSError as e:
+            logger.warning(f"⚠ Could not write Prometheus textfile: {e}")
@@ -0,0 +1,171 @@
+# src/utils/profiling.py
+"""
+On-demand CPU and memory profiling for pipeline runs
+
+Enabled per run without code changes:
+
+    PROFILE=cpu,mem python src/ingest/run_mrv_pipeline.py
+    python src/ingest/run_mrv_pipeline.py --profile all
+    PROFILE=mem PROFILE_STAGES=bulk_calculate_co2_removal python src/ingest/run_mrv_pipeline.py
+
+`cpu` samples the run with pyinstrument (speedscope JSON + text call tree) when
+it is installed, otherwise profiles with cProfile (pstats file + top functions).
+`mem` traces allocations with tracemalloc and writes a top-allocators report
+plus the raw snapshot. With PROFILE_STAGES only the named stages (the names in
+the pipeline logs, see src/utils/metrics.py) are profiled instead of the whole
+run. Output goes to PROFILE_DIR (default data/output/profiles).
+"""
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.utils.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+PROFILE_MODES = ("cpu", "mem")
+PROFILE = os.getenv("PROFILE", "")
+PROFILE_STAGES = frozenset(filter(None, os.getenv("PROFILE_STAGES", "").split(",")))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/output/profiles")
+
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATORS = 25
+TOP_FUNCTIONS = 40
+SAMPLING_INTERVAL_SECONDS = 0.001
+
+# Only one CPU profiler can be installed per thread
+_cpu_active = False
+# Distinguishes repeated stages (e.g. one per plant) profiled within the same second
+_sequence = itertools.count(1)
+
+
+def parse_profile_modes(value: str) -> frozenset:
+    """
+    Parse a PROFILE / --profile value
+
+    Args:
+        value: Comma separated modes ('cpu', 'mem'), 'all', or empty for none
+
+    Returns:
+        Set of modes
+    """
+    value = (value or "").strip().lower()
+    if value in ("", "0", "none"):
+        return frozenset()
+    if value in ("1", "all"):
+        return frozenset(PROFILE_MODES)
+    modes = frozenset(mode.strip() for mode in value.split(","))
+    unknown = modes - set(PROFILE_MODES)
+    if unknown:
+        raise ValueError(f"Unknown profile modes {sorted(unknown)}; expected any of {PROFILE_MODES} or 'all'")
+    return modes
+
+
+def _start_cpu_profiler():
+    """Sampling profiler when pyinstrument is installed, deterministic cProfile otherwise"""
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    profiler = Profiler(interval=SAMPLING_INTERVAL_SECONDS)
+    profiler.start()
+    return profiler
+
+
+def _write_cpu_profile(profiler, base_path: str) -> list[str]:
+    """Stop the profiler and write its output files"""
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        profiler.dump_stats(f"{base_path}.pstats")
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        with open(f"{base_path}.cpu.txt", "w") as f:
+            f.write(report.getvalue())
+        return [f"{base_path}.pstats", f"{base_path}.cpu.txt"]
+
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    profiler.stop()
+    with open(f"{base_path}.speedscope.json", "w") as f:
+        f.write(profiler.output(renderer=SpeedscopeRenderer()))
+    with open(f"{base_path}.cpu.txt", "w") as f:
+        f.write(profiler.output_text(unicode=True, color=False))
+    return [f"{base_path}.speedscope.json", f"{base_path}.cpu.txt"]
+
+
+def _write_memory_profile(start: tracemalloc.Snapshot, base_path: str) -> list[str]:
+    """Top allocators since `start`, plus the raw end snapshot for later comparison"""
+    # Leave out the profilers' own bookkeeping
+    excluded = [tracemalloc.__file__, cProfile.__file__, pstats.__file__, __file__, "<frozen importlib._bootstrap*>"]
+    end = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, pattern) for pattern in excluded])
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [
+        f"traced memory: current {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB",
+        f"top {TOP_ALLOCATORS} allocation sites by growth since start:",
+    ]
+    for stat in end.compare_to(start, "lineno")[:TOP_ALLOCATORS]:
+        lines.append(str(stat))
+
+    with open(f"{base_path}.mem.txt", "w") as f:
+        f.write("\n".join(lines) + "\n")
+    end.dump(f"{base_path}.tracemalloc")
+    return [f"{base_path}.mem.txt", f"{base_path}.tracemalloc"]
+
+
+@contextmanager
+def profile_block(name: str, modes=PROFILE, directory: str = PROFILE_DIR):
+    """
+    Profile a block of code when any profile mode is enabled
+
+    Args:
+        name: Prefix for the output files (run or stage name)
+        modes: Mode string (see parse_profile_modes) or set of modes
+        directory: Output directory
+    """
+    global _cpu_active
+    modes = parse_profile_modes(modes) if isinstance(modes, str) else frozenset(modes)
+    if not modes:
+        yield
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    base_path = os.path.join(directory, f"{name}-{datetime.now():%Y%m%dT%H%M%S}-{next(_sequence)}")
+
+    cpu_profiler = None
+    if "cpu" in modes:
+        if _cpu_active:
+            logger.warning(f"⚠ CPU profiler already running; {name} is covered by the outer profile")
+        else:
+            cpu_profiler, _cpu_active = _start_cpu_profiler(), True
+
+    memory_start, started_tracing = None, False
+    if "mem" in modes:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            started_tracing = True
+        memory_start = tracemalloc.take_snapshot()
+
+    try:
+        yield
+    finally:
+        written = []
+        if memory_start is not None:
+            written += _write_memory_profile(memory_start, base_path)
+            if started_tracing:
+                tracemalloc.stop()
+        if cpu_profiler is not None:
+            written += _write_cpu_profile(cpu_profiler, base_path)
+            _cpu_active = False
+        logger.info(f"✓ Profiles for {name}: {', '.join(written)}")
+
+
+def stage_profile(stage_name: str):
+    """profile_block for a stage listed in PROFILE_STAGES (all modes unless PROFILE narrows them), a no-op otherwise"""
+    return profile_block(stage_name, modes=(PROFILE or "all") if stage_name in PROFILE_STAGES else "")
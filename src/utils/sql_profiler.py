@@ -0,0 +1,190 @@
+# src/utils/sql_profiler.py
+"""
+SQL statement profiling for pipeline runs
+
+Hooks SQLAlchemy's cursor events to record, per calling stage and normalized
+statement shape, how often a statement ran, its total/mean/p95 latency and the
+rows it returned. Shapes repeated many times within one stage are reported as
+likely N+1 patterns (per-row lookups that could be one set-based query).
+Statements slower than a threshold go to a slow-query log, optionally with
+their EXPLAIN ANALYZE plan.
+
+The per-statement cost is two perf_counter calls and a dict update (shape
+normalization is cached), so unlike `echo=True` it is cheap enough to switch on
+for a production run. Like the CPU/memory profiling (PROFILE), pipeline runs
+only attach it when asked to (SQL_PROFILE=1, see src/utils/metrics.py).
+
+    profiler = SQLProfiler().attach(engine)
+    ...
+    profiler.log_report()
+    profiler.detach()
+"""
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+from sqlalchemy import event
+
+from src.utils.logging_config import setup_logger
+from src.utils.metrics import current_stage
+
+logger = setup_logger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "500"))
+# Same shape this many times within one stage is reported as a possible N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "20"))
+# Latency samples kept per shape for percentiles
+LATENCY_SAMPLES = 1000
+SLOW_QUERY_LOG_SIZE = 50
+
+_PARAM_LIST = re.compile(r"\((?:\s*(?:%\(\w+\)s|\?|:\w+|\$\d+)\s*,)+\s*(?:%\(\w+\)s|\?|:\w+|\$\d+)\s*\)")
+_BIND = re.compile(r"%\(\w+\)s|(?<!:):\w+|\$\d+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals and bind parameters become ?, IN lists collapse to (?)"""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM_LIST.sub("(?)", shape)
+    shape = _BIND.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class StatementStats:
+    """Aggregates for one (stage, statement shape)"""
+
+    stage: str
+    shape: str
+    count: int = 0
+    total_ms: float = 0.0
+    rows: int = 0
+    samples: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    @property
+    def p95_ms(self) -> float:
+        return float(np.percentile(self.samples, 95)) if self.samples else 0.0
+
+
+class SQLProfiler:
+    """Collects statement statistics from the engines it is attached to"""
+
+    def __init__(
+        self,
+        slow_query_ms: float = SLOW_QUERY_MS,
+        n_plus_one_threshold: int = N_PLUS_ONE_THRESHOLD,
+        explain_slow: bool = os.getenv("SQL_EXPLAIN_SLOW", "0") == "1",
+    ):
+        """
+        Args:
+            slow_query_ms: Statements at least this slow go to the slow-query log
+            n_plus_one_threshold: Executions of one shape within a stage that count as N+1
+            explain_slow: Capture EXPLAIN ANALYZE for slow SELECTs (re-runs the query)
+        """
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.explain_slow = explain_slow
+        self.stats: dict[tuple[str, str], StatementStats] = {}
+        self.slow_queries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+        self._engines = []
+
+    def attach(self, engine) -> "SQLProfiler":
+        """Start recording statements executed through the engine"""
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+        return self
+
+    def detach(self) -> None:
+        """Stop recording on every attached engine"""
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines = []
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_profiler_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["sql_profiler_start"].pop()) * 1000
+        stage = current_stage() or "-"
+        shape = normalize_sql(statement)
+
+        stats = self.stats.get((stage, shape))
+        if stats is None:
+            stats = self.stats[(stage, shape)] = StatementStats(stage=stage, shape=shape)
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        stats.samples.append(elapsed_ms)
+        # rowcount is -1 for server-side cursors and some DDL
+        if cursor.rowcount and cursor.rowcount > 0:
+            stats.rows += cursor.rowcount
+
+        if elapsed_ms >= self.slow_query_ms:
+            self._log_slow_query(cursor, statement, parameters, executemany, stage, elapsed_ms)
+
+    def _log_slow_query(self, cursor, statement, parameters, executemany, stage, elapsed_ms):
+        entry = {"stage": stage, "elapsed_ms": elapsed_ms, "statement": statement, "plan": None}
+        logger.warning(f"⚠ Slow query ({elapsed_ms:.0f} ms) in {stage}: {normalize_sql(statement)[:300]}")
+
+        # EXPLAIN ANALYZE executes the statement again, so only for plain SELECTs
+        if self.explain_slow and not executemany and statement.lstrip().upper().startswith("SELECT"):
+            try:
+                explain_cursor = cursor.connection.cursor()
+                explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+                entry["plan"] = "\n".join(row[0] for row in explain_cursor.fetchall())
+                explain_cursor.close()
+                logger.warning(f"  └─ plan:\n{entry['plan']}")
+            except Exception as e:
+                logger.warning(f"  └─ EXPLAIN ANALYZE failed: {e}")
+        self.slow_queries.append(entry)
+
+    def summary(self) -> list[dict]:
+        """Per stage and shape statistics, slowest total first"""
+        rows = [
+            {
+                "stage": s.stage,
+                "shape": s.shape,
+                "count": s.count,
+                "total_ms": s.total_ms,
+                "mean_ms": s.mean_ms,
+                "p95_ms": s.p95_ms,
+                "rows": s.rows,
+            }
+            for s in self.stats.values()
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def n_plus_one_suspects(self) -> list[dict]:
+        """Shapes executed at least n_plus_one_threshold times within one stage"""
+        return [row for row in self.summary() if row["count"] >= self.n_plus_one_threshold and row["stage"] != "-"]
+
+    def log_report(self, top: int = 10) -> None:
+        """Log the most expensive statements and any N+1 suspects"""
+        summary = self.summary()
+        if not summary:
+            return
+        total_count = sum(row["count"] for row in summary)
+        total_ms = sum(row["total_ms"] for row in summary)
+        logger.info(f"SQL profile: {total_count} statements, {len(summary)} shapes, {total_ms / 1000:.2f}s in the database")
+        for row in summary[:top]:
+            logger.info(
+                f"  {row['total_ms']:8.1f} ms  x{row['count']:<5d} mean {row['mean_ms']:6.2f} ms  "
+                f"p95 {row['p95_ms']:6.2f} ms  rows {row['rows']:<6d} [{row['stage']}] {row['shape'][:120]}"
+            )
+        for row in self.n_plus_one_suspects():
+            logger.warning(
+                f"⚠ Possible N+1 in {row['stage']}: {row['count']} executions of {row['shape'][:200]}"
+            )
@@ -0,0 +1,47 @@
+# tests/conftest.py
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.models.schemas import Base, CrewCarbonLabReading, WasteWaterPlantOperation
+
+MRV_PLANT = "PLANT_T"
+MRV_START, MRV_END = date(2025, 4, 1), date(2025, 4, 10)
+# Day 4 has no calcium readings (MISSING_CA_READINGS), day 6 a negative delta (INVALID)
+MRV_MISSING_CA_DAY, MRV_NEGATIVE_DELTA_DAY = date(2025, 4, 4), date(2025, 4, 6)
+
+
+@pytest.fixture
+def mrv_session():
+    """Session on an in-memory SQLite database with ten days of ops and calcium data for MRV_PLANT"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        day = MRV_START
+        while day <= MRV_END:
+            session.add(
+                WasteWaterPlantOperation(
+                    plant_id=MRV_PLANT, date=day, actual_eff_flow_mgd=30.0, actual_inf_flow_mgd=31.0, source_file="test"
+                )
+            )
+            if day != MRV_MISSING_CA_DAY:
+                downstream = 35.0 if day == MRV_NEGATIVE_DELTA_DAY else 50.0
+                for unit, value in (("primary_clarifier", 40.0), ("secondary_clarifier", downstream)):
+                    session.add(
+                        CrewCarbonLabReading(
+                            plant_id=MRV_PLANT,
+                            plant_unit_id=unit,
+                            source_file="test",
+                            datetime=datetime.combine(day, datetime.min.time()),
+                            parameter_name="calcium",
+                            medium="aqueous",
+                            value=value,
+                            unit="mg/L",
+                        )
+                    )
+            day += timedelta(days=1)
+        session.commit()
+        yield session
+    engine.dispose()
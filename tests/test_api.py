@@ -0,0 +1,61 @@
+# tests/test_api.py
+import threading
+from datetime import date
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from sqlalchemy import create_engine
+
+from src.api import server
+from src.api.server import DataAPIHandler, make_etag, parse_filters
+from src.models import database
+
+
+def test_parse_filters_validates_and_normalizes():
+    """Test query strings are validated and normalized to a hashable cache key"""
+    # Act
+    filters = parse_filters("/co2", "start_date=2025-04-01&plant_id=PLANT_A&format=arrow")
+
+    # Assert
+    assert filters == (
+        ("calculation_version", "v1.0"),
+        ("plant_id", "PLANT_A"),
+        ("start_date", date(2025, 4, 1)),
+    )
+    with pytest.raises(ValueError):
+        parse_filters("/ph/daily", "calculation_version=v1.0")
+    with pytest.raises(ValueError):
+        parse_filters("/co2", "start_date=April")
+
+
+def test_etag_changes_only_with_version_request_or_format():
+    """Test the ETag is stable for a data version and changes when the data does"""
+    filters = parse_filters("/co2", "plant_id=PLANT_A")
+
+    etag = make_etag("co2_removal", 3, "/co2", filters, "json")
+
+    assert etag == make_etag("co2_removal", 3, "/co2", parse_filters("/co2", "plant_id=PLANT_A"), "json")
+    assert etag != make_etag("co2_removal", 4, "/co2", filters, "json")
+    assert etag != make_etag("co2_removal", 3, "/co2", filters, "arrow")
+
+
+def test_unreachable_database_returns_503(monkeypatch, tmp_path):
+    """Test a failing data version lookup is answered with 503 instead of dropping the connection"""
+    # Arrange: the shared engine points at a socket directory with no server
+    monkeypatch.setattr(database, "_engine", create_engine(f"postgresql://postgres@/missing?host={tmp_path}"))
+    monkeypatch.setitem(server._versions, "fetched_at", 0.0)
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), DataAPIHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    # Act
+    try:
+        with pytest.raises(HTTPError) as error:
+            urlopen(f"http://127.0.0.1:{httpd.server_port}/co2?plant_id=PLANT_A", timeout=10)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    # Assert
+    assert error.value.code == 503
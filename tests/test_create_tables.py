@@ -0,0 +1,34 @@
+# tests/test_create_tables.py
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.ingest.create_tables import ensure_schema
+from src.models.schemas import Base
+
+
+def test_ensure_schema_creates_missing_tables_once():
+    """Test a fresh database gets every table and a second check creates nothing"""
+    # Arrange
+    engine = create_engine("sqlite://")
+
+    # Act
+    created = ensure_schema(engine)
+    created_again = ensure_schema(engine)
+
+    # Assert
+    assert sorted(created) == sorted(Base.metadata.tables)
+    assert created_again == []
+
+
+def test_ensure_schema_fails_on_missing_columns_and_indexes():
+    """Test tables from an older schema are reported instead of silently kept"""
+    # Arrange: a CO2 calculation table from before the offset column and date index existed
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_crewcarbon_co2_removal_calculation_date"))
+        conn.execute(text("ALTER TABLE crewcarbon_co2_removal_calculation DROP COLUMN ca_upstream_offset_hours"))
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="missing 2 columns/indexes.*--recreate-schema"):
+        ensure_schema(engine)
@@ -0,0 +1,58 @@
+# tests/test_dashboard_export.py
+import io
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from src.dashboards.export import EXPORT_FORMATS, build_export
+from src.models.schemas import CrewCarbonLabReading
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    CrewCarbonLabReading.__table__.create(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            CrewCarbonLabReading.__table__.insert(),
+            [
+                {
+                    "plant_id": "PLANT_A",
+                    "plant_unit_id": "secondary_clarifier",
+                    "source_file": "test",
+                    "datetime": datetime(2025, 4, 1, hour),
+                    "parameter_name": "pH",
+                    "medium": "aqueous",
+                    "value": 7.0 + hour / 100,
+                    "unit": "pH",
+                }
+                for hour in range(3)
+            ],
+        )
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("export_format", list(EXPORT_FORMATS))
+def test_build_export_is_accepted_by_download_button(engine, export_format):
+    """Test export data is a type st.download_button accepts from its deferred callable"""
+    # Act
+    data = build_export(engine, "pH readings", export_format, plant_id="PLANT_A")
+    data_as_bytes, _ = convert_data_to_bytes_and_infer_mime(data, unsupported_error=TypeError("unsupported type"))
+
+    # Assert
+    reader = pd.read_csv if export_format == "CSV" else pd.read_parquet
+    exported = reader(io.BytesIO(data_as_bytes))
+    assert len(exported) == 3
+    assert exported["value"].tolist() == [7.0, 7.01, 7.02]
+
+
+@pytest.mark.parametrize("export_format", list(EXPORT_FORMATS))
+def test_build_export_stops_past_size_cap(engine, export_format):
+    """Test an export larger than max_bytes is refused instead of held in memory"""
+    # Act / Assert
+    with pytest.raises(ValueError, match="narrow the plant or date filters"):
+        build_export(engine, "pH readings", export_format, max_bytes=100, plant_id="PLANT_A")
@@ -0,0 +1,35 @@
+# tests/test_dashboard_queries.py
+from datetime import date
+
+import pytest
+
+from src.dashboards.queries import ph_aggregate_query, ph_bucket_for_span
+
+
+def test_ph_bucket_for_span_scales_with_range():
+    """Test pH resolution coarsens as the visible range grows"""
+    assert ph_bucket_for_span(date(2025, 4, 1), date(2025, 4, 3)) == "hour"
+    assert ph_bucket_for_span(date(2025, 4, 1), date(2025, 6, 30)) == "day"
+    assert ph_bucket_for_span(date(2024, 1, 1), date(2025, 6, 30)) == "week"
+    assert ph_bucket_for_span(date(2020, 1, 1), date(2025, 6, 30)) == "month"
+
+
+def test_ph_aggregate_query_groups_in_database():
+    """Test the pH query aggregates server-side and binds every filter"""
+    # Act
+    query, params = ph_aggregate_query("day", "PLANT_A", date(2025, 4, 1), date(2025, 6, 30))
+
+    # Assert
+    sql = str(query)
+    assert "date_trunc(:bucket, datetime)" in sql
+    assert "GROUP BY" in sql
+    assert params == {
+        "parameter_name": "pH",
+        "plant_id": "PLANT_A",
+        "start_date": date(2025, 4, 1),
+        "end_date": date(2025, 6, 30),
+        "bucket": "day",
+    }
+
+    with pytest.raises(ValueError):
+        ph_aggregate_query("minute")
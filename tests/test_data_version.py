@@ -0,0 +1,28 @@
+# tests/test_data_version.py
+from sqlalchemy import create_engine
+
+from src.ingest.create_tables import recreate_schema
+from src.models.data_version import DATASETS, bump_data_version, get_data_versions
+from src.models.schemas import Base
+
+
+def test_versions_keep_increasing_across_schema_recreate():
+    """Test a recreate never hands out a data version that readers may already have cached"""
+    # Arrange
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        bump_data_version(conn, *DATASETS)
+        bump_data_version(conn, "lab_reading")
+        before = get_data_versions(conn)
+
+    # Act: recreate, then the reload bumps the versions again
+    recreate_schema(engine)
+    with engine.begin() as conn:
+        after_recreate = get_data_versions(conn)
+        bump_data_version(conn, "lab_reading")
+        after_reload = get_data_versions(conn)
+
+    # Assert
+    assert all(after_recreate[dataset] > before[dataset] for dataset in DATASETS)
+    assert after_reload["lab_reading"] > after_recreate["lab_reading"]
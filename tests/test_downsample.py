@@ -0,0 +1,45 @@
+# tests/test_downsample.py
+import numpy as np
+import pandas as pd
+
+from src.dashboards.downsample import downsample_frame, lttb_indices
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    """Test LTTB bounds the point count but keeps first/last points and extremes"""
+    # Arrange
+    rng = np.random.default_rng(0)
+    y = rng.normal(15.0, 0.5, 10_000)
+    y[4_321] = 60.0  # calcium spike
+    y[7_654] = -8.0  # negative delta
+
+    # Act
+    keep = lttb_indices(np.arange(len(y)), y, 500)
+
+    # Assert
+    assert len(keep) == 500
+    assert keep[0] == 0 and keep[-1] == len(y) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4_321 in keep and 7_654 in keep
+
+
+def test_downsample_frame_per_trace_and_short_series():
+    """Test each trace is downsampled on its own and short traces pass through untouched"""
+    # Arrange
+    dates = pd.date_range("2020-01-01", periods=2_000, freq="D")
+    df = pd.concat(
+        [
+            pd.DataFrame({"date": dates, "plant_id": "PLANT_A", "co2": np.sin(np.arange(2_000) / 50)}),
+            pd.DataFrame({"date": dates[:50], "plant_id": "PLANT_B", "co2": np.ones(50)}),
+        ],
+        ignore_index=True,
+    )
+
+    # Act
+    thinned = downsample_frame(df, "date", "co2", 300, by="plant_id")
+
+    # Assert
+    counts = thinned["plant_id"].value_counts()
+    assert counts["PLANT_A"] == 300
+    assert counts["PLANT_B"] == 50
+    assert thinned.index.is_monotonic_increasing
@@ -0,0 +1,70 @@
+# tests/test_import_budget.py
+# Import-time budget for the entry points that short jobs start through (a one-plant
+# MRV rerun, the API health check, schema creation, the pipeline orchestrator). Each
+# module is imported in a fresh interpreter; IMPORT_BUDGET_MS raises the budget on
+# slow machines.
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.models import database
+
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "600"))
+
+# module -> heavy modules it must not import (they are loaded by the code paths that need them)
+ENTRY_POINTS = {
+    "src.models.database": ["pandas", "numpy"],
+    "src.ingest.create_tables": ["pandas", "numpy"],
+    "src.ingest.run_mrv_pipeline": ["pandas", "yaml"],
+    "src.ingest.run_data_pipeline": ["pandas", "openpyxl"],
+    "src.ingest.run_pipeline": ["pandas", "openpyxl", "yaml"],
+    "src.api.server": ["pandas", "pyarrow"],
+}
+
+
+def import_in_subprocess(module: str) -> tuple[float, set[str]]:
+    """(cumulative import time of `module` in ms, top-level packages loaded) in a fresh interpreter"""
+    code = f"import sys, {module}; print(' '.join(sorted({{name.split('.')[0] for name in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    timings = [line.split("|") for line in result.stderr.splitlines() if line.startswith("import time:")]
+    cumulative_us = next(int(cumulative) for _, cumulative, name in timings if name.strip() == module)
+    return cumulative_us / 1000, set(result.stdout.split())
+
+
+@pytest.mark.parametrize("module", list(ENTRY_POINTS))
+def test_entry_point_import_budget(module):
+    """Test entry points import without heavy modules and within IMPORT_BUDGET_MS"""
+    # Arrange
+    forbidden = set(ENTRY_POINTS[module])
+
+    # Act: fastest of three runs, so neither bytecode compilation nor a busy machine counts
+    runs = [import_in_subprocess(module) for _ in range(3)]
+    import_ms = min(ms for ms, _ in runs)
+    loaded = runs[-1][1]
+
+    # Assert
+    assert not loaded & forbidden, f"{module} imports {sorted(loaded & forbidden)}"
+    assert import_ms <= IMPORT_BUDGET_MS, f"{module} took {import_ms:.0f} ms to import (budget {IMPORT_BUDGET_MS:.0f} ms)"
+
+
+def test_engine_is_created_on_first_use(monkeypatch, tmp_path):
+    """Test a missing DATABASE_URL is reported by get_engine(), not at import"""
+    # Arrange
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(database, "ENV_PATH", tmp_path / ".env")
+    monkeypatch.setattr(database, "_engine", None)
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="DATABASE_URL"):
+        database.get_engine()
+    with pytest.raises(ValueError, match="DATABASE_URL"):
+        database.SessionLocal
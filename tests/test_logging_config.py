@@ -0,0 +1,64 @@
+import io
+import json
+import logging
+import logging.handlers
+import queue
+
+from src.utils.logging_config import ColoredFormatter, JsonFormatter, StructuredQueueHandler
+
+
+def _record(level=logging.INFO, msg='Loaded %d rows', args=(3,)):
+    return logging.LogRecord('src.ingest', level, __file__, 1, msg, args, None)
+
+
+def test_plain_formatter_has_no_ansi_codes():
+    # Arrange
+    formatter = ColoredFormatter(use_color=False)
+
+    # Act
+    line = formatter.format(_record(logging.WARNING))
+
+    # Assert
+    assert '\033[' not in line
+    assert line.endswith('| WARNING  | src.ingest | Loaded 3 rows')
+
+
+def test_json_formatter_emits_one_object_per_record():
+    # Arrange
+    formatter = JsonFormatter()
+
+    # Act
+    entry = json.loads(formatter.format(_record()))
+
+    # Assert
+    assert entry['level'] == 'INFO'
+    assert entry['logger'] == 'src.ingest'
+    assert entry['message'] == 'Loaded 3 rows'
+
+
+def test_queued_exception_stays_a_json_field():
+    # Arrange: the queue handler/listener pair _get_output_handler builds, writing to a buffer
+    log_queue = queue.SimpleQueue()
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger = logging.getLogger('test_logging_config.queue')
+    logger.propagate = False
+    logger.addHandler(StructuredQueueHandler(log_queue))
+
+    # Act
+    listener.start()
+    try:
+        raise ValueError('bad flow')
+    except ValueError:
+        logger.exception('Failed %s', 'PLANT_A')
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+
+    # Assert
+    entry = json.loads(stream.getvalue())
+    assert entry['message'] == 'Failed PLANT_A'
+    assert entry['exc_info'].startswith('Traceback')
+    assert 'ValueError: bad flow' in entry['exc_info']
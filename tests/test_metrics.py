@@ -0,0 +1,29 @@
+# tests/test_metrics.py
+import pandas as pd
+
+from src.utils.metrics import increment, pipeline_run, timed_stage
+
+
+@timed_stage("dedupe")
+def _dedupe(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop_duplicates()
+
+
+def test_pipeline_run_collects_stages_and_exports_one_series_per_stage(tmp_path):
+    """Test decorated stages record rows in/out and repeated stages are summed in the textfile"""
+
+    # Arrange
+    df = pd.DataFrame({"value": [1, 1, 2, 3]})
+
+    # Act: the same stage runs twice within one run
+    with pipeline_run("test_pipeline", textfile_dir=str(tmp_path)) as run:
+        _dedupe(df)
+        _dedupe(df)
+        increment("plants", 2)
+
+    # Assert
+    assert [(s.stage, s.rows_in, s.rows_out) for s in run.stages] == [("dedupe", 4, 3), ("dedupe", 4, 3)]
+    assert run.counters == {"plants": 2}
+    textfile = (tmp_path / "test_pipeline.prom").read_text()
+    assert textfile.count('crewcarbon_stage_rows_out{pipeline="test_pipeline",stage="dedupe"} 6') == 1
+    assert 'crewcarbon_run_counter{pipeline="test_pipeline",name="plants"} 2' in textfile
@@ -0,0 +1,89 @@
+# tests/test_mrv_scenarios.py
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.mrv.scenarios import evaluate_scenarios
+from src.mrv.utils import DEFAULT_PARAMETERS, MRVParameters, co2_removed_metric_tons_per_day
+
+
+@pytest.fixture
+def inputs():
+    """Two ops days; the second has no influent flow and only one calcium unit"""
+    ops = pd.DataFrame(
+        {
+            "date": [date(2025, 4, 10), date(2025, 4, 11)],
+            "actual_eff_flow_mgd": [31.2, 30.0],
+            "actual_inf_flow_mgd": [33.0, np.nan],
+            "has_ops": [True, True],
+        }
+    )
+    ca = pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4, 5],
+            "plant_unit_id": ["primary_clarifier", "primary_clarifier", "secondary_clarifier", "secondary_clarifier", "primary_clarifier"],
+            "date": [date(2025, 4, 10)] * 4 + [date(2025, 4, 11)],
+            "value": [39.8, 41.8, 53.7, 53.7, 40.0],
+            "uncertainty": [np.nan, 0.24, np.nan, 0.26, 0.24],
+        }
+    )
+    return ops, ca
+
+
+def test_evaluate_scenarios_default_matches_point_estimate(inputs):
+    """Test the v1.0 scenario reproduces the per-day calculation"""
+    ops, ca = inputs
+
+    results = evaluate_scenarios(ops, ca, [DEFAULT_PARAMETERS])
+
+    day_one = results.iloc[0]
+    assert day_one["quality_flag"] == "VALID"
+    assert day_one["ca_delta_mg_per_l"] == pytest.approx(13.9)
+    assert day_one["co2_removed_metric_tons_per_day"] == pytest.approx(1.806, rel=0.01)
+    assert results.iloc[1]["quality_flag"] == "MISSING_CA_READINGS"
+    assert not results.iloc[1]["should_calculate"]
+
+
+def test_evaluate_scenarios_varies_flow_and_replicate_rule(inputs):
+    """Test each scenario picks its own flow column and replicate rule"""
+    ops, ca = inputs
+    scenarios = [
+        DEFAULT_PARAMETERS,
+        MRVParameters(calculation_version="inf-flow", flow_column="actual_inf_flow_mgd"),
+        MRVParameters(calculation_version="rep-mean", replicate_rule="mean"),
+    ]
+
+    results = evaluate_scenarios(ops, ca, scenarios).set_index(["calculation_version", "date"])
+
+    inf_flow = results.loc[("inf-flow", date(2025, 4, 10))]
+    assert inf_flow["flow_mgd"] == 33.0
+    assert inf_flow["co2_removed_metric_tons_per_day"] == pytest.approx(co2_removed_metric_tons_per_day(13.9, 33.0))
+
+    rep_mean = results.loc[("rep-mean", date(2025, 4, 10))]
+    assert rep_mean["ca_upstream_mg_per_l"] == pytest.approx(40.8)
+    assert len(results) == 6
+
+
+def test_mrv_parameters_rejects_long_version_name():
+    """Test calculation_version must fit the database column"""
+    with pytest.raises(ValueError):
+        MRVParameters(calculation_version="x" * 21)
+
+
+def test_evaluate_scenarios_asof_fills_missing_sample_day(inputs):
+    """Test asof matching borrows the neighbouring day's sample and records the offset"""
+    ops, ca = inputs
+    asof = MRVParameters(calculation_version="asof", calcium_match="asof", asof_tolerance_hours=24)
+
+    results = evaluate_scenarios(ops, ca, [DEFAULT_PARAMETERS, asof]).set_index(["calculation_version", "date"])
+
+    exact_day_two = results.loc[("v1.0", date(2025, 4, 11))]
+    assert exact_day_two["quality_flag"] == "MISSING_CA_READINGS"
+
+    asof_day_two = results.loc[("asof", date(2025, 4, 11))]
+    assert asof_day_two["quality_flag"] == "VALID"
+    assert asof_day_two["ca_upstream_offset_hours"] == 0.0
+    assert asof_day_two["ca_downstream_offset_hours"] == -24.0
+    assert asof_day_two["ca_downstream_mg_per_l"] == pytest.approx(53.7)
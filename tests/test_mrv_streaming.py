@@ -0,0 +1,153 @@
+# tests/test_mrv_streaming.py
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from src.models.schemas import CO2RemovalCalculation, CrewCarbonLabReading, WasteWaterPlantOperation
+from src.mrv.scenarios import evaluate_scenarios
+from src.mrv.streaming import RunningSummary, iter_date_chunks, stream_calculate_co2_removal
+from src.mrv.utils import (
+    DEFAULT_PARAMETERS,
+    MRVParameters,
+    bulk_calculate_co2_removal,
+    load_calcium_frame,
+    load_ops_frame,
+)
+from tests.conftest import MRV_END, MRV_PLANT, MRV_START
+
+# Compared between streamed and bulk rows (ids, versions and timestamps differ by construction)
+RESULT_COLUMNS = [
+    "date",
+    "ca_upstream_mg_per_l",
+    "ca_downstream_mg_per_l",
+    "flow_mgd",
+    "ca_delta_mg_per_l",
+    "co2_removed_metric_tons_per_day",
+    "quality_flag",
+]
+
+
+@pytest.mark.parametrize(
+    "start, end, months, expected",
+    [
+        (
+            date(2025, 1, 15),
+            date(2025, 3, 10),
+            1,
+            [
+                (date(2025, 1, 15), date(2025, 1, 31)),
+                (date(2025, 2, 1), date(2025, 2, 28)),
+                (date(2025, 3, 1), date(2025, 3, 10)),
+            ],
+        ),
+        (
+            date(2024, 11, 20),
+            date(2025, 3, 31),
+            2,
+            [
+                (date(2024, 11, 20), date(2024, 12, 31)),
+                (date(2025, 1, 1), date(2025, 2, 28)),
+                (date(2025, 3, 1), date(2025, 3, 31)),
+            ],
+        ),
+        (date(2024, 2, 29), date(2024, 2, 29), 1, [(date(2024, 2, 29), date(2024, 2, 29))]),
+        (date(2025, 4, 2), date(2025, 4, 1), 1, []),
+    ],
+)
+def test_iter_date_chunks_boundaries(start, end, months, expected):
+    """Test chunks cover the range exactly, split on calendar month starts"""
+    assert list(iter_date_chunks(start, end, months)) == expected
+
+
+def test_running_summary_merges_chunks(mrv_session):
+    """Test updating chunk by chunk gives the summary of the whole range"""
+    # Arrange
+    units = [DEFAULT_PARAMETERS.upstream_unit, DEFAULT_PARAMETERS.downstream_unit]
+    ops = load_ops_frame(mrv_session, MRV_PLANT, MRV_START, MRV_END)
+    ca = load_calcium_frame(mrv_session, MRV_PLANT, units, MRV_START, MRV_END)
+    results = evaluate_scenarios(ops, ca, [DEFAULT_PARAMETERS])
+    whole, chunked = RunningSummary(plant_id=MRV_PLANT), RunningSummary(plant_id=MRV_PLANT)
+
+    # Act
+    whole.update(results)
+    for part in (results.iloc[:3], results.iloc[3:7], results.iloc[7:]):
+        chunked.update(part)
+
+    # Assert
+    merged, expected = chunked.as_dict(), whole.as_dict()
+    assert merged.pop("total_co2_valid_mt") == pytest.approx(expected.pop("total_co2_valid_mt"))
+    assert merged.pop("avg_co2_valid_mt_per_day") == pytest.approx(expected.pop("avg_co2_valid_mt_per_day"))
+    assert merged == expected
+    assert merged["total_dates"] == 10
+    assert merged["skipped"] == 1
+
+
+def add_march_week(session) -> date:
+    """Add a week of March ops and calcium data for MRV_PLANT, so a range from it spans two chunks; returns its first day"""
+    start = MRV_START - timedelta(days=7)
+    for offset in range(7):
+        day = start + timedelta(days=offset)
+        session.add(
+            WasteWaterPlantOperation(
+                plant_id=MRV_PLANT, date=day, actual_eff_flow_mgd=29.0, actual_inf_flow_mgd=30.0, source_file="test"
+            )
+        )
+        for unit, value in (("primary_clarifier", 41.0), ("secondary_clarifier", 52.0 + offset)):
+            session.add(
+                CrewCarbonLabReading(
+                    plant_id=MRV_PLANT,
+                    plant_unit_id=unit,
+                    source_file="test",
+                    datetime=datetime.combine(day, datetime.min.time()),
+                    parameter_name="calcium",
+                    medium="aqueous",
+                    value=value,
+                    unit="mg/L",
+                )
+            )
+    session.commit()
+    return start
+
+
+def stored_rows(session, version) -> pd.DataFrame:
+    """RESULT_COLUMNS of the stored rows of one calculation version, by date"""
+    rows = session.query(CO2RemovalCalculation).filter(CO2RemovalCalculation.calculation_version == version)
+    frame = pd.DataFrame([{column: getattr(row, column) for column in RESULT_COLUMNS} for row in rows])
+    return frame.sort_values("date").reset_index(drop=True)
+
+
+def test_streamed_rows_match_bulk(mrv_session):
+    """Test a run split into month chunks writes the rows bulk_calculate_co2_removal writes"""
+    # Arrange
+    start = add_march_week(mrv_session)
+
+    # Act
+    bulk_calculate_co2_removal(mrv_session, MRV_PLANT, start, MRV_END, params=MRVParameters(calculation_version="bulk"))
+    summary = stream_calculate_co2_removal(
+        mrv_session, MRV_PLANT, start, MRV_END, params=MRVParameters(calculation_version="stream"), chunk_months=1
+    )
+
+    # Assert
+    streamed, bulk = stored_rows(mrv_session, "stream"), stored_rows(mrv_session, "bulk")
+    assert len(streamed) == summary["calculated"] == 16
+    pd.testing.assert_frame_equal(streamed, bulk)
+
+
+def test_streamed_rerun_clears_chunk_without_ops(mrv_session):
+    """Test a rerun drops earlier results of a chunk whose ops rows were removed, as the bulk path does"""
+    # Arrange: a first streamed run over both chunks, then the March ops rows are withdrawn
+    start = add_march_week(mrv_session)
+    stream_params = MRVParameters(calculation_version="stream")
+    stream_calculate_co2_removal(mrv_session, MRV_PLANT, start, MRV_END, params=stream_params)
+    mrv_session.query(WasteWaterPlantOperation).filter(WasteWaterPlantOperation.date < MRV_START).delete()
+    mrv_session.commit()
+
+    # Act
+    stream_calculate_co2_removal(mrv_session, MRV_PLANT, start, MRV_END, params=stream_params)
+    bulk_calculate_co2_removal(mrv_session, MRV_PLANT, start, MRV_END, params=MRVParameters(calculation_version="bulk"))
+
+    # Assert
+    streamed, bulk = stored_rows(mrv_session, "stream"), stored_rows(mrv_session, "bulk")
+    assert streamed["date"].min() == MRV_START
+    pd.testing.assert_frame_equal(streamed, bulk)
@@ -0,0 +1,73 @@
+# tests/test_mrv_uncertainty.py
+import numpy as np
+import pytest
+
+from src.models.schemas import CO2RemovalUncertainty, CO2RemovalUncertaintyPeriod
+from src.mrv.utils import (
+    calculate_co2_removal_uncertainty,
+    co2_removed_metric_tons_per_day,
+    sample_co2_removal,
+    summarize_draws,
+)
+from src.qaqc.mrv_utils import classify_inputs
+from tests.conftest import MRV_END, MRV_PLANT, MRV_START
+
+
+def test_sample_co2_removal_centers_on_point_estimate():
+    """Test Monte Carlo draws are centered on the deterministic CO2 removal"""
+
+    # Arrange: two days with known inputs and small calcium uncertainty
+    ca_upstream = np.array([39.8, 42.0])
+    ca_downstream = np.array([53.7, 52.2])
+    flow_mgd = np.array([31.2, 28.0])
+    sigma = np.array([0.25, 0.25])
+
+    # Act: sample and summarize per day
+    draws = sample_co2_removal(ca_upstream, sigma, ca_downstream, sigma, flow_mgd, n_draws=20_000, rng=42)
+    stats = summarize_draws(draws, axis=1)
+
+    # Assert: one row per day, mean matches point estimate, interval brackets it
+    expected = co2_removed_metric_tons_per_day(ca_downstream - ca_upstream, flow_mgd)
+    assert draws.shape == (2, 20_000)
+    assert stats["mean"] == pytest.approx(expected, rel=0.01)
+    assert np.all(stats["p5"] < expected) and np.all(expected < stats["p95"])
+    assert np.all(stats["std"] > 0)
+
+
+def test_sample_co2_removal_zero_sigma_is_deterministic():
+    """Test zero uncertainty reproduces the point estimate exactly"""
+    draws = sample_co2_removal([39.8], [0.0], [53.7], [0.0], [31.2], n_draws=10, rng=0)
+
+    assert np.allclose(draws, 1.806, rtol=0.01)
+
+
+def test_classify_inputs_matches_validate_all_inputs_order():
+    """Test vectorized flags follow the same precedence as validate_all_inputs"""
+    should_calculate, flags = classify_inputs(
+        has_ops=[False, True, True, True, True],
+        flow_mgd=[np.nan, 0.0, 31.2, 31.2, 31.2],
+        ca_upstream=[40.0, 40.0, np.nan, 50.0, 40.0],
+        ca_downstream=[50.0, 50.0, 50.0, 45.0, 50.0],
+    )
+
+    assert flags.tolist() == ["NO_OPS_DATA", "INVALID_FLOW", "MISSING_CA_READINGS", "INVALID", "VALID"]
+    assert should_calculate.tolist() == [False, False, False, True, True]
+
+
+@pytest.mark.filterwarnings("error::sqlalchemy.exc.SAWarning")
+def test_uncertainty_rerun_replaces_previous_rows(mrv_session):
+    """Test rerunning a range replaces its daily summaries and period total instead of duplicating them"""
+    # Arrange
+    first_records, first_period = calculate_co2_removal_uncertainty(
+        mrv_session, MRV_PLANT, MRV_START, MRV_END, n_draws=200, seed=1
+    )
+    # Read before the rerun deletes (and detaches) the first run's rows
+    first_count, first_mean = len(first_records), first_period.co2_mean_metric_tons
+
+    # Act
+    records, period = calculate_co2_removal_uncertainty(mrv_session, MRV_PLANT, MRV_START, MRV_END, n_draws=200, seed=1)
+
+    # Assert
+    assert mrv_session.query(CO2RemovalUncertainty).count() == len(records) == first_count
+    assert mrv_session.query(CO2RemovalUncertaintyPeriod).count() == 1
+    assert period.co2_mean_metric_tons == pytest.approx(first_mean)
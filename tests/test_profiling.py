@@ -0,0 +1,27 @@
+# tests/test_profiling.py
+import pytest
+
+from src.utils.profiling import parse_profile_modes, profile_block
+
+
+def test_parse_profile_modes():
+    """Test PROFILE values map to profile modes"""
+    assert parse_profile_modes("") == frozenset()
+    assert parse_profile_modes("all") == {"cpu", "mem"}
+    assert parse_profile_modes("mem") == {"mem"}
+    with pytest.raises(ValueError):
+        parse_profile_modes("gpu")
+
+
+def test_profile_block_writes_cpu_and_memory_reports(tmp_path):
+    """Test a profiled block leaves CPU and allocation reports in the output directory"""
+
+    # Act
+    with profile_block("unit", modes="cpu,mem", directory=str(tmp_path)):
+        data = [list(range(100)) for _ in range(1000)]
+
+    # Assert
+    suffixes = {path.name.split(".", 1)[1] for path in tmp_path.iterdir()}
+    assert {"cpu.txt", "mem.txt", "tracemalloc"} <= suffixes
+    assert "test_profiling.py" in next(tmp_path.glob("*.mem.txt")).read_text()
+    assert len(data) == 1000
@@ -0,0 +1,50 @@
+# tests/test_qa_events.py
+import logging
+from datetime import date, timedelta
+
+from src.models.schemas import QAEvent
+from src.mrv.scenarios import run_mrv_scenarios
+from src.mrv.utils import MRVParameters, bulk_calculate_co2_removal
+from src.qaqc.events import ValidationEventCollector
+from src.qaqc.mrv_utils import validate_all_inputs
+from tests.conftest import MRV_END, MRV_MISSING_CA_DAY, MRV_NEGATIVE_DELTA_DAY, MRV_PLANT, MRV_START
+
+
+def test_collector_counts_events_and_caps_exemplars():
+    """Test validation failures are counted per flag/plant instead of logged per day"""
+
+    # Arrange: ten plant-days with no ops data
+    events = ValidationEventCollector(max_exemplars=2)
+    logger = logging.getLogger("test_qa_events")
+
+    # Act
+    for offset in range(10):
+        validate_all_inputs(None, None, None, "PLANT_A", date(2025, 4, 1) + timedelta(days=offset), logger, events=events)
+
+    # Assert: one count, two exemplars, full detail kept for the QA events table
+    assert events.counts[("NO_OPS_DATA", "PLANT_A")] == 10
+    assert len(events.exemplars["NO_OPS_DATA"]) == 2
+    assert len(events.events) == 10
+    assert {e["severity"] for e in events.events} == {"error"}
+    assert events.events[0]["check_name"] == "validate_ops_data"
+
+
+def test_vectorized_run_records_same_events_as_per_day_run(mrv_session):
+    """Test run_mrv_scenarios writes the QA events the per-day validate_* path writes"""
+
+    # Arrange
+    def stored_events(version):
+        rows = mrv_session.query(QAEvent).filter(QAEvent.calculation_version == version).all()
+        return sorted((e.date, e.check_name, e.quality_flag, e.severity, e.message) for e in rows)
+
+    # Act
+    bulk_calculate_co2_removal(mrv_session, MRV_PLANT, MRV_START, MRV_END, params=MRVParameters(calculation_version="per_day"))
+    run_mrv_scenarios(mrv_session, MRV_PLANT, [MRVParameters(calculation_version="vectorized")], MRV_START, MRV_END)
+
+    # Assert
+    vectorized = stored_events("vectorized")
+    assert vectorized == stored_events("per_day")
+    assert [(e[0], e[2], e[3]) for e in vectorized] == [
+        (MRV_MISSING_CA_DAY, "MISSING_CA_READINGS", "error"),
+        (MRV_NEGATIVE_DELTA_DAY, "INVALID", "warning"),
+    ]
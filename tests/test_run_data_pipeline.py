@@ -0,0 +1,25 @@
+# tests/test_run_data_pipeline.py
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.ingest.run_data_pipeline import populated_ingest_tables, run_data_pipeline
+from src.models.schemas import Base, WasteWaterPlantOperation
+
+
+def test_ingest_refuses_tables_that_hold_data():
+    """Test a second ingest stops before appending a duplicate copy of the data"""
+    # Arrange
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    assert populated_ingest_tables(engine) == []
+    with Session(engine) as session:
+        session.add(WasteWaterPlantOperation(plant_id="PLANT_A", date=date(2025, 4, 1), source_file="test"))
+        session.commit()
+
+    # Act / Assert
+    assert populated_ingest_tables(engine) == ["wastewater_plant_operation"]
+    with pytest.raises(ValueError, match="--recreate-schema.*--append"):
+        run_data_pipeline(engine)
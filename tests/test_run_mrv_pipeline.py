@@ -0,0 +1,29 @@
+# tests/test_run_mrv_pipeline.py
+import argparse
+
+import pytest
+
+from src.ingest.run_mrv_pipeline import add_mrv_arguments, check_mrv_arguments
+
+
+@pytest.mark.parametrize(
+    "argv, accepted",
+    [
+        (["--scenarios", "config/mrv_scenarios.yaml"], True),
+        (["--calcium-match", "asof", "--uncertainty-draws", "100"], True),
+        (["--scenarios", "config/mrv_scenarios.yaml", "--calcium-match", "asof"], False),
+        (["--scenarios", "config/mrv_scenarios.yaml", "--uncertainty-draws", "100", "--seed", "1"], False),
+        (["--scenarios", "config/mrv_scenarios.yaml", "--stream"], False),
+    ],
+)
+def test_scenarios_reject_options_they_would_ignore(argv, accepted):
+    """Test --scenarios refuses mode options instead of silently dropping them"""
+    # Arrange
+    parser = add_mrv_arguments(argparse.ArgumentParser())
+
+    # Act / Assert
+    if accepted:
+        check_mrv_arguments(parser, parser.parse_args(argv))
+    else:
+        with pytest.raises(SystemExit):
+            check_mrv_arguments(parser, parser.parse_args(argv))
@@ -0,0 +1,33 @@
+# tests/test_sql_profiler.py
+from sqlalchemy import create_engine, text
+
+from src.utils.metrics import stage
+from src.utils.sql_profiler import SQLProfiler, normalize_sql
+
+
+def test_normalize_sql_collapses_literals_and_in_lists():
+    """Test statements differing only in values share one shape"""
+    a = normalize_sql("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s) AND name = 'x'  AND n > 5")
+    b = normalize_sql("SELECT * FROM t WHERE id IN (%(id_1)s, %(id_2)s, %(id_3)s) AND name = 'y' AND n > 7")
+
+    assert a == b == "SELECT * FROM t WHERE id IN (?) AND name = ? AND n > ?"
+
+
+def test_profiler_flags_repeated_shapes_within_a_stage():
+    """Test per-row lookups inside one stage are reported as an N+1 suspect"""
+
+    # Arrange
+    engine = create_engine("sqlite://")
+    profiler = SQLProfiler(n_plus_one_threshold=5).attach(engine)
+
+    # Act: one lookup per "date", then a single set-based query
+    with engine.connect() as conn, stage("per_day_lookups"):
+        for day in range(10):
+            conn.execute(text("SELECT :day + 1"), {"day": day})
+        conn.execute(text("SELECT 1, 2"))
+    profiler.detach()
+
+    # Assert
+    suspects = profiler.n_plus_one_suspects()
+    assert [(row["stage"], row["count"]) for row in suspects] == [("per_day_lookups", 10)]
+    assert sum(row["count"] for row in profiler.summary()) == 11
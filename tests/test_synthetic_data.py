@@ -0,0 +1,31 @@
+# tests/test_synthetic_data.py
+from datetime import date
+
+from benchmarks.synthetic_data import generate_dataset
+from src.ingest.ca_pipeline import run_ca_pipeline
+from src.ingest.ops_plant_a_pipeline import run_ops_plant_a
+from src.ingest.ops_plant_b_pipeline import run_ops_plant_b
+from src.ingest.ph_pipeline import run_ph_pipeline
+
+
+def test_synthetic_files_parse_with_the_ingest_pipelines(tmp_path):
+    """Test generated workbooks/CSVs go through the real readers unchanged"""
+
+    # Arrange: one Plant A-style and one Plant B-style plant over ~6 weeks
+    start, end = date(2025, 1, 15), date(2025, 2, 28)
+    manifest = generate_dataset(str(tmp_path), 2, start, end, ph_interval_minutes=60, seed=1)
+    (plant_a, a), (plant_b, b) = manifest["plants"].items()
+
+    # Act
+    ops_a = run_ops_plant_a(a["ops_files"], plant_a)
+    ops_b = run_ops_plant_b(b["ops_files"], plant_b)
+    calcium = run_ca_pipeline(manifest["calcium"])
+    ph = run_ph_pipeline(manifest["ph"])
+
+    # Assert: dates stay in range, summary rows are dropped, overlapping MPOR windows cover every day
+    assert (a["ops_style"], b["ops_style"]) == ("A", "B")
+    assert ops_a["date"].between(str(start), str(end)).all() and len(ops_a) == 45
+    assert ops_b["date"].nunique() == 45 and ops_b["actual_eff_flow_mgd"].notna().all()
+    assert set(calcium["plant_unit_id"]) == {"primary_clarifier", "secondary_clarifier"}
+    assert set(calcium["plant_id"]) == {plant_a, plant_b}
+    assert len(ph) == 2 * 45 * 24 and set(ph["parameter_name"]) == {"pH"}